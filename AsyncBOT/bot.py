@@ -1,8 +1,21 @@
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
-import json, os
-from utils.status_cycle import cycle_status
+import json, os, time
+from collections import Counter
+from utils.status_cycle import STATUS_INTERVAL, cycle_status
+from utils.channels import store as channel_store
+from utils.channel_edits import get_channel_editor
+from utils.frames import get_frame_scheduler
+from utils.health import HealthServer, health_port
+from utils.loop_monitor import Level, get_loop_monitor
+from utils.metrics import InstrumentedTree
+from utils.rest_queue import get_rest_queue
+from utils.room_pool import get_room_pool
+from utils.services import get_services
+from utils.teardown import get_teardown
+from utils.timer_wheel import get_timer_wheel
+from utils.voice_store import get_voice_store
 
 load_dotenv("./config/.env")
 TOKEN = os.getenv("TOKEN")
@@ -15,14 +28,39 @@ class AsyncBOT(commands.Bot):
         intents.members = True
         super().__init__(
             command_prefix=".",  # prefixo fantasma (nunca será usado)
-            intents=intents
+            intents=intents,
+            tree_cls=InstrumentedTree,  # latência por comando (/stats)
+            # espera de rate limit maior que isso vira RateLimited: a fila REST
+            # pausa a rota sem deixar um worker parado dentro do discord.py
+            max_ratelimit_timeout=30.0,
         )
+        self.event_counts = Counter()  # evento do gateway → vezes despachado (/metrics)
+        self.synced_at: float | None = None  # fim do setup_hook (/readyz)
+        self.health = HealthServer(self)
+
+    def dispatch(self, event_name: str, /, *args, **kwargs):
+        self.event_counts[event_name] += 1
+        super().dispatch(event_name, *args, **kwargs)
 
     async def on_message(self, message: discord.Message):
         # Ignora completamente mensagens de texto
         return
 
     async def setup_hook(self):
+        # sobe antes das cogs: /healthz já responde, /readyz espera o sync
+        port = health_port()
+        if port:
+            await self.health.start(port)
+        get_loop_monitor().start()
+        # uma vez só (o on_ready se repete a cada reconexão); pausa sob carga
+        get_services().register(
+            "status",
+            lambda: cycle_status(self),
+            interval=STATUS_INTERVAL,
+            bot=self,
+            level=Level.PAUSE_STATUS,
+        )
+
         with open(COGS_FILE, "r") as f:
             data = json.load(f)
 
@@ -54,10 +92,27 @@ class AsyncBOT(commands.Bot):
 
         synced = await self.tree.sync()
         print(f"✅ Slash Commands sincronizados GLOBALMENTE ({len(synced)} comandos).")
+        self.synced_at = time.time()
 
     async def on_ready(self):
         print(f"🤖 {self.user} está online!")
-        self.loop.create_task(cycle_status(self))
+        # cache de canais completo: temporárias do channels.json antigo que sumiram saem
+        channel_store.prune_legacy(self)
+
+    async def close(self):
+        await self.health.stop()
+        await get_services().close()
+        await get_timer_wheel().close()
+        await get_frame_scheduler().close()
+        await get_loop_monitor().stop()
+        await get_teardown().close()
+        await get_room_pool().close()
+        await get_channel_editor().close()
+        await get_rest_queue().close()
+        await get_voice_store().close()
+        # grava no disco o que ainda estiver pendente no cache de config
+        await channel_store.flush_all()
+        await super().close()
 
 
 bot = AsyncBOT()
@@ -3,12 +3,22 @@ from discord.ext import commands
 from discord import app_commands
 import discord, random, asyncio
 
+from utils.duelo_engine import EMPATE_TOTAL, REVELACAO, TAMANHO_SEQ, VITORIA, Duelo, JogadaInvalida
+from utils.frames import get_frame_scheduler
+from utils.loop_monitor import Level, get_loop_monitor
+from utils.metrics import TimedLayoutView
+from utils.timer_wheel import get_timer_wheel
+
 # ============================================================
 # CONFIG / HELPERS
 # ============================================================
 
 is_roleta_running = False
 duelo_em_andamento = False
+DUELOS_ATIVOS = set()  # views de duelo ainda em andamento (métricas)
+TEMPO_CONFIRMACAO = 30  # segundos pra aceitar
+TEMPO_PROVOCACAO = 30   # segundos que a provocação fica na tela
+TEMPO_ESCOLHA = 120     # segundos pra montar as sequências
 
 PROVOCACOES_DESISTENCIA = [
     "Correu mais rápido que a própria sombra!",
@@ -65,9 +75,10 @@ class Fun(commands.Cog):
         try:
             view = self.DueloLayout(interaction, autor, alvo)
             view.message = await msg_loading.edit(content=None, view=view)
+            DUELOS_ATIVOS.add(view)
 
             print(f"[DUELO] {autor} desafiou {alvo} para um duelo!")
-            asyncio.create_task(view._timeout_confirmacao())
+            view.prazo = get_timer_wheel().schedule(TEMPO_CONFIRMACAO, view._timeout_confirmacao)
 
         except Exception as e:
             traceback.print_exc()
@@ -76,9 +87,8 @@ class Fun(commands.Cog):
     # ============================================================
     #                   LAYOUT (INTERFACE DE DUELO)
     # ============================================================
-    class DueloLayout(discord.ui.LayoutView):
+    class DueloLayout(TimedLayoutView):
         EMOJIS = {"P": "⚜️", "O": "♦️", "E": "⚔️", "C": "❤️"}
-        NIPES = ["P", "O", "E", "C"]
 
         def __init__(self, interaction, desafiante, desafiado):
             super().__init__(timeout=None)
@@ -87,17 +97,13 @@ class Fun(commands.Cog):
             self.desafiado = desafiado
             self.message: discord.Message | None = None
 
-            # aceitação
-            self.aceitou = set()
-
-            # escolhas por jogador (listas de 0..4 letras)
-            self.escolhas = {self.desafiante.id: [], self.desafiado.id: []}
+            # regras e estado do jogo (aceitação, escolhas, cartas, rodadas)
+            self.jogo = Duelo(desafiante.id, desafiado.id)
 
-            # sequência do bot (pode repetir nipe!)
-            self.bot_seq: list[str] = []
-
-            self.rodada = 0
-            self.finalizado = False
+            # prazo atual no timer wheel (confirmação, depois apagar a mensagem)
+            self.prazo = None
+            # fase em andamento (guardada pra task não ser coletada no meio)
+            self.tarefa: asyncio.Task | None = None
 
             # HEADER → mostra o desafiante
             self.header_text = discord.ui.TextDisplay(
@@ -132,54 +138,69 @@ class Fun(commands.Cog):
         # ============================== HELPERS ==============================
         def _fmt_barra_seq(self, uid: int) -> str:
             """Exibe a sequência escolhida por um jogador com placeholders."""
-            seq = self.escolhas[uid]
+            seq = self.jogo.escolhas(uid)
             mostrados = [self.EMOJIS[c] for c in seq]
             while len(mostrados) < 4:
                 mostrados.append("▫️")  # placeholder
             return " ".join(mostrados)
 
         async def _refresh_message(self):
-            try:
-                if self.message:
-                    await self.message.edit(view=self)
-            except Exception:
-                pass
+            # só marca como suja: o FrameScheduler manda o estado mais recente no próximo quadro
+            if self.message:
+                get_frame_scheduler().mark(self.message, self._render)
+
+        def _render(self):
+            return self.message.edit(view=self)
+
+        async def _quadro(self, texto: str, essencial: bool = True):
+            """Um quadro da animação (edit + 1 s). Sob carga, os não essenciais são pulados."""
+            if not essencial and get_loop_monitor().level >= Level.SKIP_FRAMES:
+                return
+            self.card_text.content = texto
+            await self._refresh_message()
+            await asyncio.sleep(1)
 
         def _is_player(self, user: discord.abc.User) -> bool:
-            return user.id in (self.desafiante.id, self.desafiado.id)
+            return self.jogo.jogador(user.id)
+
+        def _membro(self, uid: int) -> discord.Member:
+            return self.desafiante if uid == self.desafiante.id else self.desafiado
 
         # ============================ FASE 1: A/R ============================
         async def _on_aceitar(self, interaction: discord.Interaction):
             user = interaction.user
-            if not self._is_player(user):
-                return await interaction.response.send_message("Este duelo não é seu, cowboy!", ephemeral=True)
-
-            if user.id in self.aceitou:
-                return await interaction.response.send_message("Você já aceitou o duelo!", ephemeral=True)
-
-            self.aceitou.add(user.id)
+            try:
+                ambos = self.jogo.aceitar(user.id)
+            except JogadaInvalida as e:
+                aviso = {
+                    "nao_jogador": "Este duelo não é seu, cowboy!",
+                    "ja_aceitou": "Você já aceitou o duelo!",
+                }.get(e.motivo, "Esse duelo já era, cowboy.")
+                return await interaction.response.send_message(aviso, ephemeral=True)
 
             # usa response.send_message pra manter a interação válida
             await interaction.response.send_message(f"🤝 {user.display_name} aceitou o duelo!", ephemeral=True)
 
-            if len(self.aceitou) == 2:
+            if ambos:
                 # atualiza visualmente e agenda a próxima fase sem travar a interação
+                if self.prazo is not None:
+                    self.prazo.cancel()
                 self.card_text.content = "🔥 Ambos aceitaram o duelo! Preparem-se..."
                 await self._refresh_message()
-                asyncio.create_task(self._preparar_escolhas())
+                self.tarefa = asyncio.create_task(self._preparar_escolhas())
             else:
                 self.card_text.content = f"🤝 {user.display_name} aceitou o duelo!\nAguardando o outro jogador..."
                 await self._refresh_message()
 
         async def _timeout_confirmacao(self):
-            """Provocações se alguém não confirmar o duelo a tempo."""
-            await asyncio.sleep(30)  # tempo de confirmação
-
-            if self.finalizado or len(self.aceitou) == 2:
+            """Provocações se alguém não confirmar o duelo a tempo (disparado pelo timer wheel)."""
+            self.prazo = None
+            if not self.jogo.expirar():
                 return  # já começou o duelo
+            DUELOS_ATIVOS.discard(self)
 
-            desafiante_aceitou = self.desafiante.id in self.aceitou
-            desafiado_aceitou = self.desafiado.id in self.aceitou
+            desafiante_aceitou = self.desafiante.id in self.jogo.aceitou
+            desafiado_aceitou = self.desafiado.id in self.jogo.aceitou
 
             if desafiante_aceitou and not desafiado_aceitou:
                 frases = [
@@ -208,18 +229,25 @@ class Fun(commands.Cog):
             # mostra provocação por 30s
             self.card_text.content = provocacao
             await self._refresh_message()
-            await asyncio.sleep(30)
+            self.prazo = get_timer_wheel().schedule(TEMPO_PROVOCACAO, self._apagar)
 
+        async def _apagar(self):
             # apaga mensagem final
+            self.prazo = None
+            get_frame_scheduler().forget(self.message)
             try:
                 await self.message.delete()
             except:
                 pass
+            DUELOS_ATIVOS.discard(self)
 
         async def _on_recusar(self, interaction: discord.Interaction):
             user = interaction.user
-            if not self._is_player(user):
-                return await interaction.response.send_message("Você nem está nesse duelo, curioso.", ephemeral=True)
+            try:
+                self.jogo.recusar(user.id)
+            except JogadaInvalida as e:
+                aviso = "Você nem está nesse duelo, curioso." if e.motivo == "nao_jogador" else "Agora é tarde pra correr!"
+                return await interaction.response.send_message(aviso, ephemeral=True)
 
             PROVOCACOES_DESISTENCIA = [
                 "Correu mais rápido que a própria sombra!💨",
@@ -229,6 +257,11 @@ class Fun(commands.Cog):
                 "Se proteja! O faroeste é perigoso… para sua autoestima. 😏",
             ]
 
+            if self.prazo is not None:
+                self.prazo.cancel()
+                self.prazo = None
+            DUELOS_ATIVOS.discard(self)
+
             await interaction.response.defer()
             self.card_text.content = f" {user.display_name} {random.choice(PROVOCACOES_DESISTENCIA)}"
             self.btn_aceitar.disabled = True
@@ -280,30 +313,38 @@ class Fun(commands.Cog):
             self.add_item(self.container)
 
             await self._refresh_message()
+            self.prazo = get_timer_wheel().schedule(TEMPO_ESCOLHA, self._timeout_escolha)
+
+        async def _timeout_escolha(self):
+            """Alguém não terminou a sequência a tempo: o duelo é abandonado."""
+            self.prazo = None
+            if not self.jogo.abandonar():
+                return  # as duas sequências fecharam
+            DUELOS_ATIVOS.discard(self)
+
+            for btn in (self.btn_p, self.btn_o, self.btn_e, self.btn_c):
+                btn.disabled = True
+            self.card_text.content = "🌵 O duelo foi abandonado... o sol se pôs e ninguém terminou de escolher."
+            await self._refresh_message()
+            self.prazo = get_timer_wheel().schedule(TEMPO_PROVOCACAO, self._apagar)
 
         async def _on_pick(self, interaction: discord.Interaction, letra: str):
             """Jogador clica em um dos botões de naipe para montar sua sequência."""
             user = interaction.user
-            if not self._is_player(user):
-                return await interaction.response.send_message("Xiii… não mete a mão nesse baralho, parceiro.",
-                                                               ephemeral=True)
-
-            atual = self.escolhas[user.id]
-
-            # impede o jogador de repetir um naipe já usado
-            if letra in atual:
-                return await interaction.response.send_message("Você já escolheu esse naipe, cowboy!", ephemeral=True)
+            try:
+                completo = self.jogo.escolher(user.id, letra)
+            except JogadaInvalida as e:
+                aviso = {
+                    "nao_jogador": "Xiii… não mete a mão nesse baralho, parceiro.",
+                    "naipe_repetido": "Você já escolheu esse naipe, cowboy!",
+                    "sequencia_completa": "Sua sequência já está completa, cowboy!",
+                }.get(e.motivo, "Não dá pra escolher agora.")
+                return await interaction.response.send_message(aviso, ephemeral=True)
 
-            if len(atual) == 4:
-                try:
-                    await interaction.followup.send("✅ Sequência registrada com sucesso!", ephemeral=True)
-                except:
-                    pass
-            atual.append(letra)
             await interaction.response.defer()
 
             # Confirmacao da sequencia finalizada
-            if len(atual) == 4:
+            if len(self.jogo.escolhas(user.id)) == TAMANHO_SEQ:
                 try:
                     await interaction.followup.send("✅ Sequência registrada com sucesso!", ephemeral=True)
                 except:
@@ -322,13 +363,17 @@ class Fun(commands.Cog):
             )
 
             # Se ambos terminaram, segue o jogo
-            if len(self.escolhas[self.desafiante.id]) == 4 and len(self.escolhas[self.desafiado.id]) == 4:
+            if completo:
                 # trava botões pra ambos
                 for btn in (self.btn_p, self.btn_o, self.btn_e, self.btn_c):
                     btn.disabled = True
+                if self.prazo is not None:
+                    self.prazo.cancel()
+                    self.prazo = None
                 await self._refresh_message()
-                # inicia o duelo em segundo plano
-                asyncio.create_task(self._iniciar_duelo())
+                # inicia o duelo em segundo plano (sai dos ativos mesmo se falhar no meio)
+                self.tarefa = asyncio.create_task(self._iniciar_duelo())
+                self.tarefa.add_done_callback(lambda _: DUELOS_ATIVOS.discard(self))
 
             else:
                 await self._refresh_message()
@@ -336,61 +381,36 @@ class Fun(commands.Cog):
         # ===================== FASE 3: REVELAÇÃO PROGRESSIVA =================
         async def _iniciar_duelo(self):
             """Revela as cartas rodada a rodada, mostrando também escolhas de cada jogador."""
-            # sequência do bot com possibilidade de repetir nipe
-            self.bot_seq = random.sample(self.NIPES, k=4)
-            print(f"[BOT] Sequência oculta: {self.bot_seq}")
+            # sequência do dealer sorteada pelo motor quando as escolhas fecharam
+            print(f"[BOT] Sequência oculta: {self.jogo.bot_seq}")
 
             # contagem rápida
-            self.card_text.content = "🎲 Sequências definidas! Preparar..."
-            await self._refresh_message()
-            await asyncio.sleep(1)
+            await self._quadro("🎲 Sequências definidas! Preparar...", essencial=False)
             for n in range(3, 0, -1):
-                self.card_text.content = f"⏳ {n}..."
-                await self._refresh_message()
-                await asyncio.sleep(1)
-
-            vencedor = None
-            empate_total = False
+                await self._quadro(f"⏳ {n}...", essencial=False)
 
-            # rodada a rodada
-            for i, carta in enumerate(self.bot_seq):
-                self.rodada = i + 1
-                emoji_carta = self.EMOJIS[carta]
+            # rodada a rodada (o motor para na primeira rodada decidida)
+            while self.jogo.fase == REVELACAO:
+                rodada = self.jogo.proxima_rodada()
+                emoji_carta = self.EMOJIS[rodada.carta]
 
                 # escolhas da rodada dos jogadores
-                esc_desafiante = self.escolhas[self.desafiante.id][i]
-                esc_desafiado = self.escolhas[self.desafiado.id][i]
-                emoji_desa = self.EMOJIS[esc_desafiante]
-                emoji_deso = self.EMOJIS[esc_desafiado]
+                emoji_desa = self.EMOJIS[rodada.escolha_a]
+                emoji_deso = self.EMOJIS[rodada.escolha_b]
 
                 # mostra carta revelada
-                self.card_text.content = f"🃏 **Rodada {self.rodada}**\nCarta revelada: {emoji_carta}"
-                await self._refresh_message()
-                await asyncio.sleep(1)
+                await self._quadro(f"🃏 **Rodada {rodada.numero}**\nCarta revelada: {emoji_carta}", essencial=False)
 
                 # mostra escolhas dos dois
-                self.card_text.content = (
-                    f"🃏 **Rodada {self.rodada}**\n"
+                await self._quadro(
+                    f"🃏 **Rodada {rodada.numero}**\n"
                     f"Carta revelada: {emoji_carta}\n\n"
                     f"**{self.desafiante.display_name}** \n {emoji_desa}\n"
                     f"**{self.desafiado.display_name}** \n {emoji_deso}"
                 )
-                await self._refresh_message()
-                await asyncio.sleep(1)
-
-                # verifica acertos
-                acerta_desa = (esc_desafiante == carta)
-                acerta_deso = (esc_desafiado == carta)
-
-                if acerta_desa and acerta_deso:
-                    empate_total = True
-                    break
-                if acerta_desa:
-                    vencedor = self.desafiante
-                    break
-                if acerta_deso:
-                    vencedor = self.desafiado
-                    break
+
+            empate_total = self.jogo.resultado == EMPATE_TOTAL
+            vencedor = self._membro(self.jogo.vencedor) if self.jogo.resultado == VITORIA else None
 
             # resultado
             await asyncio.sleep(1)
@@ -420,9 +440,9 @@ class Fun(commands.Cog):
                 resultado = f"{random.choice(Empate_Parcial)}"
 
             # Sequências completas (emojis)
-            seq_bot = " ".join(self.EMOJIS[c] for c in self.bot_seq)
-            seq_desafiante = " ".join(self.EMOJIS[c] for c in self.escolhas[self.desafiante.id])
-            seq_desafiado = " ".join(self.EMOJIS[c] for c in self.escolhas[self.desafiado.id])
+            seq_bot = " ".join(self.EMOJIS[c] for c in self.jogo.bot_seq)
+            seq_desafiante = " ".join(self.EMOJIS[c] for c in self.jogo.escolhas_a)
+            seq_desafiado = " ".join(self.EMOJIS[c] for c in self.jogo.escolhas_b)
 
             # Mensagem final estilizada
             self.card_text.content = (
@@ -433,12 +453,11 @@ class Fun(commands.Cog):
                 f"**Resultado:** {resultado}"
             )
 
-            self.finalizado = True
             await self._refresh_message()
 
         async def interaction_check(self, interaction: discord.Interaction) -> bool:
             # permite interações apenas dos dois jogadores
-            if interaction.user.id in (self.desafiante.id, self.desafiado.id):
+            if self._is_player(interaction.user):
                 return True
             try:
                 await interaction.response.send_message(
@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 
-from utils.channels import load_channels, save_channels
+from utils.channels import load_channels, load_guild, save_guild
 
 
 class SetChannel(
@@ -74,7 +74,7 @@ class SetChannel(
             return await self.deny(interaction)
 
         guild = interaction.guild
-        data = load_channels()
+        data = load_guild(guild)
 
         ch = guild.get_channel(int(canal))
 
@@ -85,7 +85,7 @@ class SetChannel(
             )
 
         data[tipo] = ch.id
-        save_channels(data)
+        save_guild(guild)
 
         await interaction.response.send_message(
             f"✅ `{tipo}` configurado como → {ch.mention}",
@@ -103,7 +103,7 @@ class SetChannel(
             return await self.deny(interaction)
 
         guild = interaction.guild
-        data = load_channels()
+        data = load_guild(guild)
 
         ch = guild.get_channel(int(canal))
 
@@ -114,7 +114,7 @@ class SetChannel(
             )
 
         data[tipo] = ch.id
-        save_channels(data)
+        save_guild(guild)
 
         await interaction.response.send_message(
             f"✏️ `{tipo}` atualizado para → {ch.mention}",
@@ -131,7 +131,7 @@ class SetChannel(
         if not self.check_perm(interaction):
             return await self.deny(interaction)
 
-        data = load_channels()
+        data = load_guild(interaction.guild)
 
         if tipo not in data:
             return await interaction.response.send_message(
@@ -140,7 +140,7 @@ class SetChannel(
             )
 
         data.pop(tipo)
-        save_channels(data)
+        save_guild(interaction.guild)
 
         await interaction.response.send_message(
             f"🗑️ `{tipo}` removido da configuração.",
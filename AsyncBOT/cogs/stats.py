@@ -0,0 +1,117 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+from utils import deadline
+from utils.metrics import get_metrics
+from utils.rest_queue import get_rest_queue
+from utils.services import get_services
+
+MAX_ROWS = 20
+LABEL_WIDTH = 30
+
+
+def fmt_ms(ms: float) -> str:
+    return f"{ms / 1000:.1f}s" if ms >= 1000 else f"{ms:.0f}ms"
+
+
+def fmt_uptime(seconds: float) -> str:
+    minutes, _ = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    if days:
+        return f"{days}d{hours:02}h"
+    return f"{hours}h{minutes:02}m" if hours else f"{minutes}m"
+
+
+class Stats(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def _allowed(self, interaction: discord.Interaction) -> bool:
+        core = self.bot.get_cog("Core")
+        if core and core.check_admin(interaction.user.id):
+            return True
+        if core:
+            await core.deny(interaction)
+        else:
+            await interaction.response.send_message("Sem permissão.", ephemeral=True)
+        return False
+
+    @app_commands.command(name="stats", description="Latência dos comandos e componentes (admin).")
+    async def stats(self, interaction: discord.Interaction):
+        if not await self._allowed(interaction):
+            return
+
+        metrics = get_metrics()
+        rows = metrics.top(MAX_ROWS)
+
+        lines = [f"{'comando/componente':<{LABEL_WIDTH}} {'n':>5} {'p50':>6} {'p95':>6} {'p99':>6} {'erro':>4} {'rest':>5}"]
+        for label, hist in rows:
+            lines.append(
+                f"{label[:LABEL_WIDTH]:<{LABEL_WIDTH}} {hist.count:>5} "
+                f"{fmt_ms(hist.percentile(50)):>6} {fmt_ms(hist.percentile(95)):>6} "
+                f"{fmt_ms(hist.percentile(99)):>6} {hist.errors:>4} {hist.rest_calls:>5}"
+            )
+        table = "\n".join(lines) if rows else "Nenhuma interação registrada ainda."
+
+        embed = discord.Embed(
+            title="📊 Latência do bot",
+            description=f"Desde <t:{int(metrics.started)}:R>\n```\n{table}\n```",
+            color=discord.Color.blurple(),
+        )
+
+        rest = get_rest_queue().snapshot()
+        embed.add_field(
+            name="🌐 Fila REST",
+            value=(
+                f"Na fila: `{rest['depth']}` · em andamento: `{rest['in_flight']}`\n"
+                f"Concluídas: `{rest['completed']}` · falhas: `{rest['failed']}` · 429: `{rest['rate_limited']}`"
+            ),
+            inline=False,
+        )
+
+        # handlers com defer automático: quantas vezes o prazo de 3 s quase estourou
+        near = [
+            f"`{name}`: {s.deferred}/{s.calls} com defer" + (f", {s.missed} perdida(s)" if s.missed else "")
+            for name, s in deadline.stats.items()
+            if s.deferred or s.missed
+        ]
+        if near:
+            embed.add_field(name="⏱️ Prazo de 3 s", value="\n".join(near)[:1024], inline=False)
+
+        embed.set_footer(text=f"Latência do gateway: {round(self.bot.latency * 1000)}ms")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="servicos", description="Serviços de fundo: uptime e tempo por volta (admin).")
+    async def servicos(self, interaction: discord.Interaction):
+        if not await self._allowed(interaction):
+            return
+
+        services = sorted(get_services().services.values(), key=lambda s: s.name)
+        lines = [f"{'serviço':<16} {'estado':<8} {'uptime':>6} {'voltas':>6} {'média':>6} {'máx':>6} {'falhas':>6}"]
+        for s in services:
+            state = "rodando" if s.running else "parado"
+            if s.running and s.streak:
+                state = "backoff"
+            lines.append(
+                f"{s.name[:16]:<16} {state:<8} {fmt_uptime(s.uptime):>6} {s.iterations:>6} "
+                f"{fmt_ms(s.average_ms):>6} {fmt_ms(s.max_ms):>6} {s.failures:>6}"
+            )
+        table = "\n".join(lines) if services else "Nenhum serviço registrado."
+
+        embed = discord.Embed(
+            title="⚙️ Serviços de fundo",
+            description=f"```\n{table}\n```",
+            color=discord.Color.blurple(),
+        )
+
+        errors = [f"`{s.name}`: {s.last_error}" for s in services if s.last_error]
+        if errors:
+            embed.add_field(name="Último erro", value="\n".join(errors)[:1024], inline=False)
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(Stats(bot))
@@ -1,147 +1,367 @@
+import asyncio
 import discord
 from discord.ext import commands
-from asyncio import Lock
 
-from utils.channels import load_channels, save_channels
-
-
-class PrivateRoom:
-    def __init__(self, guild_id: int, owner_id: int, voice_id: int, text_id: int):
-        self.guild_id = guild_id
-        self.owner_id = owner_id
-        self.voice_id = voice_id
-        self.text_id = text_id
+from utils.channel_edits import get_channel_editor
+from utils.locks import KeyedLock
+from utils.metrics import TimedItem, TimedView
+from utils.guest_actions import apply_guest_action, format_outcome
+from utils.panels import GUEST_MENU_TIMEOUT, PANEL_VERSION
+from utils.overwrites import grant_guests
+from utils import rest_queue
+from utils.rest_queue import CLEANUP, INTERACTIVE, NORMAL, delete_channel, get_rest_queue
+from utils.room_pool import get_room_pool
+from utils.room_registry import RoomRecord, RoomRegistry
+from utils.sweeper import TempSweeper, sweep_interval
+from utils.tasks import TaskSet
+from utils.teardown import get_teardown
+from utils.voice_router import Role, get_router
+from utils.voice_store import get_voice_store
+
+
+class PrivateRoom(RoomRecord):
+    __slots__ = ()
+
+    # text_id fica None até o painel ser criado (em segundo plano)
+    def __init__(self, guild_id: int, owner_id: int, voice_id: int, text_id: int | None):
+        super().__init__(guild_id, owner_id, voice_id, text_id)
+        self.panel_version = PANEL_VERSION
+
+    def to_record(self) -> dict:
+        return {
+            "owner_id": self.owner_id,
+            "text_id": self.text_id,
+            "panel_id": self.panel_id,
+            "panel_version": self.panel_version,
+            "invited": sorted(self.invited),
+        }
 
-        # NOVO: convidados registrados (IDs)
-        self.invited: set[int] = set()
+    @classmethod
+    def from_record(cls, guild_id: int, voice_id: int, record: dict) -> "PrivateRoom":
+        room = cls(guild_id, record["owner_id"], voice_id, record["text_id"])
+        room.panel_id = record.get("panel_id")
+        room.panel_version = record.get("panel_version") or 1
+        room.invited = set(record.get("invited", []))
+        return room
 
 
 class VoiceFactory(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.deleting = Lock()
-        # voice_id -> PrivateRoom
-        self.private_rooms: dict[int, PrivateRoom] = {}
+        # locks finos: salas diferentes são criadas/apagadas em paralelo
+        self.room_locks = KeyedLock()    # voice_id → apagar sala
+        self.member_locks = KeyedLock()  # (guild_id, member_id) → criar sala
+        self.store = get_voice_store()
+        self.router = get_router(bot)
+        self.rest = get_rest_queue()
+        self.pool = get_room_pool()
+        self.editor = get_channel_editor()
+        self.teardown = get_teardown()
+        # salas privadas, por servidor/dono/voz/texto
+        self.rooms = RoomRegistry()
+        # temporária → quem a criou (só o dono volta pra ela durante a carência)
+        self.creators: dict[int, int] = {}
+        self._reconcile_task: asyncio.Task | None = None
+        # temporárias que escaparam dos eventos de voz (delete falhou, apagada na mão)
+        self.sweeper = TempSweeper(self.store, self.teardown, self._teardown_temporary, interval=sweep_interval())
+        self._tasks = TaskSet()  # painéis sendo montados, edits repetidos
+
+    async def cog_load(self):
+        # eventos de voz chegam pelo VoiceRouter (utils.voice_router)
+        self.router.add_handler(self, Role.STANDARD_BASE, join=self.on_join_base)
+        self.router.add_handler(
+            self, Role.TEMPORARY, join=self.on_join_temporary, leave=self.on_leave_temporary
+        )
+
+        # botões/selects dos painéis: um handler por ação, pra todas as salas
+        self.bot.add_dynamic_items(PrivatePanelButton, PrivateInviteMultiSelect)
+
+        # retoma salas/painéis de antes do restart ou /reload
+        self._reconcile_task = asyncio.create_task(self.reconcile_all())
+        self.sweeper.start(self.bot)
+
+    async def cog_unload(self):
+        self.router.remove_handlers(self)
+        self.bot.remove_dynamic_items(PrivatePanelButton, PrivateInviteMultiSelect)
+        if self._reconcile_task:
+            self._reconcile_task.cancel()
+        await self.sweeper.stop()
+
+    # =========================================================
+    # ESTADO PERSISTIDO (salas privadas)
+    # =========================================================
+    def save_room(self, guild: discord.Guild, room: PrivateRoom):
+        self.store.save_private_room(guild, room.voice_id, room.to_record())
+
+    def forget_room(self, guild: discord.Guild, voice_id: int) -> PrivateRoom | None:
+        room = self.rooms.by_voice(voice_id)
+        if room is not None:
+            self.rooms.remove(room)
+        self.store.index.unmark(voice_id, Role.PRIVATE_ROOM)
+        self.store.remove_private_room(guild, voice_id)
+        return room
+
+    async def reconcile_all(self):
+        await self.bot.wait_until_ready()
+        for guild in self.bot.guilds:
+            try:
+                await self.reconcile(guild)
+            except Exception as e:
+                print(f"❌ [VOICE] Falha ao reconciliar {guild.name}: {e}")
+
+    async def reconcile(self, guild: discord.Guild):
+        """
+        Compara o estado salvo com o cache do servidor:
+        sala vazia → apaga; sala ocupada → retoma (e religa o painel);
+        registro de canal que não existe mais → descarta.
+        """
+        state = await self.store.guild(guild)
+        dropped = self.pool.reconcile(guild)
+        adopted = deleted = 0
+
+        # salas privadas (registro sem a temporária não vale mais)
+        for voice_id, record in list(state.private_rooms.items()):
+            voice = guild.get_channel(voice_id)
+            if isinstance(voice, discord.VoiceChannel) and voice_id in state.temporary:
+                if self.rooms.by_voice(voice_id) is None:
+                    self.rooms.add(PrivateRoom.from_record(guild.id, voice_id, record))
+                    self.store.index.mark(voice_id, Role.PRIVATE_ROOM)
+                continue
+
+            self.store.remove_private_room(guild, voice_id)
+            text = guild.get_channel(record["text_id"])
+            if isinstance(text, discord.TextChannel):
+                await delete_channel(text, priority=CLEANUP)
+            dropped += 1
+
+        # temporárias
+        for channel_id in list(state.temporary):
+            channel = guild.get_channel(channel_id)
+            if channel is None or len(channel.members) == 0:
+                # some do store; se existir, apaga (com painel, se tiver)
+                await self._teardown_temporary(guild, channel_id)
+                if channel is None:
+                    dropped += 1
+                else:
+                    deleted += 1
+            else:
+                adopted += 1
+
+        # painéis das salas que continuam
+        rooms = self.rooms.in_guild(guild.id)
+        await asyncio.gather(*(self._reattach_panel(guild, r) for r in rooms), return_exceptions=True)
+
+        if adopted or deleted or dropped:
+            print(
+                f"🔁 [VOICE] {guild.name}: {adopted} sala(s) retomada(s), "
+                f"{deleted} vazia(s) apagada(s), {dropped} registro(s) descartado(s)."
+            )
+
+    async def _reattach_panel(self, guild: discord.Guild, room: PrivateRoom):
+        if room.panel_id and room.panel_version == PANEL_VERSION:
+            return  # custom_id já leva o id da sala: o painel responde sozinho
+
+        text = guild.get_channel(room.text_id)
+        if not isinstance(text, discord.TextChannel):
+            return
+
+        view = PrivateRoomPanelView(room.voice_id)
+        if room.panel_id:
+            try:
+                # painel antigo → mesma mensagem com os componentes persistentes
+                await self.rest.submit(
+                    rest_queue.edit_message_route(text.id),
+                    lambda: text.get_partial_message(room.panel_id).edit(view=view),
+                    NORMAL,
+                )
+                room.panel_version = PANEL_VERSION
+                self.save_room(guild, room)
+                return
+            except discord.NotFound:
+                pass  # painel apagado → manda outro
+            except discord.HTTPException:
+                return
+
+        owner = guild.get_member(room.owner_id)
+        voice = guild.get_channel(room.voice_id)
+        if owner is None or not isinstance(voice, discord.VoiceChannel):
+            return
+
+        embed = self.build_private_dashboard(owner, voice)
+        message = await self.rest.submit(
+            rest_queue.message_route(text.id),
+            lambda: text.send(content=owner.mention, embed=embed, view=view),
+            NORMAL,
+        )
+        room.panel_id = message.id
+        room.panel_version = PANEL_VERSION
+        self.save_room(guild, room)
+
+    # =========================================================
+    # ENTRANDO EM CANAL-BASE PADRÃO
+    # =========================================================
+    async def on_join_base(self, member: discord.Member, channel: discord.VoiceChannel):
+        state = self.store.cached(member.guild.id)
+        cfg = state.bases.get(channel.id) if state else None
+        if not cfg:
+            return
+
+        async with self.member_locks.hold((member.guild.id, member.id)):
+            # evento repetido/atrasado: só cria se ele ainda está no canal-base
+            voice = member.voice
+            if voice is None or voice.channel is None or voice.channel.id != channel.id:
+                return
+
+            # caiu da própria sala há pouco → volta pra ela em vez de criar outra
+            if await self._return_to_pending(member, channel):
+                return
+
+            await self._create_standard_temp(member, channel, cfg)
+
+    async def _return_to_pending(self, member: discord.Member, base: discord.VoiceChannel) -> bool:
+        guild = member.guild
+        pending_id = self.teardown.find((guild.id, member.id))
+        if pending_id is None or self.pool.origin(pending_id) != base.id:
+            return False
+
+        room = guild.get_channel(pending_id)
+        if not isinstance(room, discord.VoiceChannel) or not self.teardown.cancel(pending_id):
+            return False
+
+        try:
+            await self.rest.submit(
+                rest_queue.member_route(guild.id, member.id),
+                lambda: member.move_to(room),
+                INTERACTIVE,
+            )
+        except discord.HTTPException:
+            # não deu pra mover → a sala antiga volta pra fila de exclusão
+            self._schedule_teardown(guild, room)
+            return False
+        return True
 
-    @commands.Cog.listener()
-    async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
-        if member.bot:
+    # =========================================================
+    # VOLTANDO pra um canal temporário (cancela exclusão pendente)
+    # =========================================================
+    async def on_join_temporary(self, member: discord.Member, channel: discord.VoiceChannel):
+        self.teardown.cancel(channel.id)
+
+    # =========================================================
+    # SAINDO de um canal temporário
+    # =========================================================
+    async def on_leave_temporary(self, member: discord.Member, channel: discord.VoiceChannel):
+        if len(channel.members) > 0:
             return
 
-        data = load_channels()
-        base_cfg = data.get("voice_base_configs", {})
-        temps = data.setdefault("voice_temporary", [])
-
-        # =========================================================
-        # ENTRANDO EM CANAL-BASE PADRÃO
-        # =========================================================
-        if after.channel:
-            cfg = base_cfg.get(str(after.channel.id))
-            if cfg:
-                await self._create_standard_temp(member, after, cfg, temps, data)
-
-        # =========================================================
-        # SAINDO de um canal temporário
-        # =========================================================
-        data = load_channels()
-        temps = data.get("voice_temporary", [])
-
-        if before.channel and before.channel.id in temps:
-            if len(before.channel.members) > 0:
+        state = self.store.cached(member.guild.id)
+        if channel.id not in state.temporary:
+            return
+
+        # sala vazia fica pendente pela carência; quem voltar cancela
+        self._schedule_teardown(member.guild, channel)
+
+    def _schedule_teardown(self, guild: discord.Guild, channel: discord.VoiceChannel):
+        state = self.store.cached(guild.id)
+        base_id = self.pool.origin(channel.id)
+        delay = self.teardown.delay_for(state.bases.get(base_id) if base_id else None)
+
+        # marcada com o dono (não com quem saiu por último): só ele é levado de volta
+        room = self.rooms.by_voice(channel.id)
+        owner_id = room.owner_id if room else self.creators.get(channel.id)
+
+        channel_id = channel.id
+        self.teardown.schedule(
+            channel_id,
+            delay,
+            lambda: self._teardown_temporary(guild, channel_id),
+            tag=(guild.id, owner_id) if owner_id else None,
+        )
+
+    async def _teardown_temporary(self, guild: discord.Guild, channel_id: int):
+        state = self.store.cached(guild.id)
+
+        async with self.room_locks.hold(channel_id):
+            channel = guild.get_channel(channel_id)
+            if state is None or channel_id not in state.temporary:
+                return
+            # alguém entrou depois que a carência começou
+            if channel is not None and len(channel.members) > 0:
                 return
 
-            async with self.deleting:
-                data = load_channels()
-                temps = data.get("voice_temporary", [])
-
-                if before.channel.id in temps and len(before.channel.members) == 0:
-                    # deletar canal de voz
-                    try:
-                        await before.channel.delete()
-                    except Exception:
-                        pass
-                    else:
-                        temps.remove(before.channel.id)
-                        data["voice_temporary"] = temps
-                        save_channels(data)
-
-                    # se for sala privada com painel, deletar o texto também
-                    room = self.private_rooms.pop(before.channel.id, None)
-                    if room:
-                        guild = self.bot.get_guild(room.guild_id)
-                        if guild:
-                            text_ch = guild.get_channel(room.text_id)
-                            if isinstance(text_ch, discord.TextChannel):
-                                try:
-                                    await text_ch.delete()
-                                except Exception:
-                                    pass
+            if channel is None:
+                # apagada na mão durante a carência
+                self.pool.untrack(channel_id)
+                self.store.remove_temporary(guild, channel_id)
+            # reciclar (volta oculta pro pool do canal-base) ou deletar
+            elif await self.pool.recycle(guild, channel):
+                self.store.remove_temporary(guild, channel_id)
+            elif await delete_channel(channel, priority=CLEANUP):
+                self.store.remove_temporary(guild, channel_id)
+            if channel_id not in state.temporary:
+                self.creators.pop(channel_id, None)
+
+            # se for sala privada com painel, deletar o texto também
+            room = self.forget_room(guild, channel_id)
+            if room:
+                text_ch = guild.get_channel(room.text_id)
+                if isinstance(text_ch, discord.TextChannel):
+                    await delete_channel(text_ch, priority=CLEANUP)
 
     # =========================================================
     # Encerrar manualmente uma sala privada (painel)
     # =========================================================
     async def end_private_room(self, room: PrivateRoom, guild: discord.Guild):
-        data = load_channels()
-        temps = data.get("voice_temporary", [])
+        await self.store.guild(guild)
 
-        voice = guild.get_channel(room.voice_id)
-        text = guild.get_channel(room.text_id)
+        async with self.room_locks.hold(room.voice_id):
+            voice = guild.get_channel(room.voice_id)
+            text = guild.get_channel(room.text_id)
 
-        # remover dos temporários
-        if room.voice_id in temps:
-            temps.remove(room.voice_id)
-            data["voice_temporary"] = temps
-            save_channels(data)
+            # remover dos temporários
+            self.teardown.cancel(room.voice_id)
+            self.store.remove_temporary(guild, room.voice_id)
+            self.pool.untrack(room.voice_id)
+            self.creators.pop(room.voice_id, None)
 
-        if isinstance(voice, discord.VoiceChannel):
-            try:
-                await voice.delete()
-            except Exception:
-                pass
+            # encerrada pelo dono → alguém está esperando, não é só limpeza
+            if isinstance(voice, discord.VoiceChannel):
+                await delete_channel(voice, priority=NORMAL)
 
-        if isinstance(text, discord.TextChannel):
-            try:
-                await text.delete()
-            except Exception:
-                pass
+            if isinstance(text, discord.TextChannel):
+                await delete_channel(text, priority=NORMAL)
 
-        self.private_rooms.pop(room.voice_id, None)
+            self.forget_room(guild, room.voice_id)
 
     # =========================================================
     # Helper: aplicar permissão de acesso na sala privada
     # =========================================================
-    async def grant_private_access(self, guild: discord.Guild, room: PrivateRoom, member: discord.Member):
+    async def grant_private_access(self, guild: discord.Guild, room: PrivateRoom, members: list[discord.Member]) -> bool:
         voice = guild.get_channel(room.voice_id)
         text = guild.get_channel(room.text_id)
 
         if not isinstance(voice, discord.VoiceChannel):
-            return
+            return False
 
-        await voice.set_permissions(
-            member,
-            view_channel=True,
-            connect=True,
-            speak=True,
+        # um edit de overwrites por canal pra todos os convidados
+        granted = await grant_guests(
+            voice,
+            text if isinstance(text, discord.TextChannel) else None,
+            room.invited,
+            members,
+            keep={room.owner_id},
         )
-
-        if isinstance(text, discord.TextChannel):
-            await text.set_permissions(
-                member,
-                view_channel=True,
-                send_messages=False,
-                read_message_history=True,
-            )
-
-        room.invited.add(member.id)
+        if granted:
+            self.save_room(guild, room)
+        return granted
 
     # =========================================================
     # criação de sala temporária padrão
     # =========================================================
-    async def _create_standard_temp(self, member, after, cfg, temps, data):
+    async def _create_standard_temp(self, member, base, cfg):
         guild = member.guild
-        category = guild.get_channel(cfg.get("category")) or after.channel.category
+        category = guild.get_channel(cfg.get("category")) or base.category
 
-        template = cfg.get("temp_name") or after.channel.name
+        template = cfg.get("temp_name") or base.name
         temp_name = template.replace("{user}", member.display_name)
 
         slots = cfg.get("slots") or 0
@@ -160,25 +380,64 @@ class VoiceFactory(commands.Cog):
                 ),
             }
 
-        kwargs = {
-            "name": temp_name,
-            "user_limit": slots,
-            "category": category,
-        }
-        if overwrites:
-            kwargs["overwrites"] = overwrites
+        # sala pré-criada do pool → libera e move ao mesmo tempo
+        new_channel, moved = await self._claim_pooled(member, base, temp_name, slots, overwrites, category)
 
-        try:
-            new_channel = await guild.create_voice_channel(**kwargs)
-        except Exception:
-            return
+        if new_channel is None:
+            kwargs = {
+                "name": temp_name,
+                "user_limit": slots,
+                "category": category,
+            }
+            if overwrites:
+                kwargs["overwrites"] = overwrites
 
-        temps.append(new_channel.id)
-        data["voice_temporary"] = temps
-        save_channels(data)
+            try:
+                new_channel = await self.rest.submit(
+                    rest_queue.create_channel_route(guild.id),
+                    lambda: guild.create_voice_channel(**kwargs),
+                    NORMAL,
+                )
+            except discord.HTTPException:
+                return
+
+        self.store.add_temporary(guild, new_channel.id)
+        self.pool.track(new_channel.id, base.id)
+        self.creators[new_channel.id] = member.id
+        self.pool.refill(guild, base, cfg)
 
-        # se for privado (locked), criar painel em canal de texto
+        # registrada antes de mover: se a sala acabar logo, o painel não fica órfão
+        room = None
         if locked:
+            room = PrivateRoom(guild_id=guild.id, owner_id=member.id, voice_id=new_channel.id, text_id=None)
+            self.rooms.add(room)
+            self.store.index.mark(new_channel.id, Role.PRIVATE_ROOM)
+
+        # mover user (caminho crítico: o resto não atrasa quem entrou)
+        if not moved:
+            try:
+                await self.rest.submit(
+                    rest_queue.member_route(guild.id, member.id),
+                    lambda: member.move_to(new_channel),
+                    INTERACTIVE,
+                )
+            except discord.HTTPException:
+                # saiu do canal-base antes de ser movido → sala vazia entra na carência
+                self._schedule_teardown(guild, new_channel)
+
+        # se for privado (locked), painel em canal de texto em segundo plano
+        if room is not None:
+            self._tasks.spawn(self._build_private_panel(member, new_channel, room, category))
+
+    async def _build_private_panel(self, member, voice, room: PrivateRoom, category):
+        """Canal de texto + painel da sala trancada, montados depois que o dono já está na voz."""
+        guild = member.guild
+
+        # mesmo lock da exclusão: encerrar/apagar a sala espera o painel ficar pronto
+        async with self.room_locks.hold(room.voice_id):
+            if room not in self.rooms:
+                return  # sala já encerrada
+
             txt_overwrites = {
                 guild.default_role: discord.PermissionOverwrite(view_channel=False),
                 guild.me: discord.PermissionOverwrite(
@@ -193,34 +452,92 @@ class VoiceFactory(commands.Cog):
                 ),
             }
 
-            text_channel = await guild.create_text_channel(
-                name=f"painel-{member.name}".replace(" ", "-").lower(),
-                category=category,
-                overwrites=txt_overwrites,
-            )
+            try:
+                text_channel = await self.rest.submit(
+                    rest_queue.create_channel_route(guild.id),
+                    lambda: guild.create_text_channel(
+                        name=f"painel-{member.name}".replace(" ", "-").lower(),
+                        category=category,
+                        overwrites=txt_overwrites,
+                    ),
+                    NORMAL,
+                )
+            except discord.HTTPException as e:
+                print(f"❌ [VOICE] Painel da sala {voice.id} não foi criado: {e}")
+                return
 
-            room = PrivateRoom(
-                guild_id=guild.id,
-                owner_id=member.id,
-                voice_id=new_channel.id,
-                text_id=text_channel.id,
-            )
-            self.private_rooms[new_channel.id] = room
+            self.rooms.rebind(room, text_id=text_channel.id)
+            # salva antes do painel: se o bot cair aqui, o texto não fica perdido
+            self.save_room(guild, room)
 
-            view = PrivateRoomPanelView(self, room)
-            embed = self.build_private_dashboard(member, new_channel)
+            view = PrivateRoomPanelView(room.voice_id)
+            embed = self.build_private_dashboard(member, voice)
 
-            await text_channel.send(
-                content=member.mention,
-                embed=embed,
-                view=view,
-            )
+            try:
+                message = await self.rest.submit(
+                    rest_queue.message_route(text_channel.id),
+                    lambda: text_channel.send(content=member.mention, embed=embed, view=view),
+                    NORMAL,
+                )
+            except discord.HTTPException:
+                return  # sem panel_id: o reconcile manda outro no próximo start
+
+            room.panel_id = message.id
+            self.save_room(guild, room)
+
+    async def _claim_pooled(self, member, base, name, slots, overwrites, category):
+        """
+        Pega uma sala do pool do canal-base, renomeia/libera e move o membro.
+        Devolve (sala, movido); (None, False) se não tem sala utilizável.
+        """
+        guild = member.guild
+        channel = self.pool.take(guild, base.id)
+        if channel is None:
+            return None, False
+
+        if overwrites is None:
+            # sala aberta → mesmas permissões da categoria
+            overwrites = category.overwrites if category else {}
+
+        changes = {"user_limit": slots, "overwrites": overwrites}
+        if channel.name != name:
+            # sala reciclada do mesmo nome → não gasta renomeação
+            changes["name"] = name
+
+        # rotas diferentes (canal x membro): as duas chamadas saem em paralelo
+        edited, move = await asyncio.gather(
+            self.rest.submit(
+                rest_queue.edit_channel_route(channel.id),
+                lambda: channel.edit(**changes),
+                INTERACTIVE,
+            ),
+            self.rest.submit(
+                rest_queue.member_route(guild.id, member.id),
+                lambda: member.move_to(channel),
+                INTERACTIVE,
+            ),
+            return_exceptions=True,
+        )
+
+        moved = not isinstance(move, Exception)
+        if not isinstance(edited, Exception):
+            # sem mover: quem chamou tenta de novo e, se falhar, a sala entra na carência
+            return channel, moved
+
+        if moved:
+            # o membro já está lá dentro → fica com a sala, o edit sai de novo pelo editor
+            self._tasks.spawn(self._retry_pooled_edit(channel, changes))
+            return channel, True
+
+        # sala do pool inutilizável e vazia → apaga e cai no caminho normal
+        await delete_channel(channel)
+        return None, False
 
-        # mover user
+    async def _retry_pooled_edit(self, channel, changes):
         try:
-            await member.move_to(new_channel)
-        except Exception:
-            pass
+            await self.editor.apply(channel, priority=NORMAL, **changes)
+        except discord.HTTPException as e:
+            print(f"❌ [VOICE] Sala do pool {channel.id} não foi liberada: {e}")
 
     def build_private_dashboard(self, owner: discord.Member, voice: discord.VoiceChannel) -> discord.Embed:
         embed = discord.Embed(
@@ -241,47 +558,88 @@ class VoiceFactory(commands.Cog):
 
 # =========================================================
 #   VIEW DO PAINEL DE SALA PRIVADA (padrão locked)
+#   Componentes persistentes: o custom_id leva o id da sala
+#   ("vf:<ação>:<voice_id>") e um handler por ação busca a sala
+#   na cog. Nenhuma View fica guardada no bot por sala, e o
+#   painel continua funcionando depois de restart/reload.
 # =========================================================
+
 class PrivateRoomPanelView(discord.ui.View):
-    def __init__(self, cog: VoiceFactory, room: PrivateRoom):
+    def __init__(self, voice_id: int):
         super().__init__(timeout=None)
-        self.cog = cog
-        self.room = room
 
         # select multi de usuários
-        self.add_item(PrivateInviteMultiSelect(self))
+        self.add_item(PrivateInviteMultiSelect(voice_id))
+        for action in PrivatePanelButton.ACTIONS:
+            self.add_item(PrivatePanelButton(action, voice_id))
+
+
+async def resolve_private_room(interaction: discord.Interaction, voice_id: int):
+    """(cog, sala) do painel, ou None (já respondendo) se a sala acabou ou não é do usuário."""
+    cog = interaction.client.get_cog("VoiceFactory")
+    room = cog.rooms.by_voice(voice_id) if cog else None
+
+    if room is None:
+        await interaction.response.send_message("Esta sala não existe mais.", ephemeral=True)
+        return None
+    if interaction.user.id != room.owner_id:
+        await interaction.response.send_message("Apenas o dono da sala pode usar este painel.", ephemeral=True)
+        return None
+    return cog, room
+
+
+class PrivatePanelButton(
+    TimedItem,
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"vf:(?P<action>guests|lock|end):(?P<voice_id>\d+)",
+):
+    # ação → (texto, estilo)
+    ACTIONS = {
+        "guests": ("Gerenciar convidados", discord.ButtonStyle.secondary),
+        "lock": ("Travar/Destravar sala", discord.ButtonStyle.secondary),
+        "end": ("Encerrar sala", discord.ButtonStyle.danger),
+    }
+
+    def __init__(self, action: str, voice_id: int):
+        label, style = self.ACTIONS[action]
+        super().__init__(
+            discord.ui.Button(label=label, style=style, row=1, custom_id=f"vf:{action}:{voice_id}")
+        )
+        self.action = action
+        self.voice_id = voice_id
 
-    async def _check_owner(self, interaction: discord.Interaction) -> bool:
-        if interaction.user.id != self.room.owner_id:
-            await interaction.response.send_message("Apenas o dono da sala pode usar este painel.", ephemeral=True)
-            return False
-        return True
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["action"], int(match["voice_id"]))
 
-    async def invite_members(self, interaction: discord.Interaction, members: list[discord.Member]):
-        guild = interaction.guild
-        if not guild:
+    async def callback(self, interaction: discord.Interaction):
+        resolved = await resolve_private_room(interaction, self.voice_id)
+        if resolved is None:
             return
 
-        for m in members:
-            await self.cog.grant_private_access(guild, self.room, m)
-
-    @discord.ui.button(label="Gerenciar convidados", style=discord.ButtonStyle.secondary, row=1)
-    async def btn_manage_guests(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if not await self._check_owner(interaction):
-            return
+        cog, room = resolved
+        if self.action == "guests":
+            await self.manage_guests(interaction, cog, room)
+        elif self.action == "lock":
+            await self.toggle_lock(interaction, cog, room)
+        else:
+            # responde antes de apagar, pra não dar Unknown Channel
+            await interaction.response.send_message("Sala privada encerrada.", ephemeral=True)
+            await cog.end_private_room(room, interaction.guild)
 
+    async def manage_guests(self, interaction: discord.Interaction, cog: VoiceFactory, room: PrivateRoom):
         guild = interaction.guild
         if not guild:
             return
 
-        voice = guild.get_channel(self.room.voice_id)
+        voice = guild.get_channel(room.voice_id)
         if not isinstance(voice, discord.VoiceChannel):
             return await interaction.response.send_message("Sala não encontrada.", ephemeral=True)
 
         desc = "Nenhum convidado ainda."
-        if self.room.invited:
+        if room.invited:
             linhas = []
-            for uid in self.room.invited:
+            for uid in room.invited:
                 m = guild.get_member(uid)
                 if m:
                     linhas.append(m.mention)
@@ -295,16 +653,12 @@ class PrivateRoomPanelView(discord.ui.View):
         )
         embed.set_footer(text="Selecione um ou mais convidados e use os botões abaixo.")
 
-        view = PrivateGuestManagerView(self.cog, self.room)
+        view = PrivateGuestManagerView(guild, room)
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
-    @discord.ui.button(label="Travar/Destravar sala", style=discord.ButtonStyle.secondary, row=1)
-    async def btn_lock(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if not await self._check_owner(interaction):
-            return
-
+    async def toggle_lock(self, interaction: discord.Interaction, cog: VoiceFactory, room: PrivateRoom):
         guild = interaction.guild
-        voice = guild.get_channel(self.room.voice_id)
+        voice = guild.get_channel(room.voice_id)
         if not isinstance(voice, discord.VoiceChannel):
             return await interaction.response.send_message("Sala não encontrada.", ephemeral=True)
 
@@ -312,41 +666,47 @@ class PrivateRoomPanelView(discord.ui.View):
         perms = voice.overwrites_for(default_role)
         locked_now = (not perms.view_channel) or (perms.connect is False)
 
-        if locked_now:
-            await voice.set_permissions(default_role, view_channel=True, connect=True)
-            msg = "Sala destravada."
-        else:
-            await voice.set_permissions(default_role, view_channel=False, connect=False)
-            msg = "Sala travada."
-
-        await interaction.response.send_message(msg, ephemeral=True)
+        try:
+            # trancada → libera; aberta → tranca
+            await cog.rest.submit(
+                rest_queue.permissions_route(voice.id),
+                lambda: voice.set_permissions(default_role, view_channel=locked_now, connect=locked_now),
+                INTERACTIVE,
+            )
+        except discord.HTTPException:
+            return await interaction.response.send_message("⚠️ Não foi possível alterar a sala agora.", ephemeral=True)
 
-    @discord.ui.button(label="Encerrar sala", style=discord.ButtonStyle.danger, row=1)
-    async def btn_close(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if not await self._check_owner(interaction):
-            return
+        msg = "Sala destravada." if locked_now else "Sala travada."
 
-        guild = interaction.guild
-        # responde antes de apagar, pra não dar Unknown Channel
-        await interaction.response.send_message("Sala privada encerrada.", ephemeral=True)
-        await self.cog.end_private_room(self.room, guild)
+        await interaction.response.send_message(msg, ephemeral=True)
 
 
-class PrivateInviteMultiSelect(discord.ui.UserSelect):
-    def __init__(self, parent_view: PrivateRoomPanelView):
-        self.parent_view = parent_view
+class PrivateInviteMultiSelect(
+    TimedItem,
+    discord.ui.DynamicItem[discord.ui.UserSelect],
+    template=r"vf:invite:(?P<voice_id>\d+)",
+):
+    def __init__(self, voice_id: int):
         super().__init__(
-            placeholder="Selecionar usuários para convidar…",
-            min_values=1,
-            max_values=10,
-            row=0,
+            discord.ui.UserSelect(
+                placeholder="Selecionar usuários para convidar…",
+                min_values=1,
+                max_values=10,
+                row=0,
+                custom_id=f"vf:invite:{voice_id}",
+            )
         )
+        self.voice_id = voice_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.UserSelect, match):
+        return cls(int(match["voice_id"]))
 
     async def callback(self, interaction: discord.Interaction):
-        if not await self.parent_view._check_owner(interaction):
+        if await resolve_private_room(interaction, self.voice_id) is None:
             return
 
-        members = [m for m in self.values if isinstance(m, discord.Member)]
+        members = [m for m in self.item.values if isinstance(m, discord.Member)]
         if not members:
             return await interaction.response.send_message("Seleção inválida.", ephemeral=True)
 
@@ -357,22 +717,30 @@ class PrivateInviteMultiSelect(discord.ui.UserSelect):
             color=discord.Color.blurple(),
         )
 
-        view = PrivateConfirmInviteView(self.parent_view, members)
+        view = PrivateConfirmInviteView(self.voice_id, members)
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
 
-class PrivateConfirmInviteView(discord.ui.View):
-    def __init__(self, parent_panel: PrivateRoomPanelView, members: list[discord.Member]):
+class PrivateConfirmInviteView(TimedView):
+    def __init__(self, voice_id: int, members: list[discord.Member]):
         super().__init__(timeout=60)
-        self.parent_panel = parent_panel
+        self.voice_id = voice_id
         self.members = members
 
     @discord.ui.button(label="SIM", style=discord.ButtonStyle.success)
     async def btn_yes(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if not await self.parent_panel._check_owner(interaction):
+        resolved = await resolve_private_room(interaction, self.voice_id)
+        if resolved is None:
             return
 
-        await self.parent_panel.invite_members(interaction, self.members)
+        cog, room = resolved
+        if not await cog.grant_private_access(interaction.guild, room, self.members):
+            return await interaction.response.edit_message(
+                content="❌ Não foi possível liberar a sala agora. Tente de novo.",
+                embed=None,
+                view=None,
+            )
+
         lista = ", ".join(m.mention for m in self.members)
         await interaction.response.edit_message(
             content=f"✅ Convite enviado para: {lista}",
@@ -382,7 +750,7 @@ class PrivateConfirmInviteView(discord.ui.View):
 
     @discord.ui.button(label="NÃO", style=discord.ButtonStyle.danger)
     async def btn_no(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if not await self.parent_panel._check_owner(interaction):
+        if await resolve_private_room(interaction, self.voice_id) is None:
             return
 
         await interaction.response.edit_message(
@@ -392,70 +760,49 @@ class PrivateConfirmInviteView(discord.ui.View):
         )
 
 
-class PrivateGuestManagerView(discord.ui.View):
-    def __init__(self, cog: VoiceFactory, room: PrivateRoom):
-        super().__init__(timeout=None)
-        self.cog = cog
-        self.room = room
+class PrivateGuestManagerView(TimedView):
+    def __init__(self, guild: discord.Guild, room: PrivateRoom):
+        # menu efêmero: expira e sai do bot em vez de ficar preso pra sempre
+        super().__init__(timeout=GUEST_MENU_TIMEOUT)
+        self.voice_id = room.voice_id
         self.selected_ids: list[int] = []
 
-        self.add_item(PrivateGuestSelect(self))
-
-    async def _check_owner(self, interaction: discord.Interaction) -> bool:
-        if interaction.user.id != self.room.owner_id:
-            await interaction.response.send_message(
-                "Apenas o dono da sala pode gerenciar os convidados.",
-                ephemeral=True,
-            )
-            return False
-        return True
+        self.add_item(PrivateGuestSelect(self, guild, room))
 
     async def _apply_to_selected(self, interaction: discord.Interaction, action: str):
-        if not await self._check_owner(interaction):
+        resolved = await resolve_private_room(interaction, self.voice_id)
+        if resolved is None:
             return
 
+        cog, room = resolved
         guild = interaction.guild
         if not guild:
             return
 
-        voice = guild.get_channel(self.room.voice_id)
+        voice = guild.get_channel(room.voice_id)
         if not isinstance(voice, discord.VoiceChannel):
             return await interaction.response.send_message("Sala não encontrada.", ephemeral=True)
 
         if not self.selected_ids:
             return await interaction.response.send_message("Nenhum convidado selecionado.", ephemeral=True)
 
-        afetados = []
-        for uid in self.selected_ids:
-            member = guild.get_member(uid)
-            if not member:
-                continue
-
-            if action == "mute":
-                await member.edit(mute=True)
-            elif action == "unmute":
-                await member.edit(mute=False)
-            elif action == "deaf":
-                await member.edit(deafen=True)
-            elif action == "undeaf":
-                await member.edit(deafen=False)
-            elif action == "kick":
-                await member.move_to(None)
-                ch = guild.get_channel(self.room.voice_id)
-                if isinstance(ch, discord.VoiceChannel):
-                    await ch.set_permissions(member, overwrite=None)
-                if uid in self.room.invited:
-                    self.room.invited.remove(uid)
-
-            afetados.append(member.mention)
-
-        if not afetados:
+        members = [m for m in map(guild.get_member, self.selected_ids) if m]
+        if not members:
             return await interaction.response.send_message("Nenhum usuário afetado.", ephemeral=True)
 
-        await interaction.response.send_message(
-            f"Ação `{action}` aplicada em: {', '.join(afetados)}",
-            ephemeral=True,
+        # várias chamadas REST → responde já e manda o resultado num follow-up só
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        outcome = await apply_guest_action(
+            voice,
+            members,
+            action,
+            room.invited,
+            keep={room.owner_id},
         )
+        if action == "kick":
+            cog.save_room(guild, room)
+        await interaction.followup.send(format_outcome(action, outcome), ephemeral=True)
 
     @discord.ui.button(label="Mute", style=discord.ButtonStyle.secondary, row=1)
     async def btn_mute(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -479,11 +826,8 @@ class PrivateGuestManagerView(discord.ui.View):
 
 
 class PrivateGuestSelect(discord.ui.Select):
-    def __init__(self, parent_view: PrivateGuestManagerView):
+    def __init__(self, parent_view: PrivateGuestManagerView, guild: discord.Guild, room: PrivateRoom):
         self.parent_view = parent_view
-        room = parent_view.room
-        cog = parent_view.cog
-        guild = cog.bot.get_guild(room.guild_id)
 
         options: list[discord.SelectOption] = []
         if guild and room.invited:
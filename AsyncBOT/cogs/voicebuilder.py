@@ -1,28 +1,66 @@
+import asyncio
 import discord
 from discord.ext import commands
 from discord import app_commands
-from typing import Optional, Dict
-
-from utils.channels import load_channels, save_channels
+from typing import Optional
+
+from utils import rest_queue
+from utils.rest_queue import CLEANUP, INTERACTIVE, NORMAL, delete_channel, get_rest_queue
+from utils.channel_edits import RENAME_LIMIT, RENAME_WINDOW, get_channel_editor
+from utils.deadline import auto_defer, reply
+from utils.guest_actions import apply_guest_action, format_outcome
+from utils.metrics import TimedItem, TimedModal, TimedView
+from utils.panels import GUEST_MENU_TIMEOUT, PANEL_VERSION
+from utils.overwrites import GUEST_VOICE, grant_guests
+from utils.room_pool import DEFAULT_RECYCLE_MAX, DEFAULT_RECYCLE_TTL, get_room_pool
+from utils.room_registry import RoomRecord, RoomRegistry
+from utils.teardown import get_teardown
+from utils.voice_router import Role, get_router
+from utils.voice_store import get_voice_store
 
 
 # =========================================================
 #   Sessão custom individual
 # =========================================================
-class CustomSession:
+class CustomSession(RoomRecord):
+	__slots__ = ("category_id", "name_template", "slots", "locked")
+
 	def __init__(self, user: discord.abc.User, category: discord.CategoryChannel, text_channel: discord.TextChannel):
-		self.user_id: int = user.id
-		self.guild_id: int = category.guild.id
+		# sala de voz só existe depois do "Aplicar configuração"
+		super().__init__(category.guild.id, user.id, None, text_channel.id)
 		self.category_id: int = category.id
-		self.text_channel_id: int = text_channel.id
-		self.voice_channel_id: Optional[int] = None
 
 		self.name_template: str = f"Sala de {user.display_name}"
 		self.slots: int = 0
 		self.locked: bool = False
+		self.panel_version = PANEL_VERSION
+
+	def to_record(self) -> dict:
+		return {
+			"category_id": self.category_id,
+			"text_id": self.text_id,
+			"voice_id": self.voice_id,
+			"panel_id": self.panel_id,
+			"panel_version": self.panel_version,
+			"name_template": self.name_template,
+			"slots": self.slots,
+			"locked": self.locked,
+			"invited": sorted(self.invited),
+		}
 
-		# NOVO: lista de convidados
-		self.invited: set[int] = set()
+	@classmethod
+	def from_record(cls, guild_id: int, user_id: int, record: dict) -> "CustomSession":
+		# sem objetos do discord aqui: no restart só temos os IDs
+		session = cls.__new__(cls)
+		RoomRecord.__init__(session, guild_id, user_id, record.get("voice_id"), record["text_id"])
+		session.category_id = record["category_id"]
+		session.name_template = record.get("name_template") or "Sala de {user}"
+		session.slots = record.get("slots") or 0
+		session.locked = bool(record.get("locked"))
+		session.invited = set(record.get("invited", []))
+		session.panel_id = record.get("panel_id")
+		session.panel_version = record.get("panel_version") or 1
+		return session
 
 
 # =========================================================
@@ -32,8 +70,121 @@ class VoiceBuilder(commands.Cog):
 	"""Painel para criar canais-base e sessões custom."""
 	def __init__(self, bot: commands.Bot):
 		self.bot = bot
-		# Sessões abertas (user_id → session)
-		self.custom_sessions: Dict[int, CustomSession] = {}
+		self.store = get_voice_store()
+		self.router = get_router(bot)
+		self.rest = get_rest_queue()
+		self.pool = get_room_pool()
+		self.teardown = get_teardown()
+		# edits da sala custom agrupados (nome respeita o limite de renomeação)
+		self.editor = get_channel_editor()
+		# Sessões abertas, por servidor/dono/voz/texto
+		self.sessions = RoomRegistry()
+		self._reconcile_task: Optional[asyncio.Task] = None
+
+	async def cog_load(self):
+		# eventos de voz chegam pelo VoiceRouter (utils.voice_router)
+		self.router.add_handler(self, Role.CUSTOM_BASE, join=self.on_join_custom_base)
+		self.router.add_handler(
+			self, Role.CUSTOM_SESSION, join=self.on_join_custom_session, leave=self.on_leave_custom_session
+		)
+
+		# botões/selects dos painéis: um handler por ação, pra todas as sessões
+		self.bot.add_dynamic_items(CustomPanelButton, CustomInviteMultiSelect)
+
+		# retoma sessões/painéis de antes do restart ou /reload
+		self._reconcile_task = asyncio.create_task(self.reconcile_all())
+
+	async def cog_unload(self):
+		self.router.remove_handlers(self)
+		self.bot.remove_dynamic_items(CustomPanelButton, CustomInviteMultiSelect)
+		if self._reconcile_task:
+			self._reconcile_task.cancel()
+
+	# -----------------------------------------
+	# ESTADO PERSISTIDO (sessões custom)
+	# -----------------------------------------
+	def save_session(self, session: CustomSession):
+		guild = self.bot.get_guild(session.guild_id)
+		if guild is not None and self.store.cached(guild.id) is not None:
+			self.store.save_custom_session(guild, session.owner_id, session.to_record())
+
+	async def reconcile_all(self):
+		await self.bot.wait_until_ready()
+		for guild in self.bot.guilds:
+			try:
+				await self.reconcile(guild)
+			except Exception as e:
+				print(f"❌ [VOICE] Falha ao reconciliar sessões de {guild.name}: {e}")
+
+	async def reconcile(self, guild: discord.Guild):
+		"""
+		Sessão com sala ocupada (ou só com painel) → retoma e religa o painel;
+		sala vazia ou apagada → encerra (apaga o que sobrou).
+		"""
+		state = await self.store.guild(guild)
+		adopted = ended = 0
+
+		for user_id, record in list(state.custom_sessions.items()):
+			if self.sessions.by_owner(guild.id, user_id) is not None:
+				continue
+
+			session = CustomSession.from_record(guild.id, user_id, record)
+			text = guild.get_channel(session.text_id)
+			voice = guild.get_channel(session.voice_id) if session.voice_id else None
+
+			occupied = isinstance(voice, discord.VoiceChannel) and len(voice.members) > 0
+			panel_only = session.voice_id is None and isinstance(text, discord.TextChannel)
+
+			if occupied or panel_only:
+				self.sessions.add(session)
+				if occupied:
+					self._bind_voice(session, voice.id)
+				await self._reattach_panel(guild, session)
+				adopted += 1
+			else:
+				await self.end_custom_session(session, reason="Sessão custom órfã.")
+				ended += 1
+
+		if adopted or ended:
+			print(f"🔁 [VOICE] {guild.name}: {adopted} sessão(ões) custom retomada(s), {ended} encerrada(s).")
+
+	async def _reattach_panel(self, guild: discord.Guild, session: CustomSession):
+		if session.panel_id and session.panel_version == PANEL_VERSION:
+			return  # custom_id já leva o dono da sessão: o painel responde sozinho
+
+		text = guild.get_channel(session.text_id)
+		if not isinstance(text, discord.TextChannel):
+			return
+
+		view = CustomPanelView(session.owner_id)
+		if session.panel_id:
+			try:
+				# painel antigo → mesma mensagem com os componentes persistentes
+				await self.rest.submit(
+					rest_queue.edit_message_route(text.id),
+					lambda: text.get_partial_message(session.panel_id).edit(view=view),
+					NORMAL,
+				)
+				session.panel_version = PANEL_VERSION
+				self.save_session(session)
+				return
+			except discord.NotFound:
+				pass  # painel apagado → manda outro
+			except discord.HTTPException:
+				return
+
+		member = guild.get_member(session.owner_id)
+		if member is None:
+			return
+
+		message = await self.rest.submit(
+			rest_queue.message_route(text.id),
+			lambda: text.send(content=member.mention, embed=self.build_custom_dashboard(member, session), view=view),
+			NORMAL,
+		)
+		session.panel_id = message.id
+		session.panel_version = PANEL_VERSION
+		self.save_session(session)
 
 	# -----------------------------------------
 	# PERMISSÕES
@@ -67,6 +218,7 @@ class VoiceBuilder(commands.Cog):
 	# =====================================================
 	#   PADRÃO — cria canal-base que gera temporários
 	# =====================================================
+	@auto_defer()
 	async def create_standard_template(
 		self,
 		interaction: discord.Interaction,
@@ -75,26 +227,36 @@ class VoiceBuilder(commands.Cog):
 		temp_name: str,
 		slots: int,
 		locked: bool,
+		pool_size: int = 0,
 	):
 		guild = interaction.guild
-		base_channel = await category.create_voice_channel(
-			name=base_name,
-			user_limit=0,
-		)
-
-		data = load_channels()
-		base_cfg = data.setdefault("voice_base_configs", {})
+		try:
+			base_channel = await self.rest.submit(
+				rest_queue.create_channel_route(guild.id),
+				lambda: category.create_voice_channel(name=base_name, user_limit=0),
+				NORMAL,
+			)
+		except (discord.HTTPException, discord.RateLimited) as e:
+			return await reply(interaction, f"⚠️ Não foi possível criar o canal-base: {e}", ephemeral=True)
 
-		base_cfg[str(base_channel.id)] = {
+		cfg = {
 			"category": category.id,
 			"temp_name": temp_name,
 			"slots": max(0, slots),
 			"locked": bool(locked),
+			"pool_size": max(0, pool_size),
+			"recycle_max": DEFAULT_RECYCLE_MAX,
+			"recycle_ttl": DEFAULT_RECYCLE_TTL,
 		}
 
-		save_channels(data)
+		await self.store.guild(guild)
+		self.store.add_base(guild, base_channel.id, cfg)
 
-		await interaction.response.send_message(
+		# salas pré-criadas (se pool_size > 0)
+		self.pool.refill(guild, base_channel, cfg)
+
+		await reply(
+			interaction,
 			f"Canal-base criado: {base_channel.mention}",
 			ephemeral=True,
 		)
@@ -102,32 +264,33 @@ class VoiceBuilder(commands.Cog):
 	# =====================================================
 	#   CUSTOM — cria canal-base custom por categoria
 	# =====================================================
+	@auto_defer()
 	async def create_custom_base(self, interaction, category, base_name):
 		guild = interaction.guild
 
-		data = load_channels()
-		custom_bases = data.setdefault("voice_custom_base", {})
+		state = await self.store.guild(guild)
 
 		# não permitir mais de um canal custom por categoria
-		if str(category.id) in custom_bases:
-			return await interaction.response.send_message(
+		if category.id in state.custom_categories:
+			return await reply(
+				interaction,
 				"Esta categoria já possui um canal-base custom.",
 				ephemeral=True,
 			)
 
-		base_channel = await category.create_voice_channel(
-			name=base_name,
-			user_limit=0,
-		)
-
-		custom_bases[str(category.id)] = {
-			"base_id": base_channel.id,
-			"category": category.id,
-		}
+		try:
+			base_channel = await self.rest.submit(
+				rest_queue.create_channel_route(guild.id),
+				lambda: category.create_voice_channel(name=base_name, user_limit=0),
+				NORMAL,
+			)
+		except (discord.HTTPException, discord.RateLimited) as e:
+			return await reply(interaction, f"⚠️ Não foi possível criar o canal-base: {e}", ephemeral=True)
 
-		save_channels(data)
+		self.store.add_custom_base(guild, category.id, base_channel.id)
 
-		await interaction.response.send_message(
+		await reply(
+			interaction,
 			f"Canal-base custom criado: {base_channel.mention}",
 			ephemeral=True,
 		)
@@ -135,47 +298,42 @@ class VoiceBuilder(commands.Cog):
 	# =====================================================
 	#   DELETAR CANAL-BASE (padrão ou custom)
 	# =====================================================
+	@auto_defer()
 	async def delete_base_channel(self, interaction, category, base_id: int):
-		data = load_channels()
-		base_cfg = data.get("voice_base_configs", {})
-		custom_cfg = data.get("voice_custom_base", {})
+		guild = interaction.guild
+		state = await self.store.guild(guild)
 
 		# PADRÃO
-		if str(base_id) in base_cfg:
-			ch = interaction.guild.get_channel(base_id)
-			if ch:
-				try:
-					await ch.delete()
-				except Exception:
-					pass
+		if base_id in state.bases:
+			ch = guild.get_channel(base_id)
+			if ch and not await delete_channel(ch, priority=NORMAL):
+				return await reply(interaction, "⚠️ Não foi possível deletar o canal-base agora.", ephemeral=True)
 
-			base_cfg.pop(str(base_id), None)
-			save_channels(data)
+			self.store.remove_base(guild, base_id)
+			self.pool.drain(guild, base_id)
 
-			return await interaction.response.send_message(
+			return await reply(
+				interaction,
 				f"Canal-base padrão `{base_id}` deletado.",
 				ephemeral=True,
 			)
 
 		# CUSTOM
-		for cat_id, info in list(custom_cfg.items()):
-			if info.get("base_id") == base_id:
-				ch = interaction.guild.get_channel(base_id)
-				if ch:
-					try:
-						await ch.delete()
-					except Exception:
-						pass
-
-				custom_cfg.pop(cat_id, None)
-				save_channels(data)
-
-				return await interaction.response.send_message(
-					f"Canal-base custom `{base_id}` deletado.",
-					ephemeral=True,
-				)
+		if base_id in state.custom_bases:
+			ch = guild.get_channel(base_id)
+			if ch and not await delete_channel(ch, priority=NORMAL):
+				return await reply(interaction, "⚠️ Não foi possível deletar o canal-base agora.", ephemeral=True)
 
-		return await interaction.response.send_message(
+			self.store.remove_custom_base(guild, base_id)
+
+			return await reply(
+				interaction,
+				f"Canal-base custom `{base_id}` deletado.",
+				ephemeral=True,
+			)
+
+		return await reply(
+			interaction,
 			"Esse ID não corresponde a nenhum canal-base registrado.",
 			ephemeral=True,
 		)
@@ -187,7 +345,7 @@ class VoiceBuilder(commands.Cog):
 		guild = member.guild
 
 		# se já tem sessão, encerra antes
-		old = self.custom_sessions.pop(member.id, None)
+		old = self.sessions.by_owner(guild.id, member.id)
 		if old:
 			await self.end_custom_session(old, reason="Iniciando nova sessão custom.")
 
@@ -206,23 +364,39 @@ class VoiceBuilder(commands.Cog):
 			),
 		}
 
-		text_channel = await guild.create_text_channel(
-			name=f"config-voz-{member.name}".replace(" ", "-").lower(),
-			category=category,
-			overwrites=overwrites,
-		)
+		try:
+			text_channel = await self.rest.submit(
+				rest_queue.create_channel_route(guild.id),
+				lambda: guild.create_text_channel(
+					name=f"config-voz-{member.name}".replace(" ", "-").lower(),
+					category=category,
+					overwrites=overwrites,
+				),
+				NORMAL,
+			)
+		except discord.HTTPException as e:
+			print(f"❌ [VOICE] Painel custom de {member} não foi criado: {e}")
+			return
 
 		session = CustomSession(member, category, text_channel)
-		self.custom_sessions[member.id] = session
+		self.sessions.add(session)
+		await self.store.guild(guild)
+		self.save_session(session)
 
-		view = CustomPanelView(self, session)
+		view = CustomPanelView(session.owner_id)
 		embed = self.build_custom_dashboard(member, session)
 
-		await text_channel.send(
-			content=member.mention,
-			embed=embed,
-			view=view,
-		)
+		try:
+			message = await self.rest.submit(
+				rest_queue.message_route(text_channel.id),
+				lambda: text_channel.send(content=member.mention, embed=embed, view=view),
+				NORMAL,
+			)
+		except discord.HTTPException:
+			return  # sem panel_id: o reconcile manda outro no próximo start
+
+		session.panel_id = message.id
+		self.save_session(session)
 
 	def build_custom_dashboard(self, member: discord.Member, session: CustomSession) -> discord.Embed:
 		embed = discord.Embed(
@@ -238,12 +412,21 @@ class VoiceBuilder(commands.Cog):
 			value=session.name_template or "Sala de {user}",
 			inline=False,
 		)
+
+		rename_at = self.editor.rename_at(session.voice_id) if session.voice_id else None
+		if rename_at:
+			embed.add_field(
+				name="⏳ Renomeação na fila",
+				value=f"`{self.editor.pending_name(session.voice_id)}` <t:{int(rename_at)}:R>",
+				inline=False,
+			)
 		embed.set_footer(text="Use os botões abaixo para configurar, convidar e gerenciar sua sala.")
 		return embed
 
 	# =====================================================
 	#   Criação/Atualização da sala custom
 	# =====================================================
+	@auto_defer()
 	async def apply_custom_config(
 		self,
 		interaction: discord.Interaction,
@@ -253,8 +436,9 @@ class VoiceBuilder(commands.Cog):
 		locked: Optional[bool],
 	):
 		guild = interaction.guild
-		member = guild.get_member(session.user_id)
+		member = guild.get_member(session.owner_id)
 		category = guild.get_channel(session.category_id)
+		previous = (session.name_template, session.slots, session.locked)
 
 		if name_template:
 			session.name_template = name_template
@@ -273,167 +457,240 @@ class VoiceBuilder(commands.Cog):
 		voice_name = session.name_template.replace("{user}", display_name)
 
 		# permissões se trancada
-		overwrites = None
-		#if session.locked:
-			#overwrites = {
-				#guild.default_role: discord.PermissionOverwrite(
-					#view_channel=False,
-					#connect=False,
-				#),
-			#}
+		overwrites = {}
 		if session.locked:
-			overwrites = {
-				guild.default_role: discord.PermissionOverwrite(view_channel=False, connect=False),
-				member: discord.PermissionOverwrite(view_channel=True, connect=True, speak=True),
-				guild.me: discord.PermissionOverwrite(view_channel=True, connect=True, speak=True, move_members=True),
-			}
-		else:
-			# sala aberta → deixa o discord usar as permissões da categoria
-			overwrites = {}
-		
-
-			if member:
-				overwrites[member] = discord.PermissionOverwrite(
-					view_channel=True,
-					connect=True,
-					speak=True,
-				)
-			overwrites[guild.me] = discord.PermissionOverwrite(
-				view_channel=True,
-				connect=True,
-				speak=True,
-				move_members=True,
-			)
+			overwrites[guild.default_role] = discord.PermissionOverwrite(view_channel=False, connect=False)
+		# sala aberta → sem overwrite do @everyone, vale o padrão do servidor
+
+		if member:
+			overwrites[member] = discord.PermissionOverwrite(view_channel=True, connect=True, speak=True)
+		overwrites[guild.me] = discord.PermissionOverwrite(
+			view_channel=True,
+			connect=True,
+			speak=True,
+			move_members=True,
+		)
+		# convidados continuam com acesso (o edit troca todos os overwrites)
+		for uid in session.invited:
+			overwrites[guild.get_member(uid) or discord.Object(id=uid)] = discord.PermissionOverwrite(**GUEST_VOICE)
 
 		voice_channel: Optional[discord.VoiceChannel] = None
+		rename_at = None
+		failed = False
 
-		if session.voice_channel_id:
-			ch = guild.get_channel(session.voice_channel_id)
+		if session.voice_id:
+			ch = guild.get_channel(session.voice_id)
 			if isinstance(ch, discord.VoiceChannel):
 				voice_channel = ch
 				try:
-					if overwrites is None:
-						overwrites = {}
-
-					await voice_channel.edit(
+					# só a diferença vai pro Discord; nome sem orçamento fica na fila
+					rename_at = await self.editor.apply(
+						voice_channel,
 						name=voice_name,
 						user_limit=session.slots or 0,
 						overwrites=overwrites,
+						on_rename=lambda: self.refresh_panel(session),
 					)
-				except Exception:
-					pass
+				except (discord.HTTPException, discord.RateLimited):
+					failed = True
 			else:
-				session.voice_channel_id = None
-		
-		if overwrites is None:
-			overwrites = {}
-
-		if not session.voice_channel_id:
-			voice_channel = await category.create_voice_channel(
-				name=voice_name,
-				user_limit=session.slots or 0,
-				overwrites=overwrites,
-			)
-			session.voice_channel_id = voice_channel.id
+				self._unbind_voice(session)
 
-		# mover usuário
-		if member and voice_channel:
+		if not session.voice_id:
 			try:
-				await member.move_to(voice_channel)
-			except Exception:
+				voice_channel = await self.rest.submit(
+					rest_queue.create_channel_route(guild.id),
+					lambda: category.create_voice_channel(
+						name=voice_name,
+						user_limit=session.slots or 0,
+						overwrites=overwrites,
+					),
+					NORMAL,
+				)
+			except (discord.HTTPException, discord.RateLimited):
+				# sala não existe → a sessão fica como estava antes do modal
+				session.name_template, session.slots, session.locked = previous
+				return await reply(
+					interaction,
+					"⚠️ Não foi possível criar a sala agora. Tente de novo em instantes.",
+					ephemeral=True,
+				)
+			self._bind_voice(session, voice_channel.id)
+
+		# mover usuário (se ainda não estiver na sala)
+		in_room = member and member.voice and member.voice.channel == voice_channel
+		if member and voice_channel and not in_room:
+			try:
+				await self.rest.submit(
+					rest_queue.member_route(guild.id, member.id),
+					lambda: member.move_to(voice_channel),
+					INTERACTIVE,
+				)
+			except discord.HTTPException:
 				pass
 
-		await interaction.response.send_message("Sala custom criada/atualizada.", ephemeral=True)
+		self.save_session(session)
+
+		msg = "Sala custom criada/atualizada."
+		if failed:
+			msg = "⚠️ Não foi possível atualizar a sala agora. Tente de novo em instantes."
+		elif rename_at:
+			msg += (
+				f"\n⏳ O Discord só deixa renomear um canal {RENAME_LIMIT}x a cada {RENAME_WINDOW // 60} min: "
+				f"o nome novo entra <t:{int(rename_at)}:R>."
+			)
+		await reply(interaction, msg, ephemeral=True)
+		await self.refresh_panel(session)
+
+	async def refresh_panel(self, session: CustomSession):
+		"""Atualiza o embed do painel (status, slots, nome e renomeação na fila)."""
+		guild = self.bot.get_guild(session.guild_id)
+		if guild is None or session not in self.sessions or not session.panel_id:
+			return
+
+		member = guild.get_member(session.owner_id)
+		text = guild.get_channel(session.text_id)
+		if member is None or not isinstance(text, discord.TextChannel):
+			return
+
+		embed = self.build_custom_dashboard(member, session)
+		try:
+			await self.rest.submit(
+				rest_queue.edit_message_route(text.id),
+				lambda: text.get_partial_message(session.panel_id).edit(embed=embed),
+				NORMAL,
+			)
+		except discord.HTTPException:
+			pass
 
 	# =====================================================
 	#   Invites (Custom) — AGORA SEM MODAL, USADO PELO PAINEL
 	# =====================================================
-	async def invite_to_custom(self, interaction: discord.Interaction, session: CustomSession, target: discord.Member):
+	async def invite_to_custom(self, interaction: discord.Interaction, session: CustomSession, targets: list[discord.Member]) -> bool:
 		guild = interaction.guild
-		voice = guild.get_channel(session.voice_channel_id) if session.voice_channel_id else None
-		text = guild.get_channel(session.text_channel_id)
+		voice = guild.get_channel(session.voice_id) if session.voice_id else None
+		text = guild.get_channel(session.text_id)
 
 		if not isinstance(voice, discord.VoiceChannel):
 			# nada de response aqui, quem responde é o painel
-			return
+			return False
 
-		await voice.set_permissions(
-			target,
-			view_channel=True,
-			connect=True,
-			speak=True,
+		# um edit de overwrites por canal pra todos os convidados
+		granted = await grant_guests(
+			voice,
+			text if isinstance(text, discord.TextChannel) else None,
+			session.invited,
+			targets,
+			keep={session.owner_id},
 		)
-
-		if isinstance(text, discord.TextChannel):
-			await text.set_permissions(
-				target,
-				view_channel=True,
-				send_messages=False,
-				read_message_history=True,
-			)
-
-		session.invited.add(target.id)
+		if granted:
+			self.save_session(session)
+		return granted
 
 	# =====================================================
 	#   Encerrar sessão custom
 	# =====================================================
+	def _bind_voice(self, session: CustomSession, voice_id: int):
+		self.sessions.rebind(session, voice_id=voice_id)
+		self.store.index.mark(voice_id, Role.CUSTOM_SESSION)
+
+	def _unbind_voice(self, session: CustomSession):
+		if session.voice_id:
+			self.store.index.unmark(session.voice_id, Role.CUSTOM_SESSION)
+			self.editor.forget(session.voice_id)
+		self.sessions.rebind(session, voice_id=None)
+
 	async def end_custom_session(self, session: CustomSession, reason: str = ""):
 		guild = self.bot.get_guild(session.guild_id)
 		if guild is None:
-			self.custom_sessions.pop(session.user_id, None)
+			self.sessions.remove(session)
+			self._unbind_voice(session)
 			return
 
-		text_ch = guild.get_channel(session.text_channel_id)
+		if self.store.cached(guild.id) is not None:
+			self.store.remove_custom_session(guild, session.owner_id)
+
+		if session.voice_id:
+			self.teardown.cancel(session.voice_id)
+
+		text_ch = guild.get_channel(session.text_id)
 		if isinstance(text_ch, discord.TextChannel):
-			try:
-				await text_ch.delete(reason=reason or "Encerrando painel custom.")
-			except discord.HTTPException:
-				pass
+			await delete_channel(text_ch, priority=CLEANUP, reason=reason or "Encerrando painel custom.")
 
-		if session.voice_channel_id:
-			voice_ch = guild.get_channel(session.voice_channel_id)
+		if session.voice_id:
+			voice_ch = guild.get_channel(session.voice_id)
 			if isinstance(voice_ch, discord.VoiceChannel):
-				try:
-					await voice_ch.delete(reason=reason or "Encerrando sala custom.")
-				except discord.HTTPException:
-					pass
+				await delete_channel(voice_ch, priority=CLEANUP, reason=reason or "Encerrando sala custom.")
 
-		self.custom_sessions.pop(session.user_id, None)
+		self.sessions.remove(session)
+		self._unbind_voice(session)
 
 	# =====================================================
-	#   Listener: entrar em base custom + encerrar quando sala vazia
+	#   Eventos de voz (via VoiceRouter)
 	# =====================================================
-	@commands.Cog.listener()
-	async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
-		# 1) Entrou em algum canal?
-		if after.channel:
-			data = load_channels()
-			custom_bases = data.get("voice_custom_base", {})
-
-			for cat_id, info in custom_bases.items():
-				if after.channel.id == info.get("base_id"):
-					category = member.guild.get_channel(int(cat_id))
-					if isinstance(category, discord.CategoryChannel):
-						await self.start_custom_session(member, category)
-					break
-
-		# 2) Saiu de uma sala custom? Se esvaziou, encerra sessão (apaga voz + texto)
-		if before.channel:
-			# achar sessão ligada a esse canal de voz
-			target_session = None
-			for session in list(self.custom_sessions.values()):
-				if session.voice_channel_id == before.channel.id:
-					target_session = session
-					break
-
-			if target_session and len(before.channel.members) == 0:
-				await self.end_custom_session(target_session, reason="Sala custom vazia.")
+	async def on_join_custom_base(self, member: discord.Member, channel: discord.VoiceChannel):
+		state = self.store.cached(member.guild.id)
+		cat_id = state.custom_bases.get(channel.id) if state else None
+
+		if cat_id is None:
+			return
+
+		# caiu da própria sala há pouco → volta pra ela, sessão continua
+		if await self._resume_pending_session(member):
+			return
+
+		category = member.guild.get_channel(cat_id)
+		if isinstance(category, discord.CategoryChannel):
+			await self.start_custom_session(member, category)
+
+	async def _resume_pending_session(self, member: discord.Member) -> bool:
+		session = self.sessions.by_owner(member.guild.id, member.id)
+		if not session or not session.voice_id:
+			return False
+
+		voice = member.guild.get_channel(session.voice_id)
+		if not isinstance(voice, discord.VoiceChannel) or not self.teardown.cancel(voice.id):
+			return False
+
+		try:
+			await self.rest.submit(
+				rest_queue.member_route(member.guild.id, member.id),
+				lambda: member.move_to(voice),
+				INTERACTIVE,
+			)
+		except discord.HTTPException:
+			return False
+		return True
+
+	async def on_join_custom_session(self, member: discord.Member, channel: discord.VoiceChannel):
+		# voltou antes da carência acabar → não encerra mais
+		self.teardown.cancel(channel.id)
+
+	async def on_leave_custom_session(self, member: discord.Member, channel: discord.VoiceChannel):
+		# sala custom esvaziou → encerra sessão (apaga voz + texto) depois da carência
+		target_session = self.sessions.by_voice(channel.id)
+		if target_session and len(channel.members) == 0:
+			self.teardown.schedule(
+				channel.id,
+				self.teardown.delay_for(None),
+				lambda: self._end_if_empty(target_session, channel.id),
+				tag=(member.guild.id, member.id),
+			)
+
+	async def _end_if_empty(self, session: CustomSession, voice_id: int):
+		guild = self.bot.get_guild(session.guild_id)
+		voice = guild.get_channel(voice_id) if guild else None
+		if isinstance(voice, discord.VoiceChannel) and len(voice.members) > 0:
+			return
+		if session.voice_id != voice_id:
+			return  # sessão já mudou de sala
+		await self.end_custom_session(session, reason="Sala custom vazia.")
 
 
 # =========================================================
 #   VIEW PRINCIPAL
 # =========================================================
-class VoiceBuilderMainView(discord.ui.View):
+class VoiceBuilderMainView(TimedView):
 	def __init__(self, cog: VoiceBuilder, interaction: discord.Interaction):
 		super().__init__(timeout=300)
 		self.cog = cog
@@ -586,7 +843,7 @@ class ModuleSelect(discord.ui.Select):
 # =========================================================
 #   MODALS
 # =========================================================
-class CreateCategoryModal(discord.ui.Modal, title="Criar nova categoria"):
+class CreateCategoryModal(TimedModal, title="Criar nova categoria"):
 	def __init__(self, parent_view: VoiceBuilderMainView):
 		super().__init__()
 		self.parent_view = parent_view
@@ -608,7 +865,7 @@ class CreateCategoryModal(discord.ui.Modal, title="Criar nova categoria"):
 		)
 
 
-class StandardConfigModal(discord.ui.Modal, title="Canal-base padrão"):
+class StandardConfigModal(TimedModal, title="Canal-base padrão"):
 	def __init__(self, cog: VoiceBuilder, category: discord.CategoryChannel):
 		super().__init__()
 		self.cog = cog
@@ -621,11 +878,17 @@ class StandardConfigModal(discord.ui.Modal, title="Canal-base padrão"):
 		)
 		self.slots = discord.ui.TextInput(label="Slots (0 = ilimitado)", required=False)
 		self.locked = discord.ui.TextInput(label="Trancado? (sim/nao)", required=False)
+		self.pool_size = discord.ui.TextInput(
+			label="Salas pré-criadas (0 = desligado)",
+			placeholder="Deixa N salas prontas pra entrada instantânea.",
+			required=False,
+		)
 
 		self.add_item(self.base_name)
 		self.add_item(self.temp_name)
 		self.add_item(self.slots)
 		self.add_item(self.locked)
+		self.add_item(self.pool_size)
 
 	async def on_submit(self, interaction: discord.Interaction):
 		try:
@@ -633,6 +896,11 @@ class StandardConfigModal(discord.ui.Modal, title="Canal-base padrão"):
 		except ValueError:
 			slots = 0
 
+		try:
+			pool_size = int(self.pool_size.value) if self.pool_size.value else 0
+		except ValueError:
+			pool_size = 0
+
 		locked = (self.locked.value or "nao").strip().lower() in ("sim", "s", "yes", "y", "true", "1")
 
 		await self.cog.create_standard_template(
@@ -642,10 +910,11 @@ class StandardConfigModal(discord.ui.Modal, title="Canal-base padrão"):
 			temp_name=self.temp_name.value.strip() or "🎤 Sala de {user}",
 			slots=slots,
 			locked=locked,
+			pool_size=pool_size,
 		)
 
 
-class CustomBaseModal(discord.ui.Modal, title="Criar canal-base Custom"):
+class CustomBaseModal(TimedModal, title="Criar canal-base Custom"):
 	def __init__(self, cog: VoiceBuilder, category: discord.CategoryChannel):
 		super().__init__()
 		self.cog = cog
@@ -662,7 +931,7 @@ class CustomBaseModal(discord.ui.Modal, title="Criar canal-base Custom"):
 		)
 
 
-class DeleteBaseModal(discord.ui.Modal, title="Deletar Canal-Base"):
+class DeleteBaseModal(TimedModal, title="Deletar Canal-Base"):
 	def __init__(self, cog: VoiceBuilder, category: discord.CategoryChannel):
 		super().__init__()
 		self.cog = cog
@@ -683,7 +952,7 @@ class DeleteBaseModal(discord.ui.Modal, title="Deletar Canal-Base"):
 		await self.cog.delete_base_channel(interaction, self.category, base_id)
 
 
-class CustomConfigModal(discord.ui.Modal, title="Configurar sala custom"):
+class CustomConfigModal(TimedModal, title="Configurar sala custom"):
 	def __init__(self, cog: VoiceBuilder, session: CustomSession):
 		super().__init__()
 		self.cog = cog
@@ -736,56 +1005,89 @@ class CustomConfigModal(discord.ui.Modal, title="Configurar sala custom"):
 
 # =========================================================
 #   PAINEL CUSTOM (convites, travar, encerrar)
+#   Componentes persistentes: o custom_id leva o dono da sessão
+#   ("vb:<ação>:<user_id>") e um handler por ação busca a sessão
+#   na cog. Nenhuma View fica guardada no bot por sessão.
 # =========================================================
+
 class CustomPanelView(discord.ui.View):
-	def __init__(self, cog: VoiceBuilder, session: CustomSession):
+	def __init__(self, user_id: int):
 		super().__init__(timeout=None)
-		self.cog = cog
-		self.session = session
 
 		# NOVO: select multi de usuários
-		self.add_item(CustomInviteMultiSelect(self))
-
-	async def _check_user(self, interaction: discord.Interaction) -> bool:
-		if interaction.user.id != self.session.user_id:
-			await interaction.response.send_message("Este painel não é seu.", ephemeral=True)
-			return False
-		return True
-
-	async def invite_members(self, interaction: discord.Interaction, members: list[discord.Member]):
-		"""Convida múltiplos membros (aplica permissões) sem enviar resposta aqui."""
-		guild = interaction.guild
-		if not guild:
-			return
+		self.add_item(CustomInviteMultiSelect(user_id))
+		for action in CustomPanelButton.ACTIONS:
+			self.add_item(CustomPanelButton(action, user_id))
+
+
+async def resolve_custom_session(interaction: discord.Interaction, user_id: int):
+	"""(cog, sessão) do painel, ou None (já respondendo) se a sessão acabou ou não é do usuário."""
+	cog = interaction.client.get_cog("VoiceBuilder")
+	session = cog.sessions.by_owner(interaction.guild_id, user_id) if cog else None
+
+	if session is None:
+		await interaction.response.send_message("Esta sessão custom não existe mais.", ephemeral=True)
+		return None
+	if interaction.user.id != session.owner_id:
+		await interaction.response.send_message("Este painel não é seu.", ephemeral=True)
+		return None
+	return cog, session
+
+
+class CustomPanelButton(
+	TimedItem,
+	discord.ui.DynamicItem[discord.ui.Button],
+	template=r"vb:(?P<action>config|guests|lock|end):(?P<user_id>\d+)",
+):
+	# ação → (texto, estilo)
+	ACTIONS = {
+		"config": ("Configurar sala", discord.ButtonStyle.success),
+		"guests": ("Gerenciar convidados", discord.ButtonStyle.secondary),
+		"lock": ("Travar/Destravar sala", discord.ButtonStyle.secondary),
+		"end": ("Encerrar sala", discord.ButtonStyle.danger),
+	}
+
+	def __init__(self, action: str, user_id: int):
+		label, style = self.ACTIONS[action]
+		super().__init__(
+			discord.ui.Button(label=label, style=style, row=1, custom_id=f"vb:{action}:{user_id}")
+		)
+		self.action = action
+		self.user_id = user_id
 
-		for m in members:
-			await self.cog.invite_to_custom(interaction, self.session, m)
+	@classmethod
+	async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+		return cls(match["action"], int(match["user_id"]))
 
-	@discord.ui.button(label="Configurar sala", style=discord.ButtonStyle.success, row=1)
-	async def btn_config(self, interaction: discord.Interaction, button: discord.ui.Button):
-		if not await self._check_user(interaction):
+	async def callback(self, interaction: discord.Interaction):
+		resolved = await resolve_custom_session(interaction, self.user_id)
+		if resolved is None:
 			return
 
-		modal = CustomConfigModal(self.cog, self.session)
-		await interaction.response.send_modal(modal)
-
-	@discord.ui.button(label="Gerenciar convidados", style=discord.ButtonStyle.secondary, row=1)
-	async def btn_manage_guests(self, interaction: discord.Interaction, button: discord.ui.Button):
-		if not await self._check_user(interaction):
-			return
+		cog, session = resolved
+		if self.action == "config":
+			await interaction.response.send_modal(CustomConfigModal(cog, session))
+		elif self.action == "guests":
+			await self.manage_guests(interaction, session)
+		elif self.action == "lock":
+			await self.toggle_lock(interaction, cog, session)
+		else:
+			await interaction.response.send_message("Sala custom encerrada.", ephemeral=True)
+			await cog.end_custom_session(session, reason="Encerrada pelo usuário.")
 
+	async def manage_guests(self, interaction: discord.Interaction, session: CustomSession):
 		guild = interaction.guild
 		if not guild:
 			return
 
-		voice = guild.get_channel(self.session.voice_channel_id) if self.session.voice_channel_id else None
+		voice = guild.get_channel(session.voice_id) if session.voice_id else None
 		if not isinstance(voice, discord.VoiceChannel):
 			return await interaction.response.send_message("Sala ainda não foi criada.", ephemeral=True)
 
 		desc = "Nenhum convidado ainda."
-		if self.session.invited:
+		if session.invited:
 			linhas = []
-			for uid in self.session.invited:
+			for uid in session.invited:
 				m = guild.get_member(uid)
 				if m:
 					linhas.append(m.mention)
@@ -799,16 +1101,12 @@ class CustomPanelView(discord.ui.View):
 		)
 		embed.set_footer(text="Selecione convidados e use os botões para gerenciar.")
 
-		view = CustomGuestManagerView(self.cog, self.session)
+		view = CustomGuestManagerView(guild, session)
 		await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
-	@discord.ui.button(label="Travar/Destravar sala", style=discord.ButtonStyle.secondary, row=1)
-	async def btn_lock(self, interaction: discord.Interaction, button: discord.ui.Button):
-		if not await self._check_user(interaction):
-			return
-
+	async def toggle_lock(self, interaction: discord.Interaction, cog: VoiceBuilder, session: CustomSession):
 		guild = interaction.guild
-		voice = guild.get_channel(self.session.voice_channel_id) if self.session.voice_channel_id else None
+		voice = guild.get_channel(session.voice_id) if session.voice_id else None
 		if not isinstance(voice, discord.VoiceChannel):
 			return await interaction.response.send_message("Sala ainda não criada.", ephemeral=True)
 
@@ -816,41 +1114,49 @@ class CustomPanelView(discord.ui.View):
 		perms = voice.overwrites_for(default_role)
 		locked_now = (not perms.view_channel) or (perms.connect is False)
 
-		if locked_now:
-			await voice.set_permissions(default_role, view_channel=True, connect=True)
-			self.session.locked = False
-			msg = "Sala destravada."
-		else:
-			await voice.set_permissions(default_role, view_channel=False, connect=False)
-			self.session.locked = True
-			msg = "Sala travada."
-
-		await interaction.response.send_message(msg, ephemeral=True)
+		try:
+			# trancada → libera; aberta → tranca
+			await cog.rest.submit(
+				rest_queue.permissions_route(voice.id),
+				lambda: voice.set_permissions(default_role, view_channel=locked_now, connect=locked_now),
+				INTERACTIVE,
+			)
+		except discord.HTTPException:
+			return await interaction.response.send_message("⚠️ Não foi possível alterar a sala agora.", ephemeral=True)
 
-	@discord.ui.button(label="Encerrar sala", style=discord.ButtonStyle.danger, row=1)
-	async def btn_close(self, interaction: discord.Interaction, button: discord.ui.Button):
-		if not await self._check_user(interaction):
-			return
+		session.locked = not locked_now
+		msg = "Sala destravada." if locked_now else "Sala travada."
 
-		await interaction.response.send_message("Sala custom encerrada.", ephemeral=True)
-		await self.cog.end_custom_session(self.session, reason="Encerrada pelo usuário.")
+		cog.save_session(session)
+		await interaction.response.send_message(msg, ephemeral=True)
 
 
-class CustomInviteMultiSelect(discord.ui.UserSelect):
-	def __init__(self, parent_view: CustomPanelView):
-		self.parent_view = parent_view
+class CustomInviteMultiSelect(
+	TimedItem,
+	discord.ui.DynamicItem[discord.ui.UserSelect],
+	template=r"vb:invite:(?P<user_id>\d+)",
+):
+	def __init__(self, user_id: int):
 		super().__init__(
-			placeholder="Selecionar usuários para convidar…",
-			min_values=1,
-			max_values=10,
-			row=0,
+			discord.ui.UserSelect(
+				placeholder="Selecionar usuários para convidar…",
+				min_values=1,
+				max_values=10,
+				row=0,
+				custom_id=f"vb:invite:{user_id}",
+			)
 		)
+		self.user_id = user_id
+
+	@classmethod
+	async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.UserSelect, match):
+		return cls(int(match["user_id"]))
 
 	async def callback(self, interaction: discord.Interaction):
-		if not await self.parent_view._check_user(interaction):
+		if await resolve_custom_session(interaction, self.user_id) is None:
 			return
 
-		members = [m for m in self.values if isinstance(m, discord.Member)]
+		members = [m for m in self.item.values if isinstance(m, discord.Member)]
 		if not members:
 			return await interaction.response.send_message("Seleção inválida.", ephemeral=True)
 
@@ -861,22 +1167,30 @@ class CustomInviteMultiSelect(discord.ui.UserSelect):
 			color=discord.Color.blurple(),
 		)
 
-		view = CustomConfirmInviteView(self.parent_view, members)
+		view = CustomConfirmInviteView(self.user_id, members)
 		await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
 
-class CustomConfirmInviteView(discord.ui.View):
-	def __init__(self, parent_panel: CustomPanelView, members: list[discord.Member]):
+class CustomConfirmInviteView(TimedView):
+	def __init__(self, user_id: int, members: list[discord.Member]):
 		super().__init__(timeout=60)
-		self.parent_panel = parent_panel
+		self.user_id = user_id
 		self.members = members
 
 	@discord.ui.button(label="SIM", style=discord.ButtonStyle.success)
 	async def btn_yes(self, interaction: discord.Interaction, button: discord.ui.Button):
-		if not await self.parent_panel._check_user(interaction):
+		resolved = await resolve_custom_session(interaction, self.user_id)
+		if resolved is None:
 			return
 
-		await self.parent_panel.invite_members(interaction, self.members)
+		cog, session = resolved
+		if not await cog.invite_to_custom(interaction, session, self.members):
+			return await interaction.response.edit_message(
+				content="❌ Não foi possível liberar a sala agora. Tente de novo.",
+				embed=None,
+				view=None,
+			)
+
 		lista = ", ".join(m.mention for m in self.members)
 		await interaction.response.edit_message(
 			content=f"✅ Convite enviado para: {lista}",
@@ -886,7 +1200,7 @@ class CustomConfirmInviteView(discord.ui.View):
 
 	@discord.ui.button(label="NÃO", style=discord.ButtonStyle.danger)
 	async def btn_no(self, interaction: discord.Interaction, button: discord.ui.Button):
-		if not await self.parent_panel._check_user(interaction):
+		if await resolve_custom_session(interaction, self.user_id) is None:
 			return
 
 		await interaction.response.edit_message(
@@ -896,70 +1210,49 @@ class CustomConfirmInviteView(discord.ui.View):
 		)
 
 
-class CustomGuestManagerView(discord.ui.View):
-	def __init__(self, cog: VoiceBuilder, session: CustomSession):
-		super().__init__(timeout=None)
-		self.cog = cog
-		self.session = session
+class CustomGuestManagerView(TimedView):
+	def __init__(self, guild: discord.Guild, session: CustomSession):
+		# menu efêmero: expira e sai do bot em vez de ficar preso pra sempre
+		super().__init__(timeout=GUEST_MENU_TIMEOUT)
+		self.user_id = session.owner_id
 		self.selected_ids: list[int] = []
 
-		self.add_item(CustomGuestSelect(self))
-
-	async def _check_user(self, interaction: discord.Interaction) -> bool:
-		if interaction.user.id != self.session.user_id:
-			await interaction.response.send_message(
-				"Apenas o dono da sala pode gerenciar os convidados.",
-				ephemeral=True,
-			)
-			return False
-		return True
+		self.add_item(CustomGuestSelect(self, guild, session))
 
 	async def _apply_to_selected(self, interaction: discord.Interaction, action: str):
-		if not await self._check_user(interaction):
+		resolved = await resolve_custom_session(interaction, self.user_id)
+		if resolved is None:
 			return
 
+		cog, session = resolved
 		guild = interaction.guild
 		if not guild:
 			return
 
-		voice = guild.get_channel(self.session.voice_channel_id) if self.session.voice_channel_id else None
+		voice = guild.get_channel(session.voice_id) if session.voice_id else None
 		if not isinstance(voice, discord.VoiceChannel):
 			return await interaction.response.send_message("Sala não criada.", ephemeral=True)
 
 		if not self.selected_ids:
 			return await interaction.response.send_message("Nenhum convidado selecionado.", ephemeral=True)
 
-		afetados = []
-		for uid in self.selected_ids:
-			member = guild.get_member(uid)
-			if not member:
-				continue
-
-			if action == "mute":
-				await member.edit(mute=True)
-			elif action == "unmute":
-				await member.edit(mute=False)
-			elif action == "deaf":
-				await member.edit(deafen=True)
-			elif action == "undeaf":
-				await member.edit(deafen=False)
-			elif action == "kick":
-				await member.move_to(None)
-				ch = guild.get_channel(self.session.voice_channel_id) if self.session.voice_channel_id else None
-				if isinstance(ch, discord.VoiceChannel):
-					await ch.set_permissions(member, overwrite=None)
-				if uid in self.session.invited:
-					self.session.invited.remove(uid)
-
-			afetados.append(member.mention)
-
-		if not afetados:
+		members = [m for m in map(guild.get_member, self.selected_ids) if m]
+		if not members:
 			return await interaction.response.send_message("Nenhum usuário afetado.", ephemeral=True)
 
-		await interaction.response.send_message(
-			f"Ação `{action}` aplicada em: {', '.join(afetados)}",
-			ephemeral=True,
+		# várias chamadas REST → responde já e manda o resultado num follow-up só
+		await interaction.response.defer(ephemeral=True, thinking=True)
+
+		outcome = await apply_guest_action(
+			voice,
+			members,
+			action,
+			session.invited,
+			keep={session.owner_id},
 		)
+		if action == "kick":
+			cog.save_session(session)
+		await interaction.followup.send(format_outcome(action, outcome), ephemeral=True)
 
 	@discord.ui.button(label="Mute", style=discord.ButtonStyle.secondary, row=1)
 	async def btn_mute(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -983,11 +1276,8 @@ class CustomGuestManagerView(discord.ui.View):
 
 
 class CustomGuestSelect(discord.ui.Select):
-	def __init__(self, parent_view: CustomGuestManagerView):
+	def __init__(self, parent_view: CustomGuestManagerView, guild: discord.Guild, session: CustomSession):
 		self.parent_view = parent_view
-		session = parent_view.session
-		cog = parent_view.cog
-		guild = cog.bot.get_guild(session.guild_id)
 
 		options: list[discord.SelectOption] = []
 		if guild and session.invited:
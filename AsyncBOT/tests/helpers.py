@@ -0,0 +1,40 @@
+from unittest import mock
+
+import discord
+
+from utils.voice_store import GuildVoiceState, VoiceStore
+
+
+class MemoryStore(VoiceStore):
+    """VoiceStore só em memória (os ganchos de gravação não fazem nada)."""
+
+    async def _load(self, guild) -> GuildVoiceState:
+        return GuildVoiceState(guild.id)
+
+
+class FakeGuild:
+    def __init__(self, guild_id=1, channels=()):
+        self.id = guild_id
+        self.channels = {c.id: c for c in channels}
+        self.default_role = object()
+        self.me = object()
+        self.created = 0
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    async def create_voice_channel(self, name, **kwargs):
+        self.created += 1
+        channel = voice_channel(1000 + self.created, name=name)
+        self.channels[channel.id] = channel
+        return channel
+
+
+def voice_channel(channel_id, *, name="sala", members=()):
+    """Mock que passa em isinstance(..., discord.VoiceChannel)."""
+    channel = mock.MagicMock(spec=discord.VoiceChannel)
+    channel.id = channel_id
+    channel.name = name
+    channel.members = list(members)
+    channel.edit = mock.AsyncMock()
+    return channel
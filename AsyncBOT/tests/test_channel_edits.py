@@ -0,0 +1,84 @@
+import asyncio, unittest
+from unittest import mock
+
+from utils import channel_edits
+from utils.channel_edits import RENAME_LIMIT, ChannelEditor
+from utils.rest_queue import RestScheduler
+
+
+class FakeChannel:
+    def __init__(self, channel_id=1, name="sala"):
+        self.id = channel_id
+        self.name = name
+        self.user_limit = 0
+        self.overwrites = {}
+        self.edits = []
+
+    async def edit(self, **changes):
+        self.edits.append(changes)
+        for key, value in changes.items():
+            setattr(self, key, value)
+
+
+class ChannelEditorTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.rest = RestScheduler()
+        self.editor = ChannelEditor(self.rest)
+        self.channel = FakeChannel()
+
+    async def asyncTearDown(self):
+        await self.editor.close()
+        await self.rest.close()
+
+    async def test_unchanged_fields_are_not_sent(self):
+        await self.editor.apply(self.channel, name="sala", user_limit=0)
+        self.assertEqual(self.channel.edits, [])
+        self.assertEqual(self.editor.skipped, 1)
+
+    async def test_rename_budget_defers_only_the_name(self):
+        for i in range(RENAME_LIMIT):
+            self.assertIsNone(await self.editor.apply(self.channel, name=f"sala {i}"))
+
+        renamed = []
+
+        async def on_rename():
+            renamed.append(self.channel.name)
+
+        with mock.patch.object(channel_edits, "RENAME_WINDOW", 0.05):
+            when = await self.editor.apply(self.channel, name="final", user_limit=4, on_rename=on_rename)
+            self.assertIsNotNone(when)
+            # o limite sai na hora; o nome espera o orçamento
+            self.assertEqual((self.channel.name, self.channel.user_limit), (f"sala {RENAME_LIMIT - 1}", 4))
+            self.assertEqual(self.editor.pending_name(self.channel.id), "final")
+
+            await asyncio.sleep(0.1)
+
+        self.assertEqual(self.channel.name, "final")
+        self.assertEqual(renamed, ["final"])
+        self.assertIsNone(self.editor.pending_name(self.channel.id))
+        self.assertEqual(self.editor.deferred, 1)
+
+    async def test_new_name_replaces_the_deferred_one(self):
+        for i in range(RENAME_LIMIT):
+            await self.editor.apply(self.channel, name=f"sala {i}")
+
+        await self.editor.apply(self.channel, name="primeiro")
+        await self.editor.apply(self.channel, name="segundo")
+        self.assertEqual(self.editor.pending_name(self.channel.id), "segundo")
+
+        # voltar pro nome atual cancela a renomeação adiada
+        await self.editor.apply(self.channel, name=self.channel.name)
+        self.assertIsNone(self.editor.pending_name(self.channel.id))
+
+    async def test_requests_during_an_edit_are_merged(self):
+        await asyncio.gather(
+            self.editor.apply(self.channel, user_limit=2),
+            self.editor.apply(self.channel, user_limit=3),
+            self.editor.apply(self.channel, name="nova"),
+        )
+        # o primeiro sai sozinho; os que chegaram durante ele viram um edit só
+        self.assertEqual(self.channel.edits, [{"user_limit": 2}, {"user_limit": 3, "name": "nova"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import asyncio, json, os, tempfile, unittest
+from unittest import mock
+
+from utils import channels
+from utils.channels import ChannelStore, JsonDocument
+
+
+class FakeGuild:
+    def __init__(self, guild_id, channel_ids):
+        self.id = guild_id
+        self.channel_ids = set(channel_ids)
+
+    def get_channel(self, channel_id):
+        return object() if channel_id in self.channel_ids else None
+
+
+class JsonDocumentTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "doc.json")
+
+    async def asyncTearDown(self):
+        self.dir.cleanup()
+
+    async def test_changes_inside_the_window_become_one_write(self):
+        doc = JsonDocument(self.path, delay=0.05)
+        with mock.patch.object(channels, "_atomic_write", wraps=channels._atomic_write) as write:
+            for i in range(5):
+                doc.data[str(i)] = i
+                doc.mark_dirty()
+            self.assertFalse(os.path.exists(self.path))  # nada no disco antes do delay
+
+            await doc._task
+        self.assertEqual(write.call_count, 1)
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {str(i): i for i in range(5)})
+
+    async def test_later_change_is_flushed_too(self):
+        doc = JsonDocument(self.path, delay=0.01)
+        doc.data["a"] = 1
+        doc.mark_dirty()
+        await asyncio.sleep(0.015)  # primeira gravação já saiu ou está saindo
+        doc.data["b"] = 2
+        doc.mark_dirty()
+        await doc._task
+
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"a": 1, "b": 2})
+
+    def test_outside_the_loop_writes_right_away(self):
+        doc = JsonDocument(self.path)
+        doc.data["temporary"] = {3, 1, 2}
+        doc.mark_dirty()
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"temporary": [1, 2, 3]})
+
+
+class ChannelStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.dir.name, "channels.json")
+        self.guilds = os.path.join(self.dir.name, "guilds")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def read(self, path):
+        with open(path) as f:
+            return json.load(f)
+
+    def test_each_guild_has_its_own_file(self):
+        store = ChannelStore(self.root, self.guilds)
+        a, b = FakeGuild(1, ()), FakeGuild(2, ())
+
+        store.guild(a)["welcome"] = 10
+        store.save_guild(a)
+        store.guild(b)["welcome"] = 20
+        store.save_guild(b)
+
+        self.assertEqual(self.read(os.path.join(self.guilds, "1.json")), {"welcome": 10})
+        self.assertEqual(self.read(os.path.join(self.guilds, "2.json")), {"welcome": 20})
+        self.assertFalse(os.path.exists(self.root))  # o global não foi tocado
+
+    def test_legacy_entries_move_to_their_guild(self):
+        legacy = {
+            "types": ["welcome"],
+            "welcome": 10,
+            "voice_base_configs": {"11": {"slots": 2}, "21": {"slots": 3}},
+            "voice_temporary": [12, 22, 99],
+        }
+        with open(self.root, "w") as f:
+            json.dump(legacy, f)
+
+        store = ChannelStore(self.root, self.guilds)
+        data = store.guild(FakeGuild(1, (10, 11, 12)))
+
+        self.assertEqual(
+            data,
+            {"welcome": 10, "voice_base_configs": {"11": {"slots": 2}}, "voice_temporary": [12]},
+        )
+        self.assertEqual(
+            self.read(self.root),
+            {"types": ["welcome"], "voice_base_configs": {"21": {"slots": 3}}, "voice_temporary": [22, 99]},
+        )
+
+        # 99 não existe em nenhum servidor → sai; 22 espera o servidor dela
+        client = FakeGuild(0, (21, 22))
+        self.assertEqual(store.prune_legacy(client), 1)
+        self.assertEqual(self.read(self.root)["voice_temporary"], [22])
+
+    def test_existing_guild_file_skips_migration(self):
+        os.makedirs(self.guilds)
+        with open(os.path.join(self.guilds, "1.json"), "w") as f:
+            json.dump({"welcome": 5}, f)
+        with open(self.root, "w") as f:
+            json.dump({"types": [], "welcome": 10}, f)
+
+        store = ChannelStore(self.root, self.guilds)
+        self.assertEqual(store.guild(FakeGuild(1, (10,))), {"welcome": 5})
+        self.assertEqual(self.read(self.root)["welcome"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import asyncio, time, unittest
+from types import SimpleNamespace
+
+from utils.frames import FrameScheduler
+from utils.rest_queue import RestScheduler
+
+
+def message(message_id, channel_id=1):
+    return SimpleNamespace(id=message_id, channel=SimpleNamespace(id=channel_id))
+
+
+class FrameSchedulerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.rest = RestScheduler()
+        self.frames = FrameScheduler(self.rest, frame=0.03, budget=10, window=1.0)
+        self.sent = []
+
+    async def asyncTearDown(self):
+        await self.frames.close()
+        await self.rest.close()
+
+    def render(self, label):
+        async def edit():
+            self.sent.append((label, time.monotonic()))
+        return lambda: edit()
+
+    async def drain(self):
+        while self.frames.pending() or self.frames._channels:
+            await asyncio.sleep(0.005)
+
+    async def test_marks_between_frames_are_coalesced(self):
+        msg = message(1)
+        for i in range(5):
+            self.frames.mark(msg, self.render(i))
+        await self.drain()
+
+        self.assertEqual([label for label, _ in self.sent], [4])
+        self.assertEqual((self.frames.edits, self.frames.dropped), (1, 4))
+
+    async def test_one_edit_per_message_per_frame(self):
+        msg = message(1)
+        self.frames.mark(msg, self.render("a"))
+        await asyncio.sleep(0.01)
+        self.frames.mark(msg, self.render("b"))
+        await self.drain()
+
+        (_, first), (_, second) = self.sent
+        self.assertGreaterEqual(second - first, 0.03 - 0.005)
+
+    async def test_channel_budget_is_shared(self):
+        self.frames = FrameScheduler(self.rest, frame=0.01, budget=2, window=0.05)
+        for message_id in (1, 2, 3):
+            self.frames.mark(message(message_id), self.render(message_id))
+        await self.drain()
+
+        self.assertEqual([label for label, _ in self.sent], [1, 2, 3])
+        # a terceira espera a janela do canal
+        self.assertGreaterEqual(self.sent[2][1] - self.sent[0][1], 0.05 - 0.005)
+
+    async def test_forget_drops_the_pending_frame(self):
+        msg = message(1)
+        self.frames.mark(msg, self.render("x"))
+        self.frames.forget(msg)
+        await self.drain()
+        self.assertEqual(self.sent, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
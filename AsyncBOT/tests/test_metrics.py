@@ -0,0 +1,42 @@
+import unittest
+
+from utils.metrics import BUCKETS, Histogram
+
+
+class HistogramTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(Histogram().percentile(99), 0.0)
+
+    def test_percentiles_are_bucket_upper_bounds(self):
+        hist = Histogram()
+        for ms in range(1, 101):
+            hist.record(float(ms))
+
+        for q in (50, 95, 99):
+            value = hist.percentile(q)
+            # no máximo um bucket (25%) acima do valor exato
+            self.assertGreaterEqual(value, q)
+            self.assertLessEqual(value, q * 1.25)
+        self.assertEqual(hist.percentile(100), 100.0)
+        self.assertEqual((hist.count, hist.max, hist.total), (100, 100.0, 5050.0))
+
+    def test_never_above_the_max(self):
+        hist = Histogram()
+        hist.record(3.0)
+        self.assertEqual(hist.percentile(50), 3.0)
+
+    def test_beyond_the_last_bucket(self):
+        hist = Histogram()
+        hist.record(BUCKETS[-1] * 10)
+        self.assertEqual(hist.buckets[-1], 1)
+        self.assertEqual(hist.percentile(99), BUCKETS[-1] * 10)
+
+    def test_errors_are_counted(self):
+        hist = Histogram()
+        hist.record(1.0)
+        hist.record(2.0, failed=True)
+        self.assertEqual(hist.errors, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import asyncio, unittest
+from unittest import mock
+
+import discord
+
+from utils.rest_queue import CLEANUP, INTERACTIVE, NORMAL, RestScheduler
+
+
+class RestSchedulerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.rest = RestScheduler(workers=1)
+
+    async def asyncTearDown(self):
+        await self.rest.close()
+
+    def call(self, log, name, result=None):
+        async def factory():
+            log.append(name)
+            return result
+        return factory
+
+    async def test_higher_priority_goes_first(self):
+        log = []
+        gate = asyncio.Event()
+
+        async def hold():
+            await gate.wait()
+
+        blocker = self.rest.submit_nowait("r0", hold, NORMAL)
+        await asyncio.sleep(0)  # o único worker fica preso no blocker
+
+        futures = [
+            self.rest.submit_nowait("r1", self.call(log, "cleanup"), CLEANUP),
+            self.rest.submit_nowait("r2", self.call(log, "normal"), NORMAL),
+            self.rest.submit_nowait("r3", self.call(log, "interactive"), INTERACTIVE),
+        ]
+        self.assertEqual(self.rest.depth, 3)
+        gate.set()
+        await asyncio.gather(blocker, *futures)
+
+        self.assertEqual(log, ["interactive", "normal", "cleanup"])
+        self.assertEqual(self.rest.completed, 4)
+
+    async def test_same_route_runs_one_at_a_time(self):
+        self.rest = RestScheduler(workers=4)
+        running = peak = 0
+
+        async def call():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await asyncio.gather(*(self.rest.submit("r", call) for _ in range(4)))
+        self.assertEqual(peak, 1)
+
+    async def test_rate_limited_route_pauses_without_holding_the_worker(self):
+        log = []
+        attempts = 0
+
+        async def limited():
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise discord.RateLimited(0.05)
+            log.append("limited")
+            return "ok"
+
+        first = self.rest.submit_nowait("slow", limited, INTERACTIVE)
+        await asyncio.sleep(0.01)
+        # a rota pausada não segura o worker: outra rota passa
+        self.assertEqual(await self.rest.submit("other", self.call(log, "other")), None)
+        self.assertEqual(log, ["other"])
+
+        self.assertEqual(await first, "ok")
+        self.assertEqual(log, ["other", "limited"])
+        self.assertEqual((self.rest.retries, self.rest.rate_limited), (1, 1))
+
+    async def test_errors_are_raised_to_the_caller(self):
+        class Response:
+            status = 403
+            reason = "Forbidden"
+
+        async def forbidden():
+            raise discord.Forbidden(Response(), "sem permissão")
+
+        with self.assertRaises(discord.Forbidden), mock.patch("builtins.print"):
+            await self.rest.submit("r", forbidden)
+        self.assertEqual((self.rest.failed, self.rest.retries), (1, 0))
+
+    async def test_cancelled_call_is_skipped(self):
+        log = []
+        gate = asyncio.Event()
+
+        async def hold():
+            await gate.wait()
+
+        blocker = self.rest.submit_nowait("r", hold)
+        dropped = self.rest.submit_nowait("r", self.call(log, "dropped"))
+        kept = self.rest.submit_nowait("r", self.call(log, "kept"))
+        dropped.cancel()
+        gate.set()
+        await asyncio.gather(blocker, kept)
+        self.assertEqual(log, ["kept"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import asyncio, unittest
+
+from tests.helpers import FakeGuild, MemoryStore, voice_channel
+from utils.rest_queue import RestScheduler
+from utils.room_pool import RoomPool
+
+
+class RoomPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.base = voice_channel(10, name="➕ criar sala")
+        self.base.category = None
+        self.guild = FakeGuild(channels=(self.base,))
+        self.store = MemoryStore()
+        self.state = await self.store.guild(self.guild)
+        self.rest = RestScheduler()
+        self.pool = RoomPool(self.store, self.rest)
+
+    async def asyncTearDown(self):
+        await self.pool.close()
+        await self.rest.close()
+
+    def add_base(self, **cfg):
+        self.store.add_base(self.guild, self.base.id, cfg)
+        return cfg
+
+    async def settle(self):
+        # reposição roda em segundo plano
+        while self.pool._refilling:
+            await asyncio.sleep(0.001)
+
+    async def test_refill_creates_up_to_pool_size(self):
+        cfg = self.add_base(pool_size=2)
+        self.pool.refill(self.guild, self.base, cfg)
+        self.pool.refill(self.guild, self.base, cfg)  # já repondo → não duplica
+        await self.settle()
+
+        self.assertEqual(self.guild.created, 2)
+        self.assertEqual(len(self.state.pool[self.base.id]), 2)
+
+    async def test_take_skips_occupied_and_deleted_rooms(self):
+        self.add_base(pool_size=3)
+        empty = voice_channel(1, members=())
+        busy = voice_channel(2, members=(object(),))
+        for channel in (empty, busy):
+            self.guild.channels[channel.id] = channel
+        for channel_id in (1, 2, 3):  # 3 foi apagada na mão
+            self.store.add_pooled(self.guild, self.base.id, channel_id)
+
+        self.assertIs(self.pool.take(self.guild, self.base.id), empty)
+        self.assertFalse(self.state.pool.get(self.base.id))
+        # a ocupada vira temporária e sabe de onde veio
+        self.assertIn(busy.id, self.state.temporary)
+        self.assertEqual(self.pool.origin(busy.id), self.base.id)
+        self.assertIsNone(self.pool.take(self.guild, self.base.id))
+
+    async def test_recycle_is_off_by_default(self):
+        self.add_base()
+        room = voice_channel(5)
+        self.pool.track(room.id, self.base.id)
+
+        self.assertFalse(await self.pool.recycle(self.guild, room))
+        room.edit.assert_not_called()
+
+    async def test_recycle_parks_until_full(self):
+        self.add_base(recycle_max=1)
+        first, second = voice_channel(5), voice_channel(6)
+        for room in (first, second):
+            self.pool.track(room.id, self.base.id)
+
+        self.assertTrue(await self.pool.recycle(self.guild, first))
+        self.assertFalse(await self.pool.recycle(self.guild, second))  # pool cheio
+        self.assertEqual(self.state.pool[self.base.id], [first.id])
+        self.assertIsNone(self.pool.origin(first.id))
+
+    async def test_parked_room_expires_after_ttl(self):
+        self.add_base(recycle_max=1, recycle_ttl=0)
+        room = voice_channel(5)
+        self.guild.channels[room.id] = room
+        self.pool.track(room.id, self.base.id)
+
+        self.assertTrue(await self.pool.recycle(self.guild, room))
+        await asyncio.sleep(0.01)  # fora do pool_size → apagada no fim do TTL
+        self.assertNotIn(room.id, self.state.pooled)
+        room.delete.assert_awaited()
+
+    async def test_recycle_gives_up_if_someone_joined(self):
+        self.add_base(recycle_max=2)
+        room = voice_channel(5)
+        self.pool.track(room.id, self.base.id)
+
+        async def joined(**_):
+            room.members.append(object())
+        room.edit.side_effect = joined
+
+        self.assertFalse(await self.pool.recycle(self.guild, room))
+        self.assertNotIn(room.id, self.state.pooled)
+
+
+if __name__ == "__main__":
+    unittest.main()
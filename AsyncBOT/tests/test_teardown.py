@@ -0,0 +1,56 @@
+import asyncio, unittest
+
+from utils.teardown import MAX_GRACE, DeferredTeardown
+
+
+class DeferredTeardownTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.teardown = DeferredTeardown(default=0.02)
+        self.deleted = []
+
+    async def asyncTearDown(self):
+        await self.teardown.close()
+
+    def factory(self, channel_id):
+        async def delete():
+            self.deleted.append(channel_id)
+        return delete
+
+    async def test_runs_after_the_grace_period(self):
+        self.teardown.schedule(1, 0.02, self.factory(1))
+        self.assertTrue(self.teardown.pending(1))
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(self.deleted, [1])
+        self.assertFalse(self.teardown.pending(1))
+
+    async def test_cancel_inside_the_grace_period_keeps_the_room(self):
+        self.teardown.schedule(1, 0.02, self.factory(1), tag=(9, 7))
+        self.assertEqual(self.teardown.find((9, 7)), 1)
+
+        self.assertTrue(self.teardown.cancel(1))
+        self.assertFalse(self.teardown.cancel(1))
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(self.deleted, [])
+        self.assertIsNone(self.teardown.find((9, 7)))
+        self.assertEqual((self.teardown.scheduled, self.teardown.cancelled), (1, 1))
+
+    async def test_reschedule_replaces_the_timer(self):
+        self.teardown.schedule(1, 0.01, self.factory("old"))
+        self.teardown.schedule(1, 0.03, self.factory("new"))
+        await asyncio.sleep(0.02)
+        self.assertEqual(self.deleted, [])
+        await asyncio.sleep(0.03)
+        self.assertEqual(self.deleted, ["new"])
+
+    def test_delay_for_clamps_the_config(self):
+        self.assertEqual(self.teardown.delay_for(None), 0.02)
+        self.assertEqual(self.teardown.delay_for({"grace_period": 5}), 5.0)
+        self.assertEqual(self.teardown.delay_for({"grace_period": -1}), 0.0)
+        self.assertEqual(self.teardown.delay_for({"grace_period": 10_000}), MAX_GRACE)
+        self.assertEqual(self.teardown.delay_for({"grace_period": "x"}), 0.02)
+
+
+if __name__ == "__main__":
+    unittest.main()
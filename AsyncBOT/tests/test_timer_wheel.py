@@ -0,0 +1,62 @@
+import asyncio, unittest
+
+from utils.timer_wheel import TimerWheel
+
+
+class TimerWheelTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.wheel = TimerWheel(tick=0.01, slots=8)
+        self.fired = []
+
+    async def asyncTearDown(self):
+        await self.wheel.close()
+
+    async def test_fires_in_deadline_order(self):
+        self.wheel.schedule(0.05, self.fired.append, "b")
+        self.wheel.schedule(0.02, self.fired.append, "a")
+        self.assertEqual(len(self.wheel), 2)
+
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.fired, ["a", "b"])
+        self.assertEqual((len(self.wheel), self.wheel.fired), (0, 2))
+
+    async def test_cancelled_timer_does_not_fire(self):
+        timer = self.wheel.schedule(0.02, self.fired.append, "x")
+        self.assertTrue(timer.cancel())
+        self.assertFalse(timer.cancel())
+        self.assertFalse(timer.active)
+
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.fired, [])
+        self.assertIsNone(self.wheel._handle)  # sem prazos o wheel para de tickar
+
+    async def test_deadline_longer_than_one_lap(self):
+        # 8 slots * 0.01 s = 0.08 s por volta
+        self.wheel.schedule(0.2, self.fired.append, "late")
+        await asyncio.sleep(0.15)
+        self.assertEqual(self.fired, [])
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.fired, ["late"])
+
+    async def test_coroutine_callbacks_run_in_a_task(self):
+        async def callback(value):
+            await asyncio.sleep(0)
+            self.fired.append(value)
+
+        self.wheel.schedule(0.01, callback, "async")
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.fired, ["async"])
+
+    async def test_callback_may_reschedule(self):
+        def again(n):
+            self.fired.append(n)
+            if n < 3:
+                self.wheel.schedule(0.01, again, n + 1)
+
+        self.wheel.schedule(0.01, again, 1)
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.fired, [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os, sqlite3, tempfile, unittest
+
+from utils.voice_store import SCHEMA, SqliteVoiceStore
+
+
+class FakeGuild:
+    def __init__(self, guild_id):
+        self.id = guild_id
+
+
+class SqliteVoiceStoreTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "voice.db")
+        self.guild = FakeGuild(1)
+
+    async def asyncTearDown(self):
+        self.dir.cleanup()
+
+    async def open(self):
+        store = SqliteVoiceStore(self.path)
+        # servidor já "importado": o load não lê o JSON de config/guilds
+        await store.import_guild(self.guild.id, {})
+        return store, await store.guild(self.guild)
+
+    async def test_round_trip(self):
+        store, _ = await self.open()
+        store.add_base(self.guild, 10, {"slots": 2, "pool_size": 1})
+        store.add_custom_base(self.guild, 20, 21)
+        store.add_temporary(self.guild, 30)
+        store.add_temporary(self.guild, 31)
+        store.remove_temporary(self.guild, 31)
+        store.add_pooled(self.guild, 10, 40)
+        store.save_private_room(self.guild, 50, {"owner_id": 7, "text_id": None, "invited": [8]})
+        store.save_custom_session(
+            self.guild, 7, {"category_id": 20, "text_id": 60, "voice_id": 61, "slots": 3, "locked": True},
+        )
+        await store.close()
+
+        store, state = await self.open()
+        try:
+            self.assertEqual(state.bases, {10: {"slots": 2, "pool_size": 1}})
+            self.assertEqual(state.custom_bases, {21: 20})
+            self.assertEqual(state.custom_categories, {20: 21})
+            self.assertEqual(state.temporary, {30})
+            self.assertEqual(state.pool, {10: [40]})
+            self.assertEqual(state.private_rooms[50]["owner_id"], 7)
+            self.assertIsNone(state.private_rooms[50]["text_id"])
+            self.assertEqual(state.private_rooms[50]["invited"], [8])
+            session = state.custom_sessions[7]
+            self.assertEqual((session["voice_id"], session["slots"], session["locked"]), (61, 3, True))
+        finally:
+            await store.close()
+
+    async def test_import_runs_once(self):
+        store = SqliteVoiceStore(self.path)
+        try:
+            self.assertTrue(await store.import_guild(2, {"voice_temporary": [5]}))
+            self.assertFalse(await store.import_guild(2, {"voice_temporary": [6]}))
+            state = await store.guild(FakeGuild(2))
+            self.assertEqual(state.temporary, {5})
+        finally:
+            await store.close()
+
+    async def test_old_schema_is_upgraded(self):
+        # banco de antes do painel persistente: text_id obrigatório, sem panel_id
+        old = SCHEMA.replace(
+            "    text_id      INTEGER,\n    panel_id     INTEGER,\n    panel_version INTEGER,",
+            "    text_id      INTEGER NOT NULL,",
+        )
+        self.assertNotEqual(old, SCHEMA)
+        conn = sqlite3.connect(self.path)
+        conn.executescript(old)
+        conn.execute(
+            "INSERT INTO private_rooms (voice_id, guild_id, owner_id, text_id, invited, created_at) "
+            "VALUES (50, 1, 7, 60, '[]', 0)"
+        )
+        conn.commit()
+        conn.close()
+
+        store, state = await self.open()
+        try:
+            self.assertEqual(state.private_rooms[50]["text_id"], 60)
+            store.save_private_room(self.guild, 51, {"owner_id": 8, "text_id": None})
+        finally:
+            await store.close()
+
+        store, state = await self.open()
+        try:
+            self.assertIsNone(state.private_rooms[51]["text_id"])
+        finally:
+            await store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import asyncio, functools, time
+from collections import deque
+
+import discord
+
+from utils import rest_queue
+from utils.locks import KeyedLock
+from utils.rest_queue import NORMAL, get_rest_queue
+from utils.tasks import TaskSet
+
+RENAME_LIMIT = 2     # o Discord aceita 2 renomeações por canal...
+RENAME_WINDOW = 600  # ...a cada 10 minutos
+
+
+def same_overwrites(current: dict, wanted: dict) -> bool:
+    """Compara overwrites pelo id do alvo (Role, Member ou Object) e pelas permissões."""
+    def by_id(overwrites):
+        return {target.id: overwrite.pair() for target, overwrite in overwrites.items()}
+
+    return by_id(current) == by_id(wanted)
+
+
+class ChannelEditor:
+    """
+    Edits de canal agrupados por canal.
+
+    Pedidos seguidos pro mesmo canal se juntam (o último valor de cada campo
+    vence) e só vai pro Discord o que difere do estado atual do canal.
+    Renomear gasta orçamento (RENAME_LIMIT a cada RENAME_WINDOW por canal):
+    sem orçamento, o nome fica guardado e sai sozinho quando liberar, e o
+    resto (limite, permissões) é enviado na hora.
+    """
+
+    def __init__(self, rest):
+        self.rest = rest
+        self._locks = KeyedLock()
+        self._pending: dict[int, dict] = {}           # canal → campos ainda não enviados
+        self._renames: dict[int, deque[float]] = {}   # canal → horários (monotonic) das renomeações
+        self._deferred: dict[int, tuple[str, float, asyncio.TimerHandle]] = {}  # canal → (nome, quando, timer)
+        self._tasks = TaskSet()
+
+        # métricas
+        self.sent = 0      # edits enviados
+        self.skipped = 0   # pedidos que não mudavam nada
+        self.deferred = 0  # renomeações adiadas
+
+    async def apply(self, channel, *, priority: int = NORMAL, on_rename=None, **changes) -> float | None:
+        """
+        Junta `changes` ao que está pendente pro canal e envia a diferença.
+
+        Devolve o horário (timestamp) em que a renomeação adiada vai sair, ou
+        None se não há nenhuma. `on_rename` (coroutine sem argumentos) roda
+        depois que uma renomeação adiada é aplicada. Erro do edit sobe.
+        """
+        self._pending.setdefault(channel.id, {}).update(changes)
+
+        async with self._locks.hold(channel.id):
+            # None → um apply anterior já levou estes campos junto
+            merged = self._pending.pop(channel.id, None)
+            if merged:
+                await self._send(channel, merged, priority, on_rename)
+
+        return self.rename_at(channel.id)
+
+    def rename_at(self, channel_id: int) -> float | None:
+        entry = self._deferred.get(channel_id)
+        return entry[1] if entry else None
+
+    def pending_name(self, channel_id: int) -> str | None:
+        entry = self._deferred.get(channel_id)
+        return entry[0] if entry else None
+
+    def forget(self, channel_id: int):
+        """Canal apagado: descarta renomeação adiada e orçamento."""
+        self._cancel_deferred(channel_id)
+        self._renames.pop(channel_id, None)
+        self._pending.pop(channel_id, None)
+
+    # ------------------------
+    # Envio
+    # ------------------------
+    async def _send(self, channel, changes, priority, on_rename):
+        diff = {}
+        for key, value in changes.items():
+            if key == "name":
+                # pedido novo vence o adiado (inclusive voltar pro nome atual)
+                self._cancel_deferred(channel.id)
+                if value == channel.name:
+                    continue
+                if self._rename_wait(channel.id) > 0:
+                    self._defer(channel, value, priority, on_rename)
+                    continue
+            elif key == "overwrites":
+                if same_overwrites(channel.overwrites, value):
+                    continue
+            elif getattr(channel, key, None) == value:
+                continue
+            diff[key] = value
+
+        if not diff:
+            self.skipped += 1
+            return
+
+        await self.rest.submit(
+            rest_queue.edit_channel_route(channel.id),
+            lambda: channel.edit(**diff),
+            priority,
+        )
+        self.sent += 1
+        if "name" in diff:
+            self._renames.setdefault(channel.id, deque()).append(time.monotonic())
+
+    # ------------------------
+    # Orçamento de renomeação
+    # ------------------------
+    def _rename_wait(self, channel_id: int) -> float:
+        """Segundos até o canal poder ser renomeado de novo (0 = já pode)."""
+        stamps = self._renames.get(channel_id)
+        if not stamps:
+            return 0.0
+
+        now = time.monotonic()
+        while stamps and stamps[0] <= now - RENAME_WINDOW:
+            stamps.popleft()
+        if not stamps:
+            del self._renames[channel_id]
+            return 0.0
+
+        if len(stamps) < RENAME_LIMIT:
+            return 0.0
+        return stamps[0] + RENAME_WINDOW - now
+
+    def _defer(self, channel, name, priority, on_rename):
+        delay = self._rename_wait(channel.id)
+        handle = asyncio.get_running_loop().call_later(delay, self._fire, channel, priority, on_rename)
+        self._deferred[channel.id] = (name, time.time() + delay, handle)
+        self.deferred += 1
+
+    def _cancel_deferred(self, channel_id: int):
+        entry = self._deferred.pop(channel_id, None)
+        if entry is not None:
+            entry[2].cancel()
+
+    def _fire(self, channel, priority, on_rename):
+        entry = self._deferred.pop(channel.id, None)
+        if entry is None:
+            return
+
+        self._tasks.spawn(self._apply_deferred(channel, entry[0], priority, on_rename))
+
+    async def _apply_deferred(self, channel, name, priority, on_rename):
+        try:
+            # adiado de novo (alguém renomeou no meio tempo) → o callback fica pra próxima
+            if await self.apply(channel, name=name, priority=priority, on_rename=on_rename) is not None:
+                return
+        except discord.HTTPException as e:
+            print(f"❌ [EDIT] Renomeação adiada do canal {channel.id} falhou: {e}")
+            return
+
+        if on_rename is not None:
+            try:
+                await on_rename()
+            except Exception as e:
+                print(f"❌ [EDIT] Falha após renomear o canal {channel.id}: {e}")
+
+    async def close(self):
+        for channel_id in list(self._deferred):
+            self._cancel_deferred(channel_id)
+
+        await self._tasks.cancel_all()
+
+
+@functools.cache
+def get_channel_editor() -> ChannelEditor:
+    return ChannelEditor(get_rest_queue())
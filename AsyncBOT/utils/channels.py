@@ -1,14 +1,243 @@
-import json, os
-
-CONFIG_PATH = "./config/channels.json"
-
-def load_channels():
-    if not os.path.exists(CONFIG_PATH) or os.path.getsize(CONFIG_PATH) == 0:
-        return {"types": []}
-
-    with open(CONFIG_PATH, "r") as f:
-        return json.load(f)
-
-def save_channels(data):
-    with open(CONFIG_PATH, "w") as f:
-        json.dump(data, f, indent=4)
+import asyncio, json, os, tempfile
+
+CONFIG_PATH = "./config/channels.json"
+GUILDS_DIR = "./config/guilds"
+
+# tempo (s) que uma alteração espera antes de ir pro disco; várias
+# alterações dentro dessa janela viram uma única gravação
+FLUSH_DELAY = 2.0
+
+
+def _read_json(path, default):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return default()
+
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _json_default(value):
+    # sets (ex.: voice_temporary em memória) são gravados como lista
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"{type(value).__name__} não é serializável em JSON")
+
+
+def _atomic_write(path, text):
+    """Grava num arquivo temporário do mesmo diretório e troca com os.replace."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class JsonDocument:
+    """
+    Documento JSON mantido em memória.
+    Leituras não tocam o disco; gravações são agrupadas (debounce)
+    e feitas fora do event loop, de forma atômica.
+    """
+
+    def __init__(self, path, default=dict, delay=FLUSH_DELAY):
+        self.path = path
+        self.default = default
+        self.delay = delay
+
+        self._data = None
+        self._dirty = False
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = _read_json(self.path, self.default)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    def mark_dirty(self):
+        self._dirty = True
+
+        if self._task and not self._task.done():
+            return  # já existe gravação agendada
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # fora do loop (scripts, testes) → grava direto
+            self.flush_sync()
+            return
+
+        self._task = loop.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        # repete enquanto chegarem alterações durante a gravação
+        while self._dirty:
+            await asyncio.sleep(self.delay)
+            await self.flush()
+
+    def _snapshot(self):
+        if not self._dirty or self._data is None:
+            return None
+        self._dirty = False
+        return json.dumps(self._data, indent=4, default=_json_default)
+
+    async def flush(self):
+        async with self._lock:
+            text = self._snapshot()
+            if text is None:
+                return
+            try:
+                await asyncio.to_thread(_atomic_write, self.path, text)
+            except Exception as e:
+                self._dirty = True
+                print(f"❌ Falha ao gravar {self.path}: {e}")
+
+    def flush_sync(self):
+        text = self._snapshot()
+        if text is not None:
+            _atomic_write(self.path, text)
+
+
+class ChannelStore:
+    """
+    Config de canais do processo inteiro, servida da memória.
+
+    - channels.json guarda apenas o que é global (lista de "types").
+    - cada servidor tem seu próprio arquivo em config/guilds/<guild_id>.json,
+      carregado na primeira vez que o servidor é usado.
+
+    Assim uma gravação de um servidor não reescreve os dados dos outros.
+    """
+
+    def __init__(self, path=CONFIG_PATH, guilds_dir=GUILDS_DIR):
+        self.root = JsonDocument(path, default=lambda: {"types": []})
+        self.guilds_dir = guilds_dir
+        self._guilds: dict[int, JsonDocument] = {}
+
+    def load(self):
+        return self.root.data
+
+    def save(self, data=None):
+        if data is not None:
+            self.root.data = data
+        self.root.mark_dirty()
+
+    # ------------------------
+    # Por servidor
+    # ------------------------
+    def guild(self, guild):
+        doc = self._guilds.get(guild.id)
+        if doc is None:
+            doc = JsonDocument(os.path.join(self.guilds_dir, f"{guild.id}.json"))
+            self._guilds[guild.id] = doc
+
+            if not os.path.exists(doc.path):
+                doc.data = self._migrate_legacy(guild)
+                if doc.data:
+                    doc.mark_dirty()
+
+        return doc.data
+
+    def save_guild(self, guild):
+        guild_id = getattr(guild, "id", guild)
+        doc = self._guilds.get(guild_id)
+        if doc is not None:
+            doc.mark_dirty()
+
+    def _migrate_legacy(self, guild):
+        """
+        Move para o arquivo do servidor as entradas do channels.json antigo
+        (tudo num arquivo só) cujos canais pertencem a este servidor.
+        """
+        legacy = self.root.data
+        data = {}
+        moved = False
+
+        for key in list(legacy.keys()):
+            value = legacy[key]
+
+            if key == "types":
+                continue
+
+            if key in ("voice_base_configs", "voice_custom_base"):
+                mine = {k: v for k, v in value.items() if guild.get_channel(int(k))}
+                if mine:
+                    data[key] = mine
+                    for k in mine:
+                        value.pop(k)
+                    moved = True
+
+            elif key == "voice_temporary":
+                mine = [cid for cid in value if guild.get_channel(cid)]
+                if mine:
+                    data[key] = mine
+                    taken = set(mine)
+                    legacy[key] = [cid for cid in value if cid not in taken]
+                    moved = True
+
+            elif isinstance(value, int) and guild.get_channel(value):
+                # canais de texto (welcome, logs...)
+                data[key] = legacy.pop(key)
+                moved = True
+
+        if moved:
+            self.root.mark_dirty()
+
+        return data
+
+    def prune_legacy(self, client) -> int:
+        """
+        Descarta do channels.json antigo as temporárias que não existem em
+        nenhum servidor (as que existem migram com o servidor delas).
+        Devolve quantas saíram.
+        """
+        legacy = self.root.data.get("voice_temporary")
+        if not legacy:
+            return 0
+
+        alive = [cid for cid in legacy if client.get_channel(cid)]
+        dropped = len(legacy) - len(alive)
+        if dropped:
+            self.root.data["voice_temporary"] = alive
+            self.root.mark_dirty()
+        return dropped
+
+    async def flush_all(self):
+        await self.root.flush()
+        for doc in list(self._guilds.values()):
+            await doc.flush()
+
+
+store = ChannelStore()
+
+
+def load_channels():
+    return store.load()
+
+
+def save_channels(data=None):
+    store.save(data)
+
+
+def load_guild(guild):
+    return store.guild(guild)
+
+
+def save_guild(guild):
+    store.save_guild(guild)
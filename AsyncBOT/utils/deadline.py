@@ -0,0 +1,125 @@
+import asyncio, functools, time
+
+import discord
+
+# o Discord derruba a interação sem resposta em 3 s
+DEFER_AFTER = 2.0  # sem resposta até aqui (contando da criação) → defer automático
+
+
+class CommandStats:
+    __slots__ = ("calls", "deferred", "missed", "total", "slowest")
+
+    def __init__(self):
+        self.calls = 0
+        self.deferred = 0  # precisou do defer automático (quase perdeu o prazo)
+        self.missed = 0    # nem o defer chegou a tempo ("interação falhou")
+        self.total = 0.0   # segundos somados do handler
+        self.slowest = 0.0
+
+    @property
+    def average(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+class _Pending:
+    __slots__ = ("handle", "task")
+
+    def __init__(self):
+        self.handle: asyncio.TimerHandle | None = None
+        self.task: asyncio.Task | None = None
+
+
+# interação em andamento → timer/task do defer
+_pending: dict[int, _Pending] = {}
+# nome do handler → estatísticas
+stats: dict[str, CommandStats] = {}
+
+
+def _age(interaction: discord.Interaction) -> float:
+    return time.time() - interaction.created_at.timestamp()
+
+
+async def _defer(interaction: discord.Interaction, name: str, ephemeral: bool):
+    if interaction.response.is_done():
+        return
+    try:
+        await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+        stats[name].deferred += 1
+    except discord.NotFound:
+        # 10062 Unknown interaction: o prazo já tinha passado
+        stats[name].missed += 1
+        print(f"⚠️ [DEADLINE] {name}: interação expirou antes do defer ({_age(interaction):.1f}s).")
+    except discord.HTTPException:
+        pass
+
+
+def auto_defer(name: str | None = None, *, threshold: float = DEFER_AFTER, ephemeral: bool = True):
+    """
+    Decorator pra handlers que fazem chamadas REST antes de responder.
+
+    Se o handler não respondeu até `threshold` segundos depois da criação da
+    interação, o bot faz defer sozinho (o usuário vê "pensando...") e a
+    resposta final sai como follow-up. O handler responde com `reply()` em
+    vez de `interaction.response.send_message`. Conta por handler quantas
+    vezes o prazo quase estourou (stats).
+    """
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            interaction = next((a for a in args if isinstance(a, discord.Interaction)), None)
+            if interaction is None:
+                interaction = kwargs.get("interaction")
+            if interaction is None or interaction.id in _pending:
+                # sem interação, ou já dentro de outro handler com prazo
+                return await func(*args, **kwargs)
+
+            entry = stats.setdefault(label, CommandStats())
+            pending = _pending[interaction.id] = _Pending()
+
+            def fire():
+                pending.handle = None
+                pending.task = asyncio.create_task(_defer(interaction, label, ephemeral))
+
+            delay = max(0.0, threshold - _age(interaction))
+            pending.handle = asyncio.get_running_loop().call_later(delay, fire)
+
+            started = time.monotonic()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                if pending.handle is not None:
+                    pending.handle.cancel()
+                if pending.task is not None:
+                    await asyncio.gather(pending.task, return_exceptions=True)
+                _pending.pop(interaction.id, None)
+
+                elapsed = time.monotonic() - started
+                entry.calls += 1
+                entry.total += elapsed
+                entry.slowest = max(entry.slowest, elapsed)
+
+        return wrapper
+
+    return decorator
+
+
+async def reply(interaction: discord.Interaction, content: str | None = None, **kwargs):
+    """
+    Responde a interação pelo caminho certo: resposta normal se ninguém
+    respondeu ainda, follow-up se já houve defer (automático ou não).
+    """
+    pending = _pending.get(interaction.id)
+    if pending is not None:
+        # daqui pra frente o timer não dispara; defer em voo termina antes
+        if pending.handle is not None:
+            pending.handle.cancel()
+            pending.handle = None
+        if pending.task is not None:
+            await asyncio.gather(pending.task, return_exceptions=True)
+
+    if not interaction.response.is_done():
+        return await interaction.response.send_message(content, **kwargs)
+
+    return await interaction.followup.send(content, **kwargs)
@@ -0,0 +1,257 @@
+import itertools, random, time
+
+NIPES = ("P", "O", "E", "C")
+TAMANHO_SEQ = 4
+# sequências possíveis do dealer (sem repetir naipe); sortear uma = random.sample
+PERMUTACOES = tuple(itertools.permutations(NIPES, TAMANHO_SEQ))
+
+# fases
+CONFIRMACAO = 0  # esperando os dois aceitarem
+ESCOLHA = 1      # cada jogador monta a sequência de naipes
+REVELACAO = 2    # cartas do dealer saem rodada a rodada
+FIM = 3
+CANCELADO = 4    # recusado ou sem confirmação a tempo
+
+# resultados
+EMPATE = 0        # ninguém acertou em nenhuma rodada
+VITORIA = 1       # só um acertou a carta da rodada
+EMPATE_TOTAL = 2  # os dois acertaram na mesma rodada
+
+
+class JogadaInvalida(Exception):
+    """
+    Jogada recusada pelas regras. `motivo`: "nao_jogador", "fase",
+    "ja_aceitou", "naipe_invalido", "naipe_repetido", "sequencia_completa".
+    """
+
+    def __init__(self, motivo: str):
+        super().__init__(motivo)
+        self.motivo = motivo
+
+
+class Rodada:
+    __slots__ = ("numero", "carta", "escolha_a", "escolha_b")
+
+    def __init__(self, numero, carta, escolha_a, escolha_b):
+        self.numero = numero        # 1..TAMANHO_SEQ
+        self.carta = carta          # carta do dealer
+        self.escolha_a = escolha_a  # desafiante
+        self.escolha_b = escolha_b  # desafiado
+
+
+class Duelo:
+    """
+    Regras do duelo, sem Discord: a UI (cogs/duelo.py) só chama os métodos
+    e desenha o estado. `rng` (random.Random ou compatível) sorteia as
+    cartas do dealer; `clock` marca o início de cada fase. Os dois podem
+    ser trocados em teste/benchmark.
+    """
+
+    __slots__ = (
+        "desafiante", "desafiado", "fase", "aceitou", "escolhas_a", "escolhas_b",
+        "bot_seq", "rodada", "vencedor", "resultado", "rng", "clock", "fase_desde",
+    )
+
+    def __init__(self, desafiante: int, desafiado: int, *, rng=random, clock=time.monotonic):
+        self.desafiante = desafiante
+        self.desafiado = desafiado
+        self.fase = CONFIRMACAO
+        self.aceitou: set[int] = set()
+        self.escolhas_a: list[str] = []
+        self.escolhas_b: list[str] = []
+        self.bot_seq: list[str] = []
+        self.rodada = 0               # última rodada revelada
+        self.vencedor: int | None = None
+        self.resultado: int | None = None
+        self.rng = rng
+        self.clock = clock
+        self.fase_desde = clock()
+
+    def jogador(self, uid: int) -> bool:
+        return uid == self.desafiante or uid == self.desafiado
+
+    def escolhas(self, uid: int) -> list[str]:
+        return self.escolhas_a if uid == self.desafiante else self.escolhas_b
+
+    def _mudar(self, fase: int):
+        self.fase = fase
+        self.fase_desde = self.clock()
+
+    # ------------------------
+    # Fase 1: confirmação
+    # ------------------------
+    def aceitar(self, uid: int) -> bool:
+        """True quando os dois aceitaram (o duelo passa pra escolha)."""
+        if not self.jogador(uid):
+            raise JogadaInvalida("nao_jogador")
+        if self.fase != CONFIRMACAO:
+            raise JogadaInvalida("fase")
+        if uid in self.aceitou:
+            raise JogadaInvalida("ja_aceitou")
+
+        self.aceitou.add(uid)
+        if len(self.aceitou) < 2:
+            return False
+        self._mudar(ESCOLHA)
+        return True
+
+    def recusar(self, uid: int):
+        if not self.jogador(uid):
+            raise JogadaInvalida("nao_jogador")
+        if self.fase != CONFIRMACAO:
+            raise JogadaInvalida("fase")
+        self._mudar(CANCELADO)
+
+    def expirar(self) -> bool:
+        """Prazo de confirmação acabou. True se o duelo não chegou a começar."""
+        if self.fase == CONFIRMACAO:
+            self._mudar(CANCELADO)
+        return self.fase == CANCELADO
+
+    def abandonar(self) -> bool:
+        """Prazo de escolha acabou. True se ainda faltavam jogadas (o duelo é cancelado)."""
+        if self.fase != ESCOLHA:
+            return False
+        self._mudar(CANCELADO)
+        return True
+
+    # ------------------------
+    # Fase 2: escolha
+    # ------------------------
+    def escolher(self, uid: int, nipe: str) -> bool:
+        """True quando as duas sequências ficaram completas (o dealer sorteia as cartas)."""
+        if uid == self.desafiante:
+            seq = self.escolhas_a
+        elif uid == self.desafiado:
+            seq = self.escolhas_b
+        else:
+            raise JogadaInvalida("nao_jogador")
+        if self.fase != ESCOLHA:
+            raise JogadaInvalida("fase")
+        if nipe in seq:
+            raise JogadaInvalida("naipe_repetido")
+        if nipe not in NIPES:
+            raise JogadaInvalida("naipe_invalido")
+        if len(seq) == TAMANHO_SEQ:
+            raise JogadaInvalida("sequencia_completa")
+
+        seq.append(nipe)
+        if len(self.escolhas_a) < TAMANHO_SEQ or len(self.escolhas_b) < TAMANHO_SEQ:
+            return False
+
+        self.bot_seq = list(self.rng.choice(PERMUTACOES))
+        self._mudar(REVELACAO)
+        return True
+
+    # ------------------------
+    # Fase 3: revelação
+    # ------------------------
+    def proxima_rodada(self) -> Rodada:
+        """Revela a próxima carta; quem acertar primeiro vence (os dois → empate total)."""
+        if self.fase != REVELACAO:
+            raise JogadaInvalida("fase")
+
+        i = self.rodada
+        carta = self.bot_seq[i]
+        a = self.escolhas_a[i]
+        b = self.escolhas_b[i]
+        self.rodada = i + 1
+
+        acerta_a = a == carta
+        acerta_b = b == carta
+        if acerta_a and acerta_b:
+            self.resultado = EMPATE_TOTAL
+        elif acerta_a or acerta_b:
+            self.resultado = VITORIA
+            self.vencedor = self.desafiante if acerta_a else self.desafiado
+        elif self.rodada == TAMANHO_SEQ:
+            self.resultado = EMPATE
+
+        if self.resultado is not None:
+            self._mudar(FIM)
+        return Rodada(self.rodada, carta, a, b)
+
+    def resolver(self) -> int:
+        """Revela todas as rodadas restantes de uma vez."""
+        while self.fase == REVELACAO:
+            self.proxima_rodada()
+        return self.resultado
+
+
+# =========================================================
+#   Benchmark: python -m utils.duelo_engine [duelos] [seed]
+#   (a partir da pasta AsyncBOT)
+# =========================================================
+def _simular(n: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    choice = rng.choice
+    contagem = {"desafiante": 0, "desafiado": 0, "empate": 0, "empate_total": 0}
+    rodadas = [0] * (TAMANHO_SEQ + 1)
+    primeira_carta = dict.fromkeys(NIPES, 0)
+
+    inicio = time.perf_counter()
+    for _ in range(n):
+        duelo = Duelo(1, 2, rng=rng, clock=int)  # clock fixo: só as regras entram na conta
+        duelo.aceitar(1)
+        duelo.aceitar(2)
+        for nipe_a, nipe_b in zip(choice(PERMUTACOES), choice(PERMUTACOES)):
+            duelo.escolher(1, nipe_a)
+            duelo.escolher(2, nipe_b)
+        resultado = duelo.resolver()
+
+        if resultado == VITORIA:
+            contagem["desafiante" if duelo.vencedor == 1 else "desafiado"] += 1
+        elif resultado == EMPATE_TOTAL:
+            contagem["empate_total"] += 1
+        else:
+            contagem["empate"] += 1
+        rodadas[duelo.rodada] += 1
+        primeira_carta[duelo.bot_seq[0]] += 1
+    segundos = time.perf_counter() - inicio
+
+    return {"segundos": segundos, "contagem": contagem, "rodadas": rodadas, "primeira_carta": primeira_carta}
+
+
+def _memoria_por_duelo(n: int = 10_000) -> float:
+    """Bytes por duelo completo mantido vivo (tracemalloc)."""
+    import tracemalloc
+
+    rng = random.Random(0)
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    vivos = []
+    for _ in range(n):
+        duelo = Duelo(1, 2, rng=rng, clock=int)
+        duelo.aceitar(1)
+        duelo.aceitar(2)
+        for nipe in NIPES:
+            duelo.escolher(1, nipe)
+            duelo.escolher(2, nipe)
+        duelo.resolver()
+        vivos.append(duelo)
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (depois - antes) / n
+
+
+def benchmark(n: int = 200_000, seed: int = 0):
+    r = _simular(n, seed)
+    c = r["contagem"]
+
+    print(f"🎲 {n} duelos em {r['segundos']:.2f}s → {n / r['segundos']:,.0f} duelos/s "
+          f"({r['segundos'] / n * 1e6:.2f} µs por duelo)")
+    print(f"🧠 ~{_memoria_por_duelo():.0f} bytes por duelo vivo")
+
+    # justiça: desafiante e desafiado têm a mesma chance (diferença em desvios-padrão)
+    decididos = c["desafiante"] + c["desafiado"]
+    desvio = (c["desafiante"] - c["desafiado"]) / max(decididos, 1) ** 0.5
+    print("🏆 " + " · ".join(f"{k}: {v / n:.2%}" for k, v in c.items()))
+    print(f"⚖️ desafiante − desafiado: {desvio:+.2f}σ " + ("(ok)" if abs(desvio) < 3 else "(SUSPEITO)"))
+    print("🃏 rodadas até decidir: " + " · ".join(f"{i}: {v / n:.2%}" for i, v in enumerate(r["rodadas"]) if i))
+    print("🂠 primeira carta do dealer: " + " · ".join(f"{k}: {v / n:.2%}" for k, v in r["primeira_carta"].items()))
+
+
+if __name__ == "__main__":
+    import sys
+
+    benchmark(*(int(a) for a in sys.argv[1:3]))
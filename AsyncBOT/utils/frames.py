@@ -0,0 +1,128 @@
+import asyncio, functools, time
+from collections import OrderedDict, deque
+
+import discord
+
+from utils import rest_queue
+from utils.rest_queue import NORMAL, get_rest_queue
+
+FRAME_INTERVAL = 1.0  # no máximo um edit por mensagem a cada quadro (s)
+CHANNEL_BUDGET = 5    # edits de mensagem por canal...
+CHANNEL_WINDOW = 5.0  # ...nessa janela (s)
+
+
+class _Channel:
+    __slots__ = ("dirty", "last_edit", "sent", "task")
+
+    def __init__(self):
+        self.dirty: OrderedDict[int, object] = OrderedDict()  # mensagem → render mais recente
+        self.last_edit: dict[int, float] = {}                 # mensagem → monotonic do último edit
+        self.sent: deque[float] = deque()                     # edits do canal na janela
+        self.task: asyncio.Task | None = None
+
+
+class FrameScheduler:
+    """
+    Edits de mensagens animadas (duelo) agrupados por quadro.
+
+    Mudar o estado só marca a mensagem como suja (`mark`); um pump por canal
+    envia no máximo um edit por mensagem a cada FRAME_INTERVAL e no máximo
+    CHANNEL_BUDGET por CHANNEL_WINDOW no canal. O render roda na hora do
+    envio e mostra o estado daquele momento, então quadros intermediários
+    de quem ficou pra trás são descartados. As mensagens sujas do canal são
+    atendidas em ordem de chegada, o que divide o bucket entre os duelos.
+    """
+
+    def __init__(self, rest, *, frame=FRAME_INTERVAL, budget=CHANNEL_BUDGET, window=CHANNEL_WINDOW):
+        self.rest = rest
+        self.frame = frame
+        self.budget = budget
+        self.window = window
+        self._channels: dict[int, _Channel] = {}
+
+        # métricas
+        self.edits = 0    # edits enviados
+        self.dropped = 0  # quadros substituídos antes de sair
+
+    def mark(self, message: discord.Message, render):
+        """`render()` devolve a coroutine do edit; a mais recente vence."""
+        channel_id = message.channel.id
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            channel = self._channels[channel_id] = _Channel()
+
+        if message.id in channel.dirty:
+            self.dropped += 1
+        channel.dirty[message.id] = render  # já suja: mantém o lugar na fila
+
+        if channel.task is None:
+            channel.task = asyncio.create_task(self._pump(channel_id, channel))
+
+    def forget(self, message: discord.Message):
+        """Mensagem apagada: descarta o quadro pendente."""
+        channel = self._channels.get(message.channel.id)
+        if channel is not None and channel.dirty.pop(message.id, None) is not None:
+            self.dropped += 1
+
+    def pending(self) -> int:
+        return sum(len(c.dirty) for c in self._channels.values())
+
+    # ------------------------
+    # Pump
+    # ------------------------
+    def _next(self, channel: _Channel, now: float):
+        """(mensagem pronta, None) ou (None, segundos até a primeira ficar pronta)."""
+        wait = None
+        for message_id in channel.dirty:
+            ready_at = channel.last_edit.get(message_id, 0.0) + self.frame
+            if ready_at <= now:
+                return message_id, None
+            wait = ready_at - now if wait is None else min(wait, ready_at - now)
+        return None, wait
+
+    async def _pump(self, channel_id: int, channel: _Channel):
+        try:
+            while True:
+                if not channel.dirty:
+                    # fica um quadro a mais: um edit logo em seguida respeita o intervalo
+                    await asyncio.sleep(self.frame)
+                    if not channel.dirty:
+                        return
+                    continue
+
+                now = time.monotonic()
+                while channel.sent and channel.sent[0] <= now - self.window:
+                    channel.sent.popleft()
+                if len(channel.sent) >= self.budget:
+                    await asyncio.sleep(channel.sent[0] + self.window - now)
+                    continue
+
+                message_id, wait = self._next(channel, now)
+                if message_id is None:
+                    await asyncio.sleep(wait)
+                    continue
+
+                render = channel.dirty.pop(message_id)
+                channel.last_edit[message_id] = now
+                channel.sent.append(now)
+                try:
+                    await self.rest.submit(rest_queue.edit_message_route(channel_id), render, NORMAL)
+                    self.edits += 1
+                except discord.HTTPException:
+                    pass  # mensagem apagada / sem permissão: o próximo quadro tenta de novo
+        finally:
+            channel.task = None
+            if self._channels.get(channel_id) is channel and not channel.dirty:
+                del self._channels[channel_id]
+
+    async def close(self):
+        channels, self._channels = list(self._channels.values()), {}
+        tasks = [c.task for c in channels if c.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@functools.cache
+def get_frame_scheduler() -> FrameScheduler:
+    return FrameScheduler(get_rest_queue())
@@ -0,0 +1,89 @@
+import asyncio
+
+import discord
+
+from utils import rest_queue
+from utils.overwrites import revoke_guests
+from utils.rest_queue import INTERACTIVE, get_rest_queue
+
+MAX_PARALLEL = 5  # ações de um mesmo painel ao mesmo tempo na fila REST
+
+NOT_IN_VOICE = 40032  # "Target user is not connected to voice"
+
+_EDITS = {
+    "mute": {"mute": True},
+    "unmute": {"mute": False},
+    "deaf": {"deafen": True},
+    "undeaf": {"deafen": False},
+}
+
+
+def describe_error(error: discord.HTTPException) -> str:
+    if error.code == NOT_IN_VOICE:
+        return "não está em call"
+    if isinstance(error, discord.Forbidden):
+        return "sem permissão"
+    if isinstance(error, discord.NotFound):
+        return "não encontrado"
+    return f"erro {error.status}"
+
+
+async def apply_guest_action(
+    voice: discord.VoiceChannel,
+    members: list[discord.Member],
+    action: str,
+    invited: set[int],
+    *,
+    keep=(),
+) -> dict[discord.Member, str | None]:
+    """
+    Aplica mute/unmute/deaf/undeaf/kick nos convidados em paralelo (limitado
+    por MAX_PARALLEL e pela fila REST). Devolve membro → None (ok) ou o motivo da falha.
+
+    No kick, quem não estava em call conta como ok: o principal é tirar o
+    acesso, e isso sai num único edit de overwrites pra todos.
+    """
+    guild = voice.guild
+    rest = get_rest_queue()
+    limit = asyncio.Semaphore(MAX_PARALLEL)
+
+    async def run(member: discord.Member) -> str | None:
+        if action == "kick":
+            factory = lambda: member.move_to(None)
+        else:
+            changes = _EDITS[action]
+            factory = lambda: member.edit(**changes)
+
+        async with limit:
+            try:
+                await rest.submit(rest_queue.member_route(guild.id, member.id), factory, INTERACTIVE)
+            except discord.HTTPException as e:
+                if action == "kick" and e.code == NOT_IN_VOICE:
+                    return None
+                return describe_error(e)
+        return None
+
+    results = await asyncio.gather(*(run(m) for m in members))
+    outcome = dict(zip(members, results))
+
+    if action == "kick":
+        kicked = [m.id for m, error in outcome.items() if error is None]
+        if kicked and not await revoke_guests(voice, invited, kicked, keep=keep):
+            for member in members:
+                if outcome[member] is None:
+                    outcome[member] = "acesso não removido"
+
+    return outcome
+
+
+def format_outcome(action: str, outcome: dict[discord.Member, str | None]) -> str:
+    """Resumo único pro follow-up: quem deu certo e quem falhou (com motivo)."""
+    ok = [m.mention for m, error in outcome.items() if error is None]
+    failed = [f"{m.mention} ({error})" for m, error in outcome.items() if error is not None]
+
+    lines = []
+    if ok:
+        lines.append(f"✅ Ação `{action}` aplicada em: {', '.join(ok)}")
+    if failed:
+        lines.append(f"❌ Falhou em: {', '.join(failed)}")
+    return "\n".join(lines) or "Nenhum usuário afetado."
@@ -0,0 +1,202 @@
+import math, os
+
+from aiohttp import web
+
+from utils.frames import get_frame_scheduler
+from utils.loop_monitor import get_loop_monitor
+from utils.metrics import get_metrics
+from utils.rest_queue import get_rest_queue
+from utils.services import get_services
+from utils.timer_wheel import get_timer_wheel
+from utils.voice_store import get_voice_store
+
+HEALTH_HOST = "127.0.0.1"  # só a própria máquina (orquestrador / coletor de métricas)
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _value(value) -> str:
+    if isinstance(value, int):
+        return str(value)
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class OpenMetrics:
+    """Texto no formato OpenMetrics, uma família por vez."""
+
+    def __init__(self):
+        self.lines: list[str] = []
+
+    def family(self, name: str, kind: str, help: str, samples):
+        """`samples`: número (sem labels) ou lista de (dict de labels, número)."""
+        self.lines.append(f"# HELP {name} {help}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        if not isinstance(samples, list):
+            samples = [({}, samples)]
+
+        sample = f"{name}_total" if kind == "counter" else name
+        for labels, value in samples:
+            if labels:
+                inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                self.lines.append(f"{sample}{{{inner}}} {_value(value)}")
+            else:
+                self.lines.append(f"{sample} {_value(value)}")
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n# EOF\n"
+
+
+class HealthServer:
+    """
+    HTTP local pro orquestrador:
+
+    - /healthz → 200 enquanto o processo e o event loop respondem;
+    - /readyz  → 200 depois do setup_hook e do sync dos slash commands;
+    - /metrics → métricas em OpenMetrics.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._runner: web.AppRunner | None = None
+
+    async def start(self, port: int):
+        app = web.Application()
+        app.router.add_get("/healthz", self.healthz)
+        app.router.add_get("/readyz", self.readyz)
+        app.router.add_get("/metrics", self.metrics)
+
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, HEALTH_HOST, port).start()
+        except OSError as e:
+            await runner.cleanup()
+            print(f"❌ [HEALTH] Não foi possível abrir {HEALTH_HOST}:{port}: {e}")
+            return
+
+        self._runner = runner
+        print(f"🩺 [HEALTH] /healthz, /readyz e /metrics em http://{HEALTH_HOST}:{port}")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # ------------------------
+    # Rotas
+    # ------------------------
+    async def healthz(self, request):
+        # responder já prova que o loop não está travado
+        if self.bot.is_closed():
+            return web.Response(status=503, text="closing\n")
+        return web.Response(text="ok\n")
+
+    async def readyz(self, request):
+        if self.bot.is_closed() or self.bot.synced_at is None:
+            return web.Response(status=503, text="starting\n")
+        return web.Response(text="ready\n")
+
+    async def metrics(self, request):
+        return web.Response(body=self.render().encode(), headers={"Content-Type": CONTENT_TYPE})
+
+    # ------------------------
+    # Coleta
+    # ------------------------
+    def _module_len(self, extension: str, attr: str) -> int:
+        # estado que vive no módulo da cog (0 se ela não estiver carregada)
+        module = self.bot.extensions.get(extension)
+        return len(getattr(module, attr, ()))
+
+    def _cog_events(self) -> list:
+        counts = self.bot.event_counts
+        router = getattr(self.bot, "voice_router", None)
+
+        samples = []
+        for name, cog in self.bot.cogs.items():
+            total = sum(counts.get(event.removeprefix("on_"), 0) for event, _ in cog.get_listeners())
+            if router is not None:
+                total += router.handled.get(cog, 0)
+            samples.append(({"cog": name}, total))
+        return samples
+
+    def render(self) -> str:
+        bot = self.bot
+        out = OpenMetrics()
+        loop = get_loop_monitor()
+
+        out.family("asyncbot_ready", "gauge", "1 depois do setup_hook e do sync.", int(bot.synced_at is not None))
+        out.family("asyncbot_gateway_latency_seconds", "gauge", "Latência do heartbeat do gateway.", bot.latency)
+        out.family("asyncbot_event_loop_lag_seconds", "gauge", "Atraso do event loop na última medição.", loop.lag)
+        out.family("asyncbot_event_loop_lag_max_seconds", "gauge", "Maior atraso do event loop desde o início.", loop.max_lag)
+        out.family("asyncbot_degradation_level", "gauge", "Nível de degradação sob carga (0 = normal).", int(loop.level))
+        out.family("asyncbot_guilds", "gauge", "Servidores no cache.", len(bot.guilds))
+        out.family("asyncbot_timers_pending", "gauge", "Prazos pendentes no timer wheel (views, duelos).", len(get_timer_wheel()))
+
+        factory = bot.get_cog("VoiceFactory")
+        builder = bot.get_cog("VoiceBuilder")
+        store = get_voice_store()
+        temporary = 0
+        for guild in bot.guilds:
+            state = store.cached(guild.id)
+            if state is not None:
+                temporary += len(state.temporary)
+        out.family("asyncbot_active_rooms", "gauge", "Salas de voz ativas por tipo.", [
+            ({"kind": "temporary"}, temporary),
+            ({"kind": "private"}, len(factory.rooms) if factory else 0),
+            ({"kind": "custom"}, len(builder.sessions) if builder else 0),
+        ])
+
+        out.family("asyncbot_active_duels", "gauge", "Duelos em andamento.", self._module_len("cogs.duelo", "DUELOS_ATIVOS"))
+        frames = get_frame_scheduler()
+        out.family("asyncbot_frames_pending", "gauge", "Mensagens animadas esperando o próximo quadro.", frames.pending())
+        out.family("asyncbot_frame_edits", "counter", "Edits de mensagens animadas enviados.", frames.edits)
+        out.family("asyncbot_frames_dropped", "counter", "Quadros substituídos antes de sair.", frames.dropped)
+        out.family("asyncbot_active_embeds", "gauge", "Embeds em edição (ACTIVE_EMBEDS).", self._module_len("cogs.embed_builder", "ACTIVE_EMBEDS"))
+
+        rest = get_rest_queue().snapshot()
+        out.family("asyncbot_rest_queue_depth", "gauge", "Chamadas REST esperando na fila.", rest["depth"])
+        out.family("asyncbot_rest_in_flight", "gauge", "Chamadas REST em andamento.", rest["in_flight"])
+        out.family("asyncbot_rest_requests", "counter", "Chamadas REST concluídas por resultado.", [
+            ({"result": "ok"}, rest["completed"]),
+            ({"result": "failed"}, rest["failed"]),
+        ])
+        out.family("asyncbot_rest_rate_limited", "counter", "Respostas 429 recebidas.", rest["rate_limited"])
+
+        out.family("asyncbot_events", "counter", "Eventos do gateway despachados.", [
+            ({"event": name}, n) for name, n in sorted(bot.event_counts.items())
+        ])
+        out.family("asyncbot_cog_events", "counter", "Eventos entregues aos listeners de cada cog.", self._cog_events())
+
+        hists = sorted(get_metrics().histograms.items())
+        services = sorted(get_services().services.values(), key=lambda s: s.name)
+        out.family("asyncbot_service_up", "gauge", "1 se o serviço de fundo está rodando.", [
+            ({"service": s.name}, int(s.running)) for s in services
+        ])
+        out.family("asyncbot_service_failures", "counter", "Voltas de serviço que falharam.", [
+            ({"service": s.name}, s.failures) for s in services
+        ])
+
+        out.family("asyncbot_interactions", "counter", "Interações atendidas por comando/componente.", [
+            ({"label": label}, h.count) for label, h in hists
+        ])
+        out.family("asyncbot_interaction_errors", "counter", "Interações que terminaram em erro.", [
+            ({"label": label}, h.errors) for label, h in hists
+        ])
+        return out.render()
+
+
+def health_port() -> int | None:
+    """HEALTH_PORT no .env liga o servidor; vazio ou 0 deixa desligado."""
+    try:
+        port = int(os.getenv("HEALTH_PORT") or 0)
+    except ValueError:
+        return None
+    return port or None
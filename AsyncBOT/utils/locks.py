@@ -0,0 +1,36 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class KeyedLock:
+    """
+    Um asyncio.Lock por chave (ex.: id do canal), criado sob demanda
+    e descartado quando ninguém mais está esperando por ele.
+    Operações em chaves diferentes correm em paralelo.
+    """
+
+    def __init__(self):
+        # chave → [lock, nº de usuários (dono + fila)]
+        self._locks: dict[object, list] = {}
+
+    def locked(self, key) -> bool:
+        entry = self._locks.get(key)
+        return entry is not None and entry[0].locked()
+
+    def __len__(self):
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def hold(self, key):
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._locks.pop(key, None)
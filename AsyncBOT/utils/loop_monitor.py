@@ -0,0 +1,106 @@
+import asyncio, enum, functools, os, time
+
+LAG_INTERVAL = 0.5  # segundos entre medições
+
+# atraso (s) a partir do qual cada nível entra; LOOP_LAG_THRESHOLDS no .env muda
+DEFAULT_THRESHOLDS = (0.10, 0.25, 0.50, 1.00)
+RECOVER_SAMPLES = 10  # medições calmas seguidas pra descer um nível (~5 s)
+
+
+class Level(enum.IntEnum):
+    """Degradação sob carga: cada nível inclui os anteriores."""
+    NORMAL = 0
+    SKIP_FRAMES = 1    # duelo pula os quadros intermediários da animação
+    PLAIN_WELCOME = 2  # boas-vindas em texto simples, sem card
+    PAUSE_STATUS = 3   # cycle_status para de trocar o status
+    DEFER_CLEANUP = 4  # varredura, reposição do pool e limpeza de cache esperam
+
+
+class LoopMonitor:
+    """
+    Atraso do event loop: dorme `interval` e mede quanto acordou depois do
+    previsto. Callback síncrono pesado, JSON grande, disco no loop... tudo
+    aparece aqui antes de virar "interação falhou".
+
+    O atraso define o nível de degradação (`level`): sobe na hora em que
+    passa do limite e desce um nível por vez depois de RECOVER_SAMPLES
+    medições abaixo dele. Criar sala e mover membro nunca esperam nível;
+    o que é cosmético ou pode ficar pra depois consulta `level` ou
+    espera em `wait_below`.
+    """
+
+    def __init__(self, interval: float = LAG_INTERVAL, thresholds=DEFAULT_THRESHOLDS):
+        self.interval = interval
+        self.thresholds = tuple(thresholds)  # um por nível acima de NORMAL
+        self.lag = 0.0      # última medição (s)
+        self.max_lag = 0.0  # pior desde o início (s)
+        self.level = Level.NORMAL
+        self._calm = 0
+        self._relaxed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def wait_below(self, level: Level):
+        """Espera o nível cair abaixo de `level` (volta na hora se já está)."""
+        while self.level >= level:
+            await self._relaxed.wait()
+
+    async def _run(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self.sample(max(0.0, time.monotonic() - expected))
+
+    def sample(self, lag: float):
+        self.lag = lag
+        self.max_lag = max(self.max_lag, lag)
+
+        target = Level(sum(lag >= t for t in self.thresholds))
+        if target > self.level:
+            self._calm = 0
+            self._set(target)
+        elif target < self.level:
+            self._calm += 1
+            if self._calm >= RECOVER_SAMPLES:
+                self._calm = 0
+                self._set(Level(self.level - 1))
+        else:
+            self._calm = 0
+
+    def _set(self, level: Level):
+        previous, self.level = self.level, level
+        if level > previous:
+            print(f"🐢 [LOOP] Atraso de {self.lag * 1000:.0f}ms → degradação {level.name} ({level}).")
+        else:
+            print(f"✅ [LOOP] Carga aliviou → degradação {level.name} ({level}).")
+            # acorda quem esperava; um Event novo pros próximos
+            self._relaxed.set()
+            self._relaxed = asyncio.Event()
+
+
+def lag_thresholds() -> tuple[float, ...]:
+    """LOOP_LAG_THRESHOLDS="0.1,0.25,0.5,1" (segundos, um por nível, crescentes)."""
+    raw = os.getenv("LOOP_LAG_THRESHOLDS")
+    if not raw:
+        return DEFAULT_THRESHOLDS
+    try:
+        values = tuple(float(v) for v in raw.split(","))
+    except ValueError:
+        return DEFAULT_THRESHOLDS
+    if len(values) != len(DEFAULT_THRESHOLDS) or list(values) != sorted(values):
+        return DEFAULT_THRESHOLDS
+    return values
+
+
+@functools.cache
+def get_loop_monitor() -> LoopMonitor:
+    return LoopMonitor(thresholds=lag_thresholds())
@@ -0,0 +1,233 @@
+import asyncio, bisect, contextvars, functools, time
+
+import discord
+from discord import app_commands
+
+from utils.timer_wheel import get_timer_wheel
+
+# limites dos buckets em ms: de 1 ms a ~56 s, cada um 25% maior que o anterior
+BUCKETS = tuple(1.25 ** i for i in range(50))
+
+# comando/componente da interação sendo atendida nesta task (herdado pelas tasks filhas)
+current_label: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_label", default=None)
+
+
+class Histogram:
+    """Latências de um comando/componente em buckets fixos (memória constante)."""
+
+    __slots__ = ("buckets", "count", "errors", "rest_calls", "total", "max")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.rest_calls = 0  # chamadas enfileiradas na fila REST durante o handler
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, ms: float, failed: bool = False):
+        self.buckets[bisect.bisect_left(BUCKETS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        if failed:
+            self.errors += 1
+
+    def percentile(self, q: float) -> float:
+        """Limite superior do bucket onde cai o percentil `q` (0–100), em ms."""
+        if not self.count:
+            return 0.0
+
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+
+class Metrics:
+    """
+    Latência por comando (slash) e por componente (botão, select, modal).
+
+    A medição começa no interaction_check e termina quando a task que roda o
+    handler acaba, então conta o handler inteiro, inclusive o on_error.
+    """
+
+    def __init__(self):
+        self.histograms: dict[str, Histogram] = {}
+        self.started = time.time()
+
+    def histogram(self, label: str) -> Histogram:
+        hist = self.histograms.get(label)
+        if hist is None:
+            hist = self.histograms[label] = Histogram()
+        return hist
+
+    def start(self, interaction: discord.Interaction, label: str):
+        # uma medição por interação (ex.: view + dynamic item no mesmo clique)
+        if "metrics" in interaction.extras:
+            return
+
+        interaction.extras["metrics"] = [label, time.perf_counter(), False]
+        current_label.set(label)
+
+        task = asyncio.current_task()
+        if task is not None:
+            task.add_done_callback(lambda _: self._finish(interaction))
+
+    def fail(self, interaction: discord.Interaction):
+        entry = interaction.extras.get("metrics")
+        if entry is not None:
+            entry[2] = True
+
+    def _finish(self, interaction: discord.Interaction):
+        label, started, failed = interaction.extras["metrics"]
+        self.histogram(label).record((time.perf_counter() - started) * 1000, failed)
+
+    def count_rest(self):
+        label = current_label.get()
+        if label is not None:
+            self.histogram(label).rest_calls += 1
+
+    def top(self, limit: int = 20) -> list[tuple[str, Histogram]]:
+        """Os mais usados primeiro."""
+        items = sorted(self.histograms.items(), key=lambda kv: kv[1].count, reverse=True)
+        return items[:limit]
+
+
+@functools.cache
+def get_metrics() -> Metrics:
+    return Metrics()
+
+
+# =========================================================
+#   Ganchos (só API pública do discord.py: interaction_check,
+#   on_error, stop e on_timeout). Views/modals/itens do bot
+#   herdam daqui.
+# =========================================================
+class InstrumentedTree(app_commands.CommandTree):
+    """CommandTree que mede cada slash command ("/nome")."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.type is not discord.InteractionType.autocomplete:
+            command = interaction.command
+            name = command.qualified_name if command else interaction.data.get("name", "?")
+            get_metrics().start(interaction, f"/{name}")
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        get_metrics().fail(interaction)
+        await super().on_error(interaction, error)
+
+
+class _Timed:
+    """
+    Base dos ganchos de views/modals/itens: o interaction_check de cada
+    subclasse é embrulhado pra medir (`_measure`) antes de rodar. Quem
+    sobrescreve o check não precisa chamar super() pra ter métricas.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        check = cls.__dict__.get("interaction_check")
+        if check is not None and not hasattr(check, "__measured__"):
+            cls.interaction_check = _measured(check)
+
+
+def _measured(check):
+    @functools.wraps(check)
+    async def wrapper(self, interaction: discord.Interaction) -> bool:
+        self._measure(interaction)
+        return await check(self, interaction)
+
+    wrapper.__measured__ = True
+    return wrapper
+
+
+def _item_name(item) -> str:
+    # botão/select de decorator → nome do método; item próprio → nome da classe
+    func = getattr(getattr(item, "callback", None), "callback", None)
+    return getattr(func, "__name__", None) or type(item).__name__
+
+
+class _TimedViewMixin(_Timed):
+    """
+    Latência medida por componente ("View:componente") e timeout no timer
+    wheel compartilhado: o discord.py recebe timeout=None (nada de uma task
+    dormindo por view) e o prazo é renovado a cada interação, como no original.
+    """
+
+    def __init__(self, *, timeout: float | None = 180.0):
+        super().__init__(timeout=None)
+        self.expires_after = timeout
+        self._deadline = None
+        self._arm()
+
+    def _arm(self):
+        if self._deadline is not None:
+            self._deadline.cancel()
+        if self.expires_after:
+            self._deadline = get_timer_wheel().schedule(self.expires_after, self._expire)
+
+    def _expire(self):
+        self._deadline = None
+        if self.is_finished():
+            return None
+        self.stop()
+        return self.on_timeout()
+
+    def stop(self):
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
+        super().stop()
+
+    def _measure(self, interaction: discord.Interaction):
+        custom_id = (interaction.data or {}).get("custom_id")
+        item = next((i for i in self.walk_children() if getattr(i, "custom_id", None) == custom_id), None)
+        get_metrics().start(interaction, f"{type(self).__name__}:{_item_name(item)}")
+        if self._deadline is not None:
+            self._arm()
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: Exception, item):
+        get_metrics().fail(interaction)
+        await super().on_error(interaction, error, item)
+
+
+class TimedView(_TimedViewMixin, discord.ui.View):
+    """View com latência medida por componente e timeout no timer wheel."""
+
+
+class TimedLayoutView(_TimedViewMixin, discord.ui.LayoutView):
+    """LayoutView (components v2) com latência medida e timeout no timer wheel."""
+
+
+class TimedModal(_Timed, discord.ui.Modal):
+    """Modal com latência medida no envio ("NomeDoModal")."""
+
+    def _measure(self, interaction: discord.Interaction):
+        get_metrics().start(interaction, type(self).__name__)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: Exception):
+        get_metrics().fail(interaction)
+        await super().on_error(interaction, error)
+
+
+class TimedItem(_Timed):
+    """Mixin pra DynamicItem: mede o clique ("Item:ação")."""
+
+    def _measure(self, interaction: discord.Interaction):
+        action = getattr(self, "action", None)
+        label = type(self).__name__ + (f":{action}" if action else "")
+        get_metrics().start(interaction, label)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return True
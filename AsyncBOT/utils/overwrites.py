@@ -0,0 +1,90 @@
+import asyncio
+
+import discord
+
+from utils import rest_queue
+from utils.rest_queue import INTERACTIVE, get_rest_queue
+
+# permissões de convidado (mesmas que os set_permissions antigos davam)
+GUEST_VOICE = {"view_channel": True, "connect": True, "speak": True}
+GUEST_TEXT = {"view_channel": True, "send_messages": False, "read_message_history": True}
+
+
+def with_guests(channel: discord.abc.GuildChannel, guest_ids, perms: dict, *, keep=()) -> dict:
+    """
+    Overwrites do canal com os convidados aplicados, pra mandar num único edit.
+
+    Cargos e os membros em `keep` (dono, bot) ficam como estão; overwrite de
+    membro fora de `guest_ids` é de convidado que já foi removido e sai junto.
+    """
+    guild = channel.guild
+    overwrites = {
+        target: overwrite
+        for target, overwrite in channel.overwrites.items()
+        if isinstance(target, discord.Role) or target.id in keep
+    }
+
+    for uid in guest_ids:
+        target = guild.get_member(uid) or discord.Object(id=uid)
+        overwrites[target] = discord.PermissionOverwrite(**perms)
+    return overwrites
+
+
+async def grant_guests(
+    voice: discord.VoiceChannel,
+    text: discord.TextChannel | None,
+    invited: set[int],
+    members: list[discord.Member],
+    *,
+    keep=(),
+    priority: int = INTERACTIVE,
+) -> bool:
+    """
+    Libera a sala pra vários membros de uma vez: um edit de overwrites por
+    canal (voz e texto saem em paralelo) em vez de 2 set_permissions por membro.
+    `invited` só muda se o edit da voz passar. True se deu certo.
+    """
+    new_ids = {m.id for m in members}
+    keep = set(keep) | {voice.guild.me.id}
+    rest = get_rest_queue()
+
+    async def edit_voice():
+        # montado na hora do envio: um lote anterior na mesma rota já entrou no invited
+        await voice.edit(overwrites=with_guests(voice, invited | new_ids, GUEST_VOICE, keep=keep))
+        invited.update(new_ids)
+
+    calls = [rest.submit(rest_queue.edit_channel_route(voice.id), edit_voice, priority)]
+    if text is not None:
+        calls.append(
+            rest.submit(
+                rest_queue.edit_channel_route(text.id),
+                lambda: text.edit(overwrites=with_guests(text, invited | new_ids, GUEST_TEXT, keep=keep)),
+                priority,
+            )
+        )
+
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    return not isinstance(results[0], Exception)
+
+
+async def revoke_guests(
+    voice: discord.VoiceChannel,
+    invited: set[int],
+    member_ids,
+    *,
+    keep=(),
+    priority: int = INTERACTIVE,
+) -> bool:
+    """Tira vários convidados da sala num único edit de overwrites da voz."""
+    gone = set(member_ids)
+    keep = set(keep) | {voice.guild.me.id}
+
+    async def edit_voice():
+        await voice.edit(overwrites=with_guests(voice, invited - gone, GUEST_VOICE, keep=keep))
+        invited.difference_update(gone)
+
+    try:
+        await get_rest_queue().submit(rest_queue.edit_channel_route(voice.id), edit_voice, priority)
+    except discord.HTTPException:
+        return False
+    return True
@@ -0,0 +1,7 @@
+# Constantes dos painéis de sala (voice_factory e voicebuilder).
+
+# versão do painel gravada em RoomRecord.panel_version:
+# 1 = View por sala/sessão (antigo); 2 = componentes persistentes com o id no custom_id
+PANEL_VERSION = 2
+
+GUEST_MENU_TIMEOUT = 300  # menus efêmeros (convite, convidados)
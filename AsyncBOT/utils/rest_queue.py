@@ -0,0 +1,310 @@
+import asyncio, functools, heapq, itertools, time
+
+import discord
+
+from utils.metrics import get_metrics
+
+# prioridades (menor = sai primeiro)
+INTERACTIVE = 0  # mover o usuário, coisas que alguém está esperando
+NORMAL = 1       # criar canais, permissões, painéis
+CLEANUP = 2      # apagar salas vazias e afins
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", NORMAL: "normal", CLEANUP: "cleanup"}
+
+WORKERS = 4
+MAX_RETRIES = 4
+
+
+# =========================================================
+#   Rotas (mesmo agrupamento de buckets da API do Discord:
+#   método + caminho + parâmetro principal)
+# =========================================================
+def create_channel_route(guild_id: int) -> str:
+    return f"POST /guilds/{guild_id}/channels"
+
+
+def edit_channel_route(channel_id: int) -> str:
+    return f"PATCH /channels/{channel_id}"
+
+
+def delete_channel_route(channel_id: int) -> str:
+    return f"DELETE /channels/{channel_id}"
+
+
+def permissions_route(channel_id: int) -> str:
+    return f"PUT /channels/{channel_id}/permissions"
+
+
+def message_route(channel_id: int) -> str:
+    return f"POST /channels/{channel_id}/messages"
+
+
+def edit_message_route(channel_id: int) -> str:
+    return f"PATCH /channels/{channel_id}/messages"
+
+
+def member_route(guild_id: int, member_id: int | None = None) -> str:
+    # com member_id: ações em membros diferentes não esperam uma pela outra
+    if member_id is None:
+        return f"PATCH /guilds/{guild_id}/members"
+    return f"PATCH /guilds/{guild_id}/members/{member_id}"
+
+
+class _Bucket:
+    __slots__ = ("route", "waiting", "busy", "offered", "timer")
+
+    def __init__(self, route):
+        self.route = route
+        self.waiting: list = []    # heap (prioridade, seq, job) das chamadas dessa rota
+        self.busy = False          # um worker está com a chamada da vez
+        self.offered = None        # seq da cabeça já oferecida aos workers
+        self.timer: asyncio.TimerHandle | None = None  # rota pausada (429) até disparar
+
+
+class _Job:
+    __slots__ = ("route", "factory", "priority", "seq", "future", "queued_at", "attempt")
+
+    def __init__(self, route, factory, priority, seq, future):
+        self.route = route
+        self.factory = factory
+        self.priority = priority
+        self.seq = seq
+        self.future = future
+        self.queued_at = time.monotonic()
+        self.attempt = 0
+
+
+class RestScheduler:
+    """
+    Fila central das chamadas REST das salas de voz.
+
+    - um bucket por rota: chamadas da mesma rota esperam na fila dela e
+      saem uma de cada vez, por prioridade;
+    - os workers só recebem rotas prontas (livres e não pausadas), em
+      ordem de prioridade: rota ocupada ou pausada não segura worker, e
+      interações (mover usuário) passam na frente de limpeza;
+    - 429 e 5xx o discord.py já espera e repete sozinho; só RateLimited
+      (espera maior que max_ratelimit_timeout) volta pra fila, com a rota
+      pausada pelo retry_after;
+    - expõe profundidade da fila e tempos de espera (snapshot()).
+    """
+
+    def __init__(self, workers=WORKERS, max_retries=MAX_RETRIES):
+        self.workers = workers
+        self.max_retries = max_retries
+
+        self._ready: asyncio.PriorityQueue | None = None  # (prioridade, seq, bucket) da cabeça
+        self._seq = itertools.count()
+        self._tasks: list[asyncio.Task] = []
+        self._buckets: dict[str, _Bucket] = {}
+        self._pending = 0
+
+        # métricas
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.wait_total = {p: 0.0 for p in PRIORITY_NAMES}
+        self.wait_max = {p: 0.0 for p in PRIORITY_NAMES}
+        self.wait_count = {p: 0 for p in PRIORITY_NAMES}
+
+    # ------------------------
+    # API
+    # ------------------------
+    def submit_nowait(self, route: str, factory, priority: int = NORMAL) -> asyncio.Future:
+        """Enfileira `factory()` (que devolve a coroutine da chamada REST)."""
+        self._ensure_started()
+        get_metrics().count_rest()  # atribui a chamada ao comando/componente em andamento
+        future = asyncio.get_running_loop().create_future()
+        job = _Job(route, factory, priority, next(self._seq), future)
+
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            bucket = self._buckets[route] = _Bucket(route)
+        heapq.heappush(bucket.waiting, (priority, job.seq, job))
+        self._pending += 1
+        self._offer(bucket)
+        return future
+
+    async def submit(self, route: str, factory, priority: int = NORMAL):
+        """Enfileira e espera o resultado (exceções são repassadas)."""
+        return await self.submit_nowait(route, factory, priority)
+
+    @property
+    def depth(self) -> int:
+        return self._pending
+
+    def snapshot(self) -> dict:
+        waits = {}
+        for p, name in PRIORITY_NAMES.items():
+            count = self.wait_count[p]
+            waits[name] = {
+                "count": count,
+                "avg_ms": round(self.wait_total[p] / count * 1000, 1) if count else 0.0,
+                "max_ms": round(self.wait_max[p] * 1000, 1),
+            }
+        return {
+            "depth": self.depth,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "wait": waits,
+        }
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._ready = None
+
+        # quem ainda estava na fila não vai ser atendido
+        buckets, self._buckets = list(self._buckets.values()), {}
+        for bucket in buckets:
+            if bucket.timer is not None:
+                bucket.timer.cancel()
+            for _, _, job in bucket.waiting:
+                if not job.future.done():
+                    job.future.cancel()
+            bucket.waiting.clear()
+        self._pending = 0
+
+    # ------------------------
+    # Buckets
+    # ------------------------
+    def _ensure_started(self):
+        if self._ready is None:
+            self._ready = asyncio.PriorityQueue()
+        if not self._tasks:
+            loop = asyncio.get_running_loop()
+            self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    def _offer(self, bucket: _Bucket):
+        """Põe a rota na fila dos workers se ela pode sair agora."""
+        if bucket.busy or not bucket.waiting or bucket.timer is not None:
+            return
+        priority, seq, _ = bucket.waiting[0]
+        if bucket.offered == seq:
+            return  # já está na fila com essa cabeça
+        bucket.offered = seq
+        self._ready.put_nowait((priority, seq, bucket))
+
+    def _take(self, bucket: _Bucket, seq: int) -> _Job | None:
+        """Tira a cabeça da rota pro worker, ou None se a entrada ficou velha."""
+        if (
+            self._buckets.get(bucket.route) is not bucket
+            or bucket.busy
+            or bucket.timer is not None
+            or not bucket.waiting
+            or bucket.waiting[0][1] != seq
+        ):
+            return None  # rota ocupada/pausada, ou outra chamada passou na frente
+
+        _, _, job = heapq.heappop(bucket.waiting)
+        self._pending -= 1
+        bucket.offered = None
+        if job.future.done():  # quem pediu desistiu (cancelou)
+            self._release(bucket)
+            return None
+        bucket.busy = True
+        return job
+
+    def _release(self, bucket: _Bucket):
+        """Rota livre: oferece a próxima chamada ou esquece o bucket."""
+        if bucket.waiting:
+            self._offer(bucket)
+        elif not bucket.busy and bucket.timer is None and self._buckets.get(bucket.route) is bucket:
+            del self._buckets[bucket.route]
+
+    def _pause(self, bucket: _Bucket, delay: float):
+        if bucket.timer is not None:
+            bucket.timer.cancel()
+        bucket.timer = asyncio.get_running_loop().call_later(delay, self._resume, bucket)
+
+    def _resume(self, bucket: _Bucket):
+        bucket.timer = None
+        self._release(bucket)
+
+    # ------------------------
+    # Workers
+    # ------------------------
+    async def _worker(self):
+        while True:
+            _, seq, bucket = await self._ready.get()
+            job = self._take(bucket, seq)
+            if job is None:
+                continue
+            try:
+                await self._run(bucket, job)
+            finally:
+                bucket.busy = False
+                self._release(bucket)
+
+    async def _run(self, bucket: _Bucket, job: _Job):
+        if job.attempt == 0:
+            waited = time.monotonic() - job.queued_at
+            self.wait_total[job.priority] += waited
+            self.wait_count[job.priority] += 1
+            self.wait_max[job.priority] = max(self.wait_max[job.priority], waited)
+
+        self.in_flight += 1
+        try:
+            result = await job.factory()
+        except Exception as e:
+            retry_after = self._retry_after(e)
+            if retry_after is None or job.attempt >= self.max_retries:
+                self.failed += 1
+                if not isinstance(e, discord.NotFound):
+                    print(f"⚠️ [REST] {job.route} falhou: {e}")
+                if not job.future.done():
+                    job.future.set_exception(e)
+                return
+
+            # volta pra cabeça da rota (mesmo seq) e a rota pausa; o worker fica livre
+            job.attempt += 1
+            self.retries += 1
+            heapq.heappush(bucket.waiting, (job.priority, job.seq, job))
+            self._pending += 1
+            self._pause(bucket, retry_after)
+            return
+        finally:
+            self.in_flight -= 1
+
+        self.completed += 1
+        if not job.future.done():
+            job.future.set_result(result)
+
+    def _retry_after(self, error: Exception):
+        """Segundos de pausa da rota antes de repetir, ou None se o erro não deve ser repetido."""
+        if isinstance(error, discord.RateLimited):
+            # o discord.py desistiu de esperar (maior que max_ratelimit_timeout)
+            self.rate_limited += 1
+            return error.retry_after
+
+        if isinstance(error, discord.HTTPException) and error.status == 429:
+            # o discord.py já esperou e repetiu; repetir aqui só somaria esperas
+            self.rate_limited += 1
+        return None
+
+
+@functools.cache
+def get_rest_queue() -> RestScheduler:
+    return RestScheduler()
+
+
+async def delete_channel(channel, *, priority: int = CLEANUP, reason: str | None = None) -> bool:
+    """Apaga um canal pela fila. True se apagou ou se ele já não existia."""
+    try:
+        await get_rest_queue().submit(
+            delete_channel_route(channel.id),
+            lambda: channel.delete(reason=reason),
+            priority,
+        )
+    except discord.NotFound:
+        return True
+    except discord.HTTPException:
+        return False
+    return True
@@ -0,0 +1,247 @@
+import asyncio, functools
+
+import discord
+
+from utils import rest_queue
+from utils.loop_monitor import Level, get_loop_monitor
+from utils.rest_queue import CLEANUP, delete_channel, get_rest_queue
+from utils.tasks import TaskSet
+from utils.voice_store import get_voice_store
+
+POOL_NAME = "⏳ sala livre"
+MAX_POOL_SIZE = 10
+
+# reciclagem de temporárias vazias (padrão; por canal-base em voice_base_configs)
+DEFAULT_RECYCLE_MAX = 0     # "recycle_max": salas vazias guardadas por canal-base (0 = apaga, como antes)
+DEFAULT_RECYCLE_TTL = 600   # "recycle_ttl": segundos parada antes de ser apagada
+MAX_RECYCLE_TTL = 3600
+
+
+def hidden_overwrites(guild: discord.Guild) -> dict:
+    """Sala do pool: invisível pra todo mundo, menos pro bot."""
+    return {
+        guild.default_role: discord.PermissionOverwrite(view_channel=False, connect=False),
+        guild.me: discord.PermissionOverwrite(
+            view_channel=True,
+            connect=True,
+            speak=True,
+            move_members=True,
+        ),
+    }
+
+
+class RoomPool:
+    """
+    Salas de voz pré-criadas (ocultas) por canal-base padrão.
+
+    Quem entra no canal-base recebe uma sala já existente: o bot só
+    renomeia/libera e move o membro, sem esperar um create_voice_channel.
+    O pool é reposto em segundo plano, com prioridade de limpeza na fila REST.
+    Tamanho por canal-base: chave "pool_size" em voice_base_configs (0 = desligado).
+
+    Com "recycle_max" (ou pool_size) no canal-base, temporárias que esvaziam
+    também voltam pro pool (recycle): são ocultadas e ficam paradas até o
+    próximo membro, em vez de apagar e recriar.
+    O que passar do pool_size é apagado depois de "recycle_ttl" segundos.
+    """
+
+    def __init__(self, store, rest):
+        self.store = store
+        self.rest = rest
+        self._refilling: set[int] = set()  # canais-base com reposição em andamento
+        self._tasks = TaskSet()
+        self._origin: dict[int, int] = {}  # temporária → canal-base de onde saiu
+        self._expiry: dict[int, asyncio.TimerHandle] = {}  # sala parada → timer do TTL
+
+    @staticmethod
+    def _cfg_int(cfg: dict, key: str, default: int, limit: int) -> int:
+        try:
+            return max(0, min(int(cfg.get(key, default) or 0), limit))
+        except (TypeError, ValueError):
+            return default
+
+    def size_for(self, cfg: dict) -> int:
+        return self._cfg_int(cfg, "pool_size", 0, MAX_POOL_SIZE)
+
+    def recycle_max(self, cfg: dict) -> int:
+        return self._cfg_int(cfg, "recycle_max", DEFAULT_RECYCLE_MAX, MAX_POOL_SIZE)
+
+    def recycle_ttl(self, cfg: dict) -> int:
+        return self._cfg_int(cfg, "recycle_ttl", DEFAULT_RECYCLE_TTL, MAX_RECYCLE_TTL)
+
+    def take(self, guild: discord.Guild, base_id: int) -> discord.VoiceChannel | None:
+        """Tira uma sala livre do pool (ou None se estiver vazio)."""
+        state = self.store.cached(guild.id)
+        parked = state.pool.get(base_id) if state else None
+
+        while parked:
+            channel_id = parked[-1]
+            self.store.remove_pooled(guild, channel_id)
+            self._disarm(channel_id)
+
+            channel = guild.get_channel(channel_id)
+            if isinstance(channel, discord.VoiceChannel):
+                if not channel.members:
+                    return channel
+                # ocupada por alguém → vira temporária: quando esvaziar, sai pela carência
+                self.store.add_temporary(guild, channel_id)
+                self.track(channel_id, base_id)
+
+            # apagada na mão ou ocupada → tenta a próxima
+            parked = state.pool.get(base_id)
+
+        return None
+
+    def refill(self, guild: discord.Guild, base: discord.VoiceChannel, cfg: dict):
+        """Agenda a reposição do pool do canal-base (não bloqueia)."""
+        size = self.size_for(cfg)
+
+        # salas paradas além do alvo sem timer (ex.: depois de reiniciar) → TTL
+        state = self.store.cached(guild.id)
+        parked = state.pool.get(base.id, ()) if state else ()
+        for channel_id in parked[:max(0, len(parked) - size)]:
+            if channel_id not in self._expiry:
+                self._arm(guild, base.id, channel_id, self.recycle_ttl(cfg))
+
+        if size <= 0 or base.id in self._refilling:
+            return
+
+        self._refilling.add(base.id)
+        self._tasks.spawn(self._refill(guild, base, cfg, size))
+
+    async def _refill(self, guild, base, cfg, size):
+        try:
+            state = self.store.cached(guild.id)
+            category = guild.get_channel(cfg.get("category")) or base.category
+
+            while base.id in state.bases and len(state.pool.get(base.id, ())) < size:
+                # reposição não é urgente: sob carga espera o loop aliviar e reavalia
+                if get_loop_monitor().level >= Level.DEFER_CLEANUP:
+                    await get_loop_monitor().wait_below(Level.DEFER_CLEANUP)
+                    continue
+                try:
+                    channel = await self.rest.submit(
+                        rest_queue.create_channel_route(guild.id),
+                        lambda: guild.create_voice_channel(
+                            name=POOL_NAME,
+                            category=category,
+                            overwrites=hidden_overwrites(guild),
+                        ),
+                        CLEANUP,
+                    )
+                except discord.HTTPException:
+                    return
+
+                self.store.add_pooled(guild, base.id, channel.id)
+        finally:
+            self._refilling.discard(base.id)
+
+    def drain(self, guild: discord.Guild, base_id: int):
+        """Descarta as salas ocultas de um canal-base removido (apaga em segundo plano)."""
+        state = self.store.cached(guild.id)
+        if state is None:
+            return
+
+        for channel_id in list(state.pool.get(base_id, ())):
+            self.store.remove_pooled(guild, channel_id)
+            self._disarm(channel_id)
+            channel = guild.get_channel(channel_id)
+            if channel is not None:
+                self._tasks.spawn(delete_channel(channel))
+
+    def reconcile(self, guild: discord.Guild) -> int:
+        """Esquece salas do pool que não existem mais (apagadas com o bot fora). Devolve quantas."""
+        state = self.store.cached(guild.id)
+        if state is None:
+            return 0
+
+        missing = [cid for cid in state.pooled if guild.get_channel(cid) is None]
+        for channel_id in missing:
+            self.store.remove_pooled(guild, channel_id)
+            self._disarm(channel_id)
+        return len(missing)
+
+    # ------------------------
+    # Reciclagem
+    # ------------------------
+    def track(self, channel_id: int, base_id: int):
+        """Guarda de qual canal-base saiu a temporária (pra reciclar depois)."""
+        self._origin[channel_id] = base_id
+
+    def untrack(self, channel_id: int):
+        self._origin.pop(channel_id, None)
+
+    def origin(self, channel_id: int) -> int | None:
+        return self._origin.get(channel_id)
+
+    async def recycle(self, guild: discord.Guild, channel: discord.VoiceChannel) -> bool:
+        """
+        Oculta e estaciona uma temporária vazia no pool do canal-base.
+        False → não deu pra reciclar (sem origem, pool cheio, erro); quem chamou apaga.
+        """
+        base_id = self._origin.pop(channel.id, None)
+        state = self.store.cached(guild.id)
+        cfg = state.bases.get(base_id) if state and base_id else None
+        if not cfg:
+            return False
+
+        limit = max(self.recycle_max(cfg), self.size_for(cfg))
+        if limit <= 0 or len(state.pool.get(base_id, ())) >= limit:
+            return False
+
+        # o nome fica como está enquanto oculta: o Discord só aceita 2
+        # renomeações por canal a cada 10 min, e quem pegar a sala renomeia
+        try:
+            await self.rest.submit(
+                rest_queue.edit_channel_route(channel.id),
+                lambda: channel.edit(user_limit=0, overwrites=hidden_overwrites(guild)),
+                CLEANUP,
+            )
+        except discord.HTTPException:
+            return False
+
+        # alguém entrou enquanto a sala era ocultada → não dá pra estacionar
+        if channel.members or base_id not in state.bases:
+            return False
+
+        self.store.add_pooled(guild, base_id, channel.id)
+        self._arm(guild, base_id, channel.id, self.recycle_ttl(cfg))
+        return True
+
+    def _arm(self, guild, base_id, channel_id, ttl):
+        self._disarm(channel_id)
+        loop = asyncio.get_running_loop()
+        self._expiry[channel_id] = loop.call_later(ttl, self._expire, guild, base_id, channel_id)
+
+    def _disarm(self, channel_id):
+        handle = self._expiry.pop(channel_id, None)
+        if handle is not None:
+            handle.cancel()
+
+    def _expire(self, guild, base_id, channel_id):
+        self._expiry.pop(channel_id, None)
+        state = self.store.cached(guild.id)
+        if state is None or state.pooled.get(channel_id) != base_id:
+            return
+
+        # dentro do alvo do pool pré-criado → continua guardada
+        cfg = state.bases.get(base_id)
+        if cfg and len(state.pool.get(base_id, ())) <= self.size_for(cfg):
+            return
+
+        self.store.remove_pooled(guild, channel_id)
+        channel = guild.get_channel(channel_id)
+        if channel is not None:
+            self._tasks.spawn(delete_channel(channel))
+
+    async def close(self):
+        for handle in self._expiry.values():
+            handle.cancel()
+        self._expiry.clear()
+
+        await self._tasks.cancel_all()
+
+
+@functools.cache
+def get_room_pool() -> RoomPool:
+    return RoomPool(get_voice_store(), get_rest_queue())
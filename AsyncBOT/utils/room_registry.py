@@ -0,0 +1,148 @@
+_UNSET = object()
+
+
+class RoomRecord:
+    """
+    Base das salas controladas pelo bot (sala privada, sessão custom).
+
+    Com __slots__ cada registro ocupa só os campos abaixo, sem __dict__.
+    guild_id/owner_id/voice_id/text_id são chaves do RoomRegistry: depois
+    de registrado, voz/texto só mudam via RoomRegistry.rebind.
+    """
+
+    __slots__ = ("guild_id", "owner_id", "voice_id", "text_id", "invited", "panel_id", "panel_version")
+
+    def __init__(self, guild_id: int, owner_id: int, voice_id: int | None, text_id: int | None):
+        self.guild_id = guild_id
+        self.owner_id = owner_id
+        self.voice_id = voice_id
+        self.text_id = text_id
+
+        self.invited: set[int] = set()  # convidados (IDs)
+        # mensagem do painel (pra religar a view depois de restart/reload)
+        self.panel_id: int | None = None
+        self.panel_version: int = 1
+
+    def __repr__(self):
+        return (
+            f"<{type(self).__name__} guild={self.guild_id} owner={self.owner_id} "
+            f"voice={self.voice_id} text={self.text_id}>"
+        )
+
+
+class RoomRegistry:
+    """
+    Salas ativas com índices por servidor, dono, canal de voz e canal de texto.
+
+    Todos os índices são atualizados no add/remove/rebind, então qualquer
+    busca é O(1) e listar as salas de um servidor não varre as dos outros.
+    Um dono pode ter mais de uma sala no mesmo servidor.
+    """
+
+    def __init__(self):
+        self._by_voice: dict[int, RoomRecord] = {}
+        self._by_text: dict[int, RoomRecord] = {}
+        self._by_owner: dict[tuple[int, int], dict[RoomRecord, None]] = {}  # (guild, dono) → salas em ordem
+        self._by_guild: dict[int, dict[RoomRecord, None]] = {}
+
+    def __len__(self):
+        return sum(len(rooms) for rooms in self._by_guild.values())
+
+    def __iter__(self):
+        for rooms in list(self._by_guild.values()):
+            yield from list(rooms)
+
+    def __contains__(self, record: RoomRecord):
+        return record in self._by_guild.get(record.guild_id, ())
+
+    # ------------------------
+    # Escrita
+    # ------------------------
+    def add(self, record: RoomRecord):
+        """Registra a sala (se os canais já eram de outro registro, ele é substituído)."""
+        for old in {self._by_voice.get(record.voice_id), self._by_text.get(record.text_id)}:
+            if old is not None and old is not record:
+                self.remove(old)
+
+        self._by_guild.setdefault(record.guild_id, {})[record] = None
+        self._by_owner.setdefault((record.guild_id, record.owner_id), {})[record] = None
+        if record.voice_id:
+            self._by_voice[record.voice_id] = record
+        if record.text_id:
+            self._by_text[record.text_id] = record
+
+    def remove(self, record: RoomRecord) -> bool:
+        """Tira a sala de todos os índices. False se ela não estava registrada."""
+        rooms = self._by_guild.get(record.guild_id)
+        if rooms is None or record not in rooms:
+            return False
+
+        del rooms[record]
+        if not rooms:
+            del self._by_guild[record.guild_id]
+
+        key = (record.guild_id, record.owner_id)
+        owned = self._by_owner.get(key)
+        if owned is not None:
+            owned.pop(record, None)
+            if not owned:
+                del self._by_owner[key]
+
+        if self._by_voice.get(record.voice_id) is record:
+            del self._by_voice[record.voice_id]
+        if self._by_text.get(record.text_id) is record:
+            del self._by_text[record.text_id]
+        return True
+
+    def rebind(self, record: RoomRecord, *, voice_id=_UNSET, text_id=_UNSET):
+        """Troca o canal de voz e/ou de texto da sala, mantendo os índices certos."""
+        registered = record in self
+
+        if voice_id is not _UNSET:
+            if registered and self._by_voice.get(record.voice_id) is record:
+                del self._by_voice[record.voice_id]
+            record.voice_id = voice_id
+            if registered and voice_id:
+                self._by_voice[voice_id] = record
+
+        if text_id is not _UNSET:
+            if registered and self._by_text.get(record.text_id) is record:
+                del self._by_text[record.text_id]
+            record.text_id = text_id
+            if registered and text_id:
+                self._by_text[text_id] = record
+
+    # ------------------------
+    # Consulta
+    # ------------------------
+    def by_voice(self, voice_id: int | None) -> RoomRecord | None:
+        return self._by_voice.get(voice_id)
+
+    def by_text(self, text_id: int | None) -> RoomRecord | None:
+        return self._by_text.get(text_id)
+
+    def by_channel(self, channel_id: int | None) -> RoomRecord | None:
+        """Sala dona do canal, seja ele a voz ou o texto."""
+        return self._by_voice.get(channel_id) or self._by_text.get(channel_id)
+
+    def by_owner(self, guild_id: int, owner_id: int) -> RoomRecord | None:
+        """Sala mais recente do membro no servidor."""
+        owned = self._by_owner.get((guild_id, owner_id))
+        return next(reversed(owned)) if owned else None
+
+    def owned_by(self, guild_id: int, owner_id: int) -> list[RoomRecord]:
+        return list(self._by_owner.get((guild_id, owner_id), ()))
+
+    def in_guild(self, guild_id: int) -> list[RoomRecord]:
+        """Salas do servidor (cópia: dá pra remover enquanto percorre)."""
+        return list(self._by_guild.get(guild_id, ()))
+
+    def count(self, guild_id: int) -> int:
+        return len(self._by_guild.get(guild_id, ()))
+
+    def drop_guild(self, guild_id: int) -> list[RoomRecord]:
+        """Esquece todas as salas de um servidor (ex.: bot saiu dele). Devolve as removidas."""
+        rooms = self.in_guild(guild_id)
+        for record in rooms:
+            self.remove(record)
+        return rooms
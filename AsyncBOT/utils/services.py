@@ -0,0 +1,137 @@
+import asyncio, functools, time
+
+from utils.loop_monitor import get_loop_monitor
+
+BACKOFF_MIN = 1.0    # espera depois da primeira falha seguida (s)...
+BACKOFF_MAX = 300.0  # ...dobra a cada falha até aqui
+
+
+class Service:
+    """Um serviço de fundo: `func` roda uma volta, o supervisor repete."""
+
+    __slots__ = (
+        "name", "func", "interval", "owner", "level", "task", "started",
+        "iterations", "failures", "streak", "last_ms", "total_ms", "max_ms", "last_error",
+    )
+
+    def __init__(self, name, func, interval, owner, level):
+        self.name = name
+        self.func = func          # coroutine function sem argumentos
+        self.interval = interval  # segundos entre o fim de uma volta e o início da próxima
+        self.owner = owner        # cog (ou objeto) dona do serviço; None = o próprio bot
+        self.level = level        # nível de degradação em que o serviço pausa (None = nunca)
+        self.task: asyncio.Task | None = None
+        self.started = time.time()
+
+        # métricas
+        self.iterations = 0
+        self.failures = 0
+        self.streak = 0           # falhas seguidas (define o backoff)
+        self.last_ms = 0.0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_error: str | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    @property
+    def uptime(self) -> float:
+        return time.time() - self.started
+
+    @property
+    def average_ms(self) -> float:
+        return self.total_ms / self.iterations if self.iterations else 0.0
+
+    def backoff(self) -> float:
+        return min(BACKOFF_MAX, BACKOFF_MIN * 2 ** (self.streak - 1))
+
+
+class ServiceSupervisor:
+    """
+    Serviços de fundo com nome, registrados uma vez só.
+
+    Registrar de novo um nome que já roda com o mesmo dono não faz nada
+    (ex.: on_ready repetido a cada reconexão); com outro dono (cog
+    recarregada) o antigo é cancelado e o novo assume. Uma volta que
+    levanta exceção é repetida depois de um backoff exponencial.
+    Cogs cancelam os seus no cog_unload com `stop_owner`.
+    """
+
+    def __init__(self):
+        self.services: dict[str, Service] = {}
+
+    def register(self, name: str, func, *, interval: float, owner=None, bot=None, level=None) -> Service:
+        """
+        Inicia `func` a cada `interval` segundos. Com `bot`, a primeira volta
+        espera o bot ficar pronto; com `level`, cada volta espera o loop sair
+        desse nível de degradação (utils.loop_monitor.Level).
+        """
+        service = self.services.get(name)
+        if service is not None and service.running and service.owner is owner:
+            return service
+        if service is not None:
+            self._cancel(service)
+
+        service = Service(name, func, interval, owner, level)
+        service.task = asyncio.create_task(self._run(service, bot), name=f"service:{name}")
+        self.services[name] = service
+        return service
+
+    async def stop(self, name: str):
+        service = self.services.pop(name, None)
+        if service is not None:
+            await self._wait(self._cancel(service))
+
+    async def stop_owner(self, owner):
+        names = [name for name, s in self.services.items() if s.owner is owner]
+        await self._wait(*(self._cancel(self.services.pop(name)) for name in names))
+
+    async def close(self):
+        services, self.services = list(self.services.values()), {}
+        await self._wait(*(self._cancel(s) for s in services))
+
+    @staticmethod
+    def _cancel(service: Service) -> asyncio.Task | None:
+        if service.task is not None:
+            service.task.cancel()
+        return service.task
+
+    @staticmethod
+    async def _wait(*tasks):
+        await asyncio.gather(*(t for t in tasks if t is not None), return_exceptions=True)
+
+    async def _run(self, service: Service, bot):
+        if bot is not None:
+            await bot.wait_until_ready()
+
+        while True:
+            if service.level is not None:
+                await get_loop_monitor().wait_below(service.level)
+
+            started = time.perf_counter()
+            try:
+                await service.func()
+            except Exception as e:
+                service.failures += 1
+                service.streak += 1
+                service.last_error = f"{type(e).__name__}: {e}"
+                delay = service.backoff()
+                print(f"❌ [SERVICE] {service.name} falhou ({service.last_error}); de novo em {delay:.0f}s.")
+                await asyncio.sleep(delay)
+                continue
+
+            elapsed = (time.perf_counter() - started) * 1000
+            service.iterations += 1
+            service.streak = 0
+            service.last_ms = elapsed
+            service.total_ms += elapsed
+            service.max_ms = max(service.max_ms, elapsed)
+
+            await asyncio.sleep(service.interval)
+
+
+@functools.cache
+def get_services() -> ServiceSupervisor:
+    return ServiceSupervisor()
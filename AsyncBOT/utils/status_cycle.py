@@ -1,16 +1,14 @@
-import asyncio
 import discord
 from .phrase_builder import gerar_frase_status
 
-async def cycle_status(bot):
-    await bot.wait_until_ready()
+STATUS_INTERVAL = 35  # tempo entre trocas
 
-    while not bot.is_closed():
-        frase = gerar_frase_status()
-        await bot.change_presence(
-            activity=discord.Activity(
-                type=discord.ActivityType.watching,
-                name=frase
-            )
+async def cycle_status(bot):
+    """Uma troca de status; o serviço "status" (utils.services) repete."""
+    frase = gerar_frase_status()
+    await bot.change_presence(
+        activity=discord.Activity(
+            type=discord.ActivityType.watching,
+            name=frase
         )
-        await asyncio.sleep(35)  # tempo entre trocas
+    )
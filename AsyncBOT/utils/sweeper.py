@@ -0,0 +1,122 @@
+import os, time
+from collections import deque
+
+from utils.loop_monitor import Level
+from utils.services import get_services
+
+SERVICE_NAME = "voice-sweeper"
+
+SWEEP_INTERVAL = 60.0  # segundos entre passadas; VOICE_SWEEP_SECONDS no .env muda
+SWEEP_BATCH = 25       # temporárias verificadas por passada
+EMPTY_TTL = 300.0      # vazia há mais que isso, sem exclusão pendente → apaga
+
+
+class TempSweeper:
+    """
+    Varredura periódica das temporárias registradas no store.
+
+    Pega o que escapou dos eventos de voz: delete que falhou, canal apagado
+    na mão, sala que ficou vazia sem ninguém "sair" dela. Cada passada olha
+    só SWEEP_BATCH salas e continua de onde parou na próxima, então o custo
+    por passada não cresce com o número de salas.
+
+    - canal que não existe mais → `cleanup` (tira do store);
+    - vazia há mais de EMPTY_TTL e sem exclusão pendente → `cleanup` (recicla ou apaga).
+    """
+
+    def __init__(self, store, teardown, cleanup, *, interval=SWEEP_INTERVAL, batch=SWEEP_BATCH, empty_ttl=EMPTY_TTL):
+        self.store = store
+        self.teardown = teardown
+        self.cleanup = cleanup  # async (guild, channel_id): apaga/esquece a temporária
+        self.interval = interval
+        self.batch = batch
+        self.empty_ttl = empty_ttl
+
+        self._queue: deque[tuple[int, int]] = deque()  # (guild_id, channel_id) ainda não vistos nesta volta
+        self._empty_since: dict[int, float] = {}
+
+        # métricas
+        self.sweeps = 0
+        self.dropped = 0
+        self.deleted = 0
+
+    def start(self, bot):
+        # sob carga a varredura espera; nada aqui é urgente
+        get_services().register(
+            SERVICE_NAME,
+            lambda: self.sweep(bot),
+            interval=self.interval,
+            owner=self,
+            bot=bot,
+            level=Level.DEFER_CLEANUP,
+        )
+
+    async def stop(self):
+        await get_services().stop_owner(self)
+
+    def _refill(self, bot):
+        for guild in bot.guilds:
+            state = self.store.cached(guild.id)
+            if state is not None:
+                self._queue.extend((guild.id, cid) for cid in state.temporary)
+
+        # timers de sala que não está mais na lista
+        tracked = {cid for _, cid in self._queue}
+        for channel_id in [cid for cid in self._empty_since if cid not in tracked]:
+            del self._empty_since[channel_id]
+
+    async def sweep(self, bot) -> tuple[int, int]:
+        """Uma passada (até `batch` salas). Devolve (registros descartados, salas removidas)."""
+        if not self._queue:
+            self._refill(bot)
+
+        dropped = deleted = 0
+        now = time.monotonic()
+
+        for _ in range(min(self.batch, len(self._queue))):
+            guild_id, channel_id = self._queue.popleft()
+            guild = bot.get_guild(guild_id)
+            state = self.store.cached(guild_id)
+
+            # já saiu da lista, ou a carência do teardown cuida dela
+            if guild is None or state is None or channel_id not in state.temporary:
+                self._empty_since.pop(channel_id, None)
+                continue
+            if self.teardown.pending(channel_id):
+                continue
+
+            channel = guild.get_channel(channel_id)
+            if channel is None:
+                await self.cleanup(guild, channel_id)
+                self._empty_since.pop(channel_id, None)
+                dropped += channel_id not in state.temporary
+                continue
+
+            if channel.members:
+                self._empty_since.pop(channel_id, None)
+                continue
+
+            # primeira vez vazia: só marca (ex.: sala recém-criada, membro sendo movido)
+            since = self._empty_since.setdefault(channel_id, now)
+            if now - since >= self.empty_ttl:
+                await self.cleanup(guild, channel_id)
+                if channel_id not in state.temporary:  # delete que falhou tenta de novo na próxima volta
+                    self._empty_since.pop(channel_id, None)
+                    deleted += 1
+
+        self.sweeps += 1
+        self.dropped += dropped
+        self.deleted += deleted
+        if dropped or deleted:
+            print(
+                f"🧹 [VOICE] Varredura: {dropped} registro(s) órfão(s) descartado(s), "
+                f"{deleted} sala(s) vazia(s) removida(s)."
+            )
+        return dropped, deleted
+
+
+def sweep_interval() -> float:
+    try:
+        return max(5.0, float(os.getenv("VOICE_SWEEP_SECONDS", SWEEP_INTERVAL)))
+    except ValueError:
+        return SWEEP_INTERVAL
@@ -0,0 +1,36 @@
+import asyncio
+
+
+class TaskSet:
+    """
+    Tasks soltas de um dono (cog, pool, timer...). O asyncio só guarda
+    referência fraca das tasks: aqui elas ficam vivas até terminar, e o
+    `close()` do dono cancela o que sobrou.
+    """
+
+    __slots__ = ("_tasks", "_on_error")
+
+    def __init__(self, on_error=None):
+        self._tasks: set[asyncio.Future] = set()
+        # on_error(exc): chamado quando uma task termina com exceção (None = ninguém olha)
+        self._on_error = on_error
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def spawn(self, aw) -> asyncio.Future:
+        task = asyncio.ensure_future(aw)
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+        return task
+
+    def _done(self, task: asyncio.Future):
+        self._tasks.discard(task)
+        if self._on_error is not None and not task.cancelled() and task.exception() is not None:
+            self._on_error(task.exception())
+
+    async def cancel_all(self):
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
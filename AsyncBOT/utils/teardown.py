@@ -0,0 +1,96 @@
+import asyncio, functools, os
+
+from utils.tasks import TaskSet
+
+DEFAULT_GRACE = 15.0  # segundos; VOICE_GRACE_SECONDS no .env muda o padrão
+MAX_GRACE = 300.0
+
+
+class DeferredTeardown:
+    """
+    Exclusão adiada de salas vazias.
+
+    Quando a sala esvazia ela fica "pendente" pelo período de carência;
+    se alguém voltar antes disso, a exclusão é cancelada. Absorve quem
+    cai e reconecta em poucos segundos sem apagar e recriar a sala.
+    """
+
+    def __init__(self, default: float = DEFAULT_GRACE):
+        self.default = default
+        # canal → (timer, factory da coroutine de exclusão, tag)
+        self._pending: dict[int, tuple[asyncio.TimerHandle, object, object]] = {}
+        # tag (ex.: (guild_id, member_id) do dono da sala) → canal
+        self._tags: dict[object, int] = {}
+        self._tasks = TaskSet()
+
+        # métricas
+        self.scheduled = 0
+        self.cancelled = 0
+
+    def delay_for(self, cfg: dict | None) -> float:
+        """Carência do canal-base (chave "grace_period"), ou o padrão."""
+        value = (cfg or {}).get("grace_period", self.default)
+        try:
+            return max(0.0, min(float(value), MAX_GRACE))
+        except (TypeError, ValueError):
+            return self.default
+
+    def schedule(self, key: int, delay: float, factory, tag=None):
+        """Agenda `factory()` (coroutine que apaga a sala) para daqui `delay` segundos."""
+        self._drop(key)
+        handle = asyncio.get_running_loop().call_later(delay, self._fire, key)
+        self._pending[key] = (handle, factory, tag)
+        if tag is not None:
+            self._tags[tag] = key
+        self.scheduled += 1
+
+    def cancel(self, key: int) -> bool:
+        """Cancela a exclusão pendente. True se havia uma."""
+        if self._drop(key) is None:
+            return False
+        self.cancelled += 1
+        return True
+
+    def pending(self, key: int) -> bool:
+        return key in self._pending
+
+    def find(self, tag) -> int | None:
+        """Sala pendente marcada com `tag`, se houver."""
+        return self._tags.get(tag)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _drop(self, key):
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return None
+
+        handle, factory, tag = entry
+        handle.cancel()
+        if tag is not None and self._tags.get(tag) == key:
+            del self._tags[tag]
+        return factory
+
+    def _fire(self, key):
+        factory = self._drop(key)
+        if factory is None:
+            return
+
+        self._tasks.spawn(factory())
+
+    async def close(self):
+        # salas ainda pendentes ficam registradas como temporárias no store
+        for key in list(self._pending):
+            self._drop(key)
+
+        await self._tasks.cancel_all()
+
+
+@functools.cache
+def get_teardown() -> DeferredTeardown:
+    try:
+        default = float(os.getenv("VOICE_GRACE_SECONDS", DEFAULT_GRACE))
+    except ValueError:
+        default = DEFAULT_GRACE
+    return DeferredTeardown(max(0.0, min(default, MAX_GRACE)))
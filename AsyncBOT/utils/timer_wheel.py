@@ -0,0 +1,143 @@
+import asyncio, functools, inspect, math
+
+from utils.tasks import TaskSet
+
+TICK = 0.5   # resolução (s): um timer dispara até TICK depois do prazo
+SLOTS = 512  # uma volta = SLOTS * TICK (256 s); prazos maiores dão mais voltas
+
+
+class Timer:
+    """Prazo agendado no wheel. `cancel()` é O(1)."""
+
+    __slots__ = ("wheel", "slot", "rounds", "callback", "args")
+
+    def __init__(self, wheel, slot, rounds, callback, args):
+        self.wheel = wheel
+        self.slot = slot
+        self.rounds = rounds  # voltas inteiras que ainda faltam
+        self.callback = callback
+        self.args = args
+
+    @property
+    def active(self) -> bool:
+        return self.wheel is not None
+
+    def cancel(self) -> bool:
+        """True se o timer ainda estava pendente."""
+        if self.wheel is None:
+            return False
+        return self.wheel._discard(self)
+
+
+class TimerWheel:
+    """
+    Timing wheel com hash: um único timer do loop pra todos os prazos.
+
+    Cada prazo cai num slot (índice do tick em que vence, módulo SLOTS) e
+    guarda quantas voltas faltam. A cada tick o wheel avança um slot e
+    dispara o que venceu. Agendar e cancelar são O(1). Sem prazos
+    pendentes o wheel para de tickar.
+
+    O callback é chamado com `args`; se devolver coroutine, ela roda numa
+    task do próprio wheel (não depende de quem agendou continuar vivo).
+    """
+
+    def __init__(self, tick: float = TICK, slots: int = SLOTS):
+        self.tick = tick
+        self._slots: list[dict[Timer, None]] = [{} for _ in range(slots)]
+        self._cursor = 0                 # último slot processado
+        self._count = 0
+        self._next_at = 0.0              # loop.time() do próximo tick
+        self._handle: asyncio.TimerHandle | None = None
+        self._tasks = TaskSet(on_error=lambda e: print(f"❌ [TIMER] Callback falhou: {e}"))
+
+        # métricas
+        self.fired = 0
+        self.cancelled = 0
+
+    def __len__(self):
+        return self._count
+
+    def schedule(self, delay: float, callback, *args) -> Timer:
+        """Chama `callback(*args)` daqui a `delay` segundos (arredondado pro tick seguinte)."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._handle is None:
+            self._next_at = now + self.tick
+            self._handle = loop.call_at(self._next_at, self._advance)
+
+        # ticks a partir do próximo (1 = o próximo) até passar do prazo
+        ticks = max(1, math.ceil((now + delay - self._next_at) / self.tick - 1e-9) + 1)
+        slots = len(self._slots)
+        slot = (self._cursor + ticks) % slots
+        timer = Timer(self, slot, (ticks - 1) // slots, callback, args)
+
+        self._slots[slot][timer] = None
+        self._count += 1
+        return timer
+
+    def _discard(self, timer: Timer) -> bool:
+        if self._slots[timer.slot].pop(timer, False) is False:
+            return False
+        timer.wheel = None
+        self._count -= 1
+        self.cancelled += 1
+        if not self._count:
+            self._stop()
+        return True
+
+    def _stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _advance(self):
+        self._cursor = (self._cursor + 1) % len(self._slots)
+        bucket = self._slots[self._cursor]
+
+        due = []
+        for timer in bucket:
+            if timer.rounds:
+                timer.rounds -= 1
+            else:
+                due.append(timer)
+        for timer in due:
+            del bucket[timer]
+            timer.wheel = None
+        self._count -= len(due)
+
+        # próximo tick antes dos callbacks (um callback pode agendar/cancelar)
+        self._handle = None
+        if self._count:
+            loop = asyncio.get_running_loop()
+            self._next_at += self.tick
+            self._handle = loop.call_at(self._next_at, self._advance)
+
+        for timer in due:
+            self._fire(timer)
+
+    def _fire(self, timer: Timer):
+        self.fired += 1
+        try:
+            result = timer.callback(*timer.args)
+        except Exception as e:
+            print(f"❌ [TIMER] Callback {getattr(timer.callback, '__qualname__', timer.callback)} falhou: {e}")
+            return
+
+        if inspect.isawaitable(result):
+            self._tasks.spawn(result)
+
+    async def close(self):
+        self._stop()
+        for bucket in self._slots:
+            for timer in bucket:
+                timer.wheel = None
+            bucket.clear()
+        self._count = 0
+
+        await self._tasks.cancel_all()
+
+
+@functools.cache
+def get_timer_wheel() -> TimerWheel:
+    return TimerWheel()
@@ -0,0 +1,112 @@
+import enum, traceback
+
+
+class Role(enum.IntFlag):
+    """Papel de um canal de voz para o bot (um canal pode ter mais de um)."""
+    STANDARD_BASE = 1    # canal-base padrão → gera temporárias
+    CUSTOM_BASE = 2      # canal-base custom → abre sessão custom
+    TEMPORARY = 4        # temporária criada a partir de um canal-base
+    PRIVATE_ROOM = 8     # temporária trancada com painel
+    CUSTOM_SESSION = 16  # sala de uma sessão custom
+
+
+class ChannelIndex(dict):
+    """id do canal → flags de Role (int). Um único dict para todos os servidores."""
+
+    def mark(self, channel_id: int, role: Role):
+        self[channel_id] = self.get(channel_id, 0) | role
+
+    def unmark(self, channel_id: int, role: Role):
+        flags = self.get(channel_id, 0) & ~role
+        if flags:
+            self[channel_id] = flags
+        else:
+            self.pop(channel_id, None)
+
+
+class VoiceRouter:
+    """
+    Listener único de on_voice_state_update.
+    Consulta o índice de canais e chama só os handlers cujo papel
+    bate com o canal de entrada/saída. Eventos irrelevantes (mute,
+    deafen, canais comuns) saem antes de qualquer alocação.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.index: ChannelIndex = store.index
+        # (owner, roles, handler)
+        self._join: list[tuple[object, int, object]] = []
+        self._leave: list[tuple[object, int, object]] = []
+        self.handled: dict[object, int] = {}  # owner → eventos entregues (métricas)
+
+    # ------------------------
+    # Registro de handlers
+    # ------------------------
+    def add_handler(self, owner, roles: Role, *, join=None, leave=None):
+        if join:
+            self._join.append((owner, roles, join))
+        if leave:
+            self._leave.append((owner, roles, leave))
+
+    def remove_handlers(self, owner):
+        self._join = [h for h in self._join if h[0] is not owner]
+        self._leave = [h for h in self._leave if h[0] is not owner]
+        self.handled.pop(owner, None)
+
+    # ------------------------
+    # Despacho
+    # ------------------------
+    async def on_voice_state_update(self, member, before, after):
+        b = before.channel
+        a = after.channel
+
+        # mesmo canal (mute/deafen/stream) → nada a fazer
+        if b is a or (b is not None and a is not None and b.id == a.id):
+            return
+        if member.bot:
+            return
+
+        # primeiro evento do servidor → carrega os índices dele
+        if self.store.cached(member.guild.id) is None:
+            await self.store.guild(member.guild)
+
+        index = self.index
+        joined = index.get(a.id, 0) if a is not None else 0
+        left = index.get(b.id, 0) if b is not None else 0
+
+        if not joined and not left:
+            return
+
+        # entrada primeiro, saída depois (mesma ordem dos listeners antigos)
+        if joined:
+            for owner, roles, handler in self._join:
+                if joined & roles:
+                    await self._call(owner, handler, member, a)
+
+        if left:
+            for owner, roles, handler in self._leave:
+                # reconsulta: um handler anterior pode ter mudado o papel
+                if index.get(b.id, 0) & roles:
+                    await self._call(owner, handler, member, b)
+
+    async def _call(self, owner, handler, member, channel):
+        # um handler que falha não impede os das outras cogs nem a saída
+        self.handled[owner] = self.handled.get(owner, 0) + 1
+        try:
+            await handler(member, channel)
+        except Exception as e:
+            print(f"❌ [VOICE] {type(owner).__name__}.{handler.__name__} falhou: {e}")
+            traceback.print_exc()
+
+
+def get_router(bot) -> VoiceRouter:
+    """Roteador compartilhado pelas cogs; registra o listener uma única vez."""
+    router = getattr(bot, "voice_router", None)
+    if router is None:
+        from utils.voice_store import get_voice_store
+
+        router = VoiceRouter(get_voice_store())
+        bot.voice_router = router
+        bot.add_listener(router.on_voice_state_update, "on_voice_state_update")
+    return router
@@ -0,0 +1,701 @@
+import asyncio, functools, glob, json, os, sqlite3, time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.channels import GUILDS_DIR, load_guild, save_guild
+from utils.voice_router import ChannelIndex, Role
+
+DB_PATH = "./config/voice.db"
+
+
+class GuildVoiceState:
+    """Índices em memória dos canais de voz de um servidor (chave = id do canal)."""
+
+    __slots__ = (
+        "guild_id", "bases", "custom_bases", "custom_categories", "temporary", "pool", "pooled",
+        "private_rooms", "custom_sessions",
+    )
+
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        # canal-base padrão → config (category, temp_name, slots, locked)
+        self.bases: dict[int, dict] = {}
+        # canal-base custom → categoria, e o inverso
+        self.custom_bases: dict[int, int] = {}
+        self.custom_categories: dict[int, int] = {}
+        # canais temporários criados pelo bot
+        self.temporary: set[int] = set()
+        # salas ocultas esperando dono: canal-base → [canais], e canal → canal-base
+        self.pool: dict[int, list[int]] = {}
+        self.pooled: dict[int, int] = {}
+        # salas privadas (voice_id → registro) e sessões custom (user_id → registro)
+        self.private_rooms: dict[int, dict] = {}
+        self.custom_sessions: dict[int, dict] = {}
+
+
+class VoiceStore(ABC):
+    """
+    Fachada de armazenamento das salas de voz.
+    As leituras são sempre em memória (GuildVoiceState); cada backend
+    só decide como persistir as alterações.
+    """
+
+    def __init__(self):
+        self._states: dict[int, GuildVoiceState] = {}
+        # carregamentos em andamento (duas cogs pedindo o mesmo servidor ao mesmo tempo)
+        self._loading: dict[int, asyncio.Task] = {}
+        # índice global id do canal → papel (usado pelo VoiceRouter)
+        self.index = ChannelIndex()
+
+    async def guild(self, guild) -> GuildVoiceState:
+        state = self._states.get(guild.id)
+        if state is not None:
+            return state
+
+        task = self._loading.get(guild.id)
+        if task is None:
+            task = self._loading[guild.id] = asyncio.create_task(self._load_state(guild))
+            task.add_done_callback(lambda _: self._loading.pop(guild.id, None))
+        return await asyncio.shield(task)
+
+    async def _load_state(self, guild) -> GuildVoiceState:
+        state = await self._load(guild)
+        self._states[guild.id] = state
+
+        for base_id in state.bases:
+            self.index.mark(base_id, Role.STANDARD_BASE)
+        for base_id in state.custom_bases:
+            self.index.mark(base_id, Role.CUSTOM_BASE)
+        for channel_id in state.temporary:
+            self.index.mark(channel_id, Role.TEMPORARY)
+        return state
+
+    def cached(self, guild_id: int) -> GuildVoiceState | None:
+        return self._states.get(guild_id)
+
+    # ------------------------
+    # Canais-base
+    # ------------------------
+    def add_base(self, guild, base_id: int, cfg: dict):
+        state = self._states[guild.id]
+        state.bases[base_id] = cfg
+        self.index.mark(base_id, Role.STANDARD_BASE)
+        self._save_base(guild, base_id, cfg)
+
+    def remove_base(self, guild, base_id: int):
+        state = self._states[guild.id]
+        if state.bases.pop(base_id, None) is not None:
+            self.index.unmark(base_id, Role.STANDARD_BASE)
+            self._delete_base(guild, base_id)
+
+    def add_custom_base(self, guild, category_id: int, base_id: int):
+        state = self._states[guild.id]
+        state.custom_bases[base_id] = category_id
+        state.custom_categories[category_id] = base_id
+        self.index.mark(base_id, Role.CUSTOM_BASE)
+        self._save_custom_base(guild, category_id, base_id)
+
+    def remove_custom_base(self, guild, base_id: int):
+        state = self._states[guild.id]
+        category_id = state.custom_bases.pop(base_id, None)
+        if category_id is not None:
+            state.custom_categories.pop(category_id, None)
+            self.index.unmark(base_id, Role.CUSTOM_BASE)
+            self._delete_custom_base(guild, category_id, base_id)
+
+    # ------------------------
+    # Temporários
+    # ------------------------
+    def add_temporary(self, guild, channel_id: int):
+        state = self._states[guild.id]
+        state.temporary.add(channel_id)
+        self.index.mark(channel_id, Role.TEMPORARY)
+        self._save_temporary(guild, channel_id)
+
+    def remove_temporary(self, guild, channel_id: int):
+        state = self._states[guild.id]
+        if channel_id in state.temporary:
+            state.temporary.discard(channel_id)
+            self.index.unmark(channel_id, Role.TEMPORARY)
+            self._delete_temporary(guild, channel_id)
+
+    # ------------------------
+    # Pool de salas ocultas
+    # ------------------------
+    def add_pooled(self, guild, base_id: int, channel_id: int):
+        state = self._states[guild.id]
+        if channel_id in state.pooled:
+            return
+        state.pool.setdefault(base_id, []).append(channel_id)
+        state.pooled[channel_id] = base_id
+        self._save_pooled(guild, base_id, channel_id)
+
+    def remove_pooled(self, guild, channel_id: int):
+        state = self._states[guild.id]
+        base_id = state.pooled.pop(channel_id, None)
+        if base_id is None:
+            return
+
+        parked = state.pool.get(base_id)
+        if parked and channel_id in parked:
+            parked.remove(channel_id)
+        if not parked:
+            state.pool.pop(base_id, None)
+        self._delete_pooled(guild, channel_id)
+
+    # ------------------------
+    # Salas privadas e sessões custom (sobrevivem a restart/reload)
+    # ------------------------
+    def save_private_room(self, guild, voice_id: int, record: dict):
+        self._states[guild.id].private_rooms[voice_id] = record
+        self._save_private_room(guild, voice_id, record)
+
+    def remove_private_room(self, guild, voice_id: int):
+        if self._states[guild.id].private_rooms.pop(voice_id, None) is not None:
+            self._delete_private_room(guild, voice_id)
+
+    def save_custom_session(self, guild, user_id: int, record: dict):
+        self._states[guild.id].custom_sessions[user_id] = record
+        self._save_custom_session(guild, user_id, record)
+
+    def remove_custom_session(self, guild, user_id: int):
+        if self._states[guild.id].custom_sessions.pop(user_id, None) is not None:
+            self._delete_custom_session(guild, user_id)
+
+    # ------------------------
+    # Ganchos dos backends
+    # ------------------------
+    @abstractmethod
+    async def _load(self, guild) -> GuildVoiceState:
+        """Lê do backend o estado de voz do servidor."""
+
+    def _save_base(self, guild, base_id, cfg): ...
+    def _delete_base(self, guild, base_id): ...
+    def _save_custom_base(self, guild, category_id, base_id): ...
+    def _delete_custom_base(self, guild, category_id, base_id): ...
+    def _save_temporary(self, guild, channel_id): ...
+    def _delete_temporary(self, guild, channel_id): ...
+    def _save_pooled(self, guild, base_id, channel_id): ...
+    def _delete_pooled(self, guild, channel_id): ...
+    def _save_private_room(self, guild, voice_id, record): ...
+    def _delete_private_room(self, guild, voice_id): ...
+    def _save_custom_session(self, guild, user_id, record): ...
+    def _delete_custom_session(self, guild, user_id): ...
+
+    async def close(self):
+        pass
+
+
+# =========================================================
+#   JSON (config/guilds/<guild_id>.json)
+# =========================================================
+class JsonVoiceStore(VoiceStore):
+    """Backend padrão: espelha o layout antigo do JSON por servidor."""
+
+    async def _load(self, guild) -> GuildVoiceState:
+        data = load_guild(guild)
+        state = GuildVoiceState(guild.id)
+
+        for base_id, cfg in data.get("voice_base_configs", {}).items():
+            state.bases[int(base_id)] = cfg
+
+        for cat_id, info in data.get("voice_custom_base", {}).items():
+            state.custom_bases[info["base_id"]] = int(cat_id)
+            state.custom_categories[int(cat_id)] = info["base_id"]
+
+        # no JSON continua lista; em memória vira set (busca O(1))
+        state.temporary = set(data.get("voice_temporary", []))
+        data["voice_temporary"] = state.temporary
+
+        for channel_id, base_id in data.get("voice_pool", {}).items():
+            state.pool.setdefault(base_id, []).append(int(channel_id))
+            state.pooled[int(channel_id)] = base_id
+
+        for voice_id, record in data.get("voice_private_rooms", {}).items():
+            state.private_rooms[int(voice_id)] = record
+        for user_id, record in data.get("voice_custom_sessions", {}).items():
+            state.custom_sessions[int(user_id)] = record
+
+        return state
+
+    def _save_base(self, guild, base_id, cfg):
+        load_guild(guild).setdefault("voice_base_configs", {})[str(base_id)] = cfg
+        save_guild(guild)
+
+    def _delete_base(self, guild, base_id):
+        load_guild(guild).get("voice_base_configs", {}).pop(str(base_id), None)
+        save_guild(guild)
+
+    def _save_custom_base(self, guild, category_id, base_id):
+        load_guild(guild).setdefault("voice_custom_base", {})[str(category_id)] = {
+            "base_id": base_id,
+            "category": category_id,
+        }
+        save_guild(guild)
+
+    def _delete_custom_base(self, guild, category_id, base_id):
+        load_guild(guild).get("voice_custom_base", {}).pop(str(category_id), None)
+        save_guild(guild)
+
+    def _save_temporary(self, guild, channel_id):
+        save_guild(guild)
+
+    def _delete_temporary(self, guild, channel_id):
+        save_guild(guild)
+
+    def _save_pooled(self, guild, base_id, channel_id):
+        load_guild(guild).setdefault("voice_pool", {})[str(channel_id)] = base_id
+        save_guild(guild)
+
+    def _delete_pooled(self, guild, channel_id):
+        load_guild(guild).get("voice_pool", {}).pop(str(channel_id), None)
+        save_guild(guild)
+
+    def _save_private_room(self, guild, voice_id, record):
+        load_guild(guild).setdefault("voice_private_rooms", {})[str(voice_id)] = record
+        save_guild(guild)
+
+    def _delete_private_room(self, guild, voice_id):
+        load_guild(guild).get("voice_private_rooms", {}).pop(str(voice_id), None)
+        save_guild(guild)
+
+    def _save_custom_session(self, guild, user_id, record):
+        load_guild(guild).setdefault("voice_custom_sessions", {})[str(user_id)] = record
+        save_guild(guild)
+
+    def _delete_custom_session(self, guild, user_id):
+        load_guild(guild).get("voice_custom_sessions", {}).pop(str(user_id), None)
+        save_guild(guild)
+
+
+# =========================================================
+#   SQLite (config/voice.db)
+# =========================================================
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS guilds (
+    guild_id     INTEGER PRIMARY KEY,
+    imported_at  REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS base_channels (
+    channel_id   INTEGER PRIMARY KEY,
+    guild_id     INTEGER NOT NULL,
+    kind         TEXT NOT NULL,          -- 'standard' | 'custom'
+    category_id  INTEGER,
+    config       TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_base_guild ON base_channels (guild_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_base_custom_category
+    ON base_channels (category_id) WHERE kind = 'custom';
+
+CREATE TABLE IF NOT EXISTS temp_channels (
+    channel_id   INTEGER PRIMARY KEY,
+    guild_id     INTEGER NOT NULL,
+    created_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_temp_guild ON temp_channels (guild_id);
+
+CREATE TABLE IF NOT EXISTS pool_channels (
+    channel_id   INTEGER PRIMARY KEY,
+    guild_id     INTEGER NOT NULL,
+    base_id      INTEGER NOT NULL,
+    parked_at    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pool_guild ON pool_channels (guild_id);
+
+CREATE TABLE IF NOT EXISTS private_rooms (
+    voice_id     INTEGER PRIMARY KEY,
+    guild_id     INTEGER NOT NULL,
+    owner_id     INTEGER NOT NULL,
+    text_id      INTEGER,
+    panel_id     INTEGER,
+    panel_version INTEGER,
+    invited      TEXT NOT NULL DEFAULT '[]',
+    created_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_private_guild ON private_rooms (guild_id);
+CREATE INDEX IF NOT EXISTS idx_private_text ON private_rooms (text_id);
+
+CREATE TABLE IF NOT EXISTS custom_sessions (
+    guild_id       INTEGER NOT NULL,
+    user_id        INTEGER NOT NULL,
+    category_id    INTEGER NOT NULL,
+    text_id        INTEGER NOT NULL,
+    voice_id       INTEGER,
+    panel_id       INTEGER,
+    panel_version  INTEGER,
+    name_template  TEXT NOT NULL,
+    slots          INTEGER NOT NULL DEFAULT 0,
+    locked         INTEGER NOT NULL DEFAULT 0,
+    invited        TEXT NOT NULL DEFAULT '[]',
+    created_at     REAL NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS idx_custom_voice ON custom_sessions (voice_id);
+CREATE INDEX IF NOT EXISTS idx_custom_text ON custom_sessions (text_id);
+"""
+
+# colunas que entraram depois da primeira versão do schema: tabela → [(coluna, tipo)]
+ADDED_COLUMNS = {
+    "private_rooms": [("panel_id", "INTEGER"), ("panel_version", "INTEGER")],
+    "custom_sessions": [("panel_id", "INTEGER"), ("panel_version", "INTEGER")],
+}
+
+# colunas que deixaram de ser NOT NULL: tabela → colunas
+# (sala privada é gravada antes de o canal de texto do painel existir)
+NULLABLE_COLUMNS = {
+    "private_rooms": {"text_id"},
+}
+
+
+def _rebuild_table(conn: sqlite3.Connection, table: str):
+    """Recria a tabela com a definição atual do SCHEMA, copiando as linhas."""
+    columns = ", ".join(row[1] for row in conn.execute(f"PRAGMA table_info({table})"))
+    indexes = [
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)
+        )
+    ]
+    for name in indexes:
+        conn.execute(f"DROP INDEX {name}")
+    conn.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+    conn.executescript(SCHEMA)
+    with conn:
+        conn.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_old")
+        conn.execute(f"DROP TABLE {table}_old")
+
+
+def upgrade_schema(conn: sqlite3.Connection):
+    """Cria as tabelas e acrescenta/afrouxa colunas em bancos antigos."""
+    conn.executescript(SCHEMA)
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for name, kind in columns:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {kind}")
+    conn.commit()
+
+    # o SQLite não tem ALTER COLUMN: NOT NULL antigo → recria a tabela
+    for table, columns in NULLABLE_COLUMNS.items():
+        if any(row[1] in columns and row[3] for row in conn.execute(f"PRAGMA table_info({table})")):
+            _rebuild_table(conn, table)
+
+
+class SqliteVoiceStore(VoiceStore):
+    """
+    Backend SQLite (stdlib). Todo acesso ao banco roda numa única thread
+    dedicada, fora do event loop; a ordem das gravações é preservada.
+    """
+
+    def __init__(self, path=DB_PATH):
+        super().__init__()
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="voice-db")
+        self._pending: set[asyncio.Future] = set()
+
+    # ------------------------
+    # Execução na thread do banco
+    # ------------------------
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            upgrade_schema(self._conn)
+        return self._conn
+
+    def _execute(self, sql, params=()):
+        conn = self._connect()
+        with conn:
+            conn.execute(sql, params)
+
+    def _query(self, sql, params=()):
+        return self._connect().execute(sql, params).fetchall()
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _write(self, sql, params=()):
+        """Grava em segundo plano (fire-and-forget), mantendo a ordem."""
+        loop = asyncio.get_running_loop()
+        fut = loop.run_in_executor(self._executor, self._execute, sql, params)
+        self._pending.add(fut)
+        fut.add_done_callback(self._write_done)
+
+    def _write_done(self, fut: asyncio.Future):
+        self._pending.discard(fut)
+        if not fut.cancelled() and fut.exception():
+            print(f"❌ [VOICE-DB] Falha ao gravar: {fut.exception()}")
+
+    def _import(self, guild_id, data):
+        import_guild_json(self._connect(), guild_id, data)
+
+    def _import_once(self, guild_id, data) -> bool:
+        if self._query("SELECT 1 FROM guilds WHERE guild_id = ?", (guild_id,)):
+            return False
+        self._import(guild_id, data)
+        return True
+
+    async def import_guild(self, guild_id: int, data: dict) -> bool:
+        """Importa o JSON de um servidor que ainda não está no banco. False se já estava."""
+        return await self._run(self._import_once, guild_id, data)
+
+    # ------------------------
+    # Carregamento
+    # ------------------------
+    async def _load(self, guild) -> GuildVoiceState:
+        imported = await self._run(self._query, "SELECT 1 FROM guilds WHERE guild_id = ?", (guild.id,))
+        if not imported:
+            # primeira vez deste servidor no banco → importa o JSON atual
+            await self._run(self._import, guild.id, load_guild(guild))
+
+        state = GuildVoiceState(guild.id)
+
+        rows = await self._run(
+            self._query,
+            "SELECT channel_id, kind, category_id, config FROM base_channels WHERE guild_id = ?",
+            (guild.id,),
+        )
+        for channel_id, kind, category_id, config in rows:
+            if kind == "custom":
+                state.custom_bases[channel_id] = category_id
+                state.custom_categories[category_id] = channel_id
+            else:
+                state.bases[channel_id] = json.loads(config)
+
+        rows = await self._run(
+            self._query,
+            "SELECT channel_id FROM temp_channels WHERE guild_id = ?",
+            (guild.id,),
+        )
+        state.temporary = {r[0] for r in rows}
+
+        rows = await self._run(
+            self._query,
+            "SELECT channel_id, base_id FROM pool_channels WHERE guild_id = ? ORDER BY parked_at",
+            (guild.id,),
+        )
+        for channel_id, base_id in rows:
+            state.pool.setdefault(base_id, []).append(channel_id)
+            state.pooled[channel_id] = base_id
+
+        rows = await self._run(
+            self._query,
+            "SELECT voice_id, owner_id, text_id, panel_id, panel_version, invited FROM private_rooms WHERE guild_id = ?",
+            (guild.id,),
+        )
+        for voice_id, owner_id, text_id, panel_id, panel_version, invited in rows:
+            state.private_rooms[voice_id] = {
+                "owner_id": owner_id,
+                "text_id": text_id,
+                "panel_id": panel_id,
+                "panel_version": panel_version,
+                "invited": json.loads(invited),
+            }
+
+        rows = await self._run(
+            self._query,
+            "SELECT user_id, category_id, text_id, voice_id, panel_id, panel_version, name_template, slots, locked, invited "
+            "FROM custom_sessions WHERE guild_id = ?",
+            (guild.id,),
+        )
+        for user_id, category_id, text_id, voice_id, panel_id, panel_version, name_template, slots, locked, invited in rows:
+            state.custom_sessions[user_id] = {
+                "category_id": category_id,
+                "text_id": text_id,
+                "voice_id": voice_id,
+                "panel_id": panel_id,
+                "panel_version": panel_version,
+                "name_template": name_template,
+                "slots": slots,
+                "locked": bool(locked),
+                "invited": json.loads(invited),
+            }
+
+        return state
+
+    # ------------------------
+    # Gravações
+    # ------------------------
+    def _save_base(self, guild, base_id, cfg):
+        self._write(
+            "INSERT OR REPLACE INTO base_channels (channel_id, guild_id, kind, category_id, config) "
+            "VALUES (?, ?, 'standard', ?, ?)",
+            (base_id, guild.id, cfg.get("category"), json.dumps(cfg)),
+        )
+
+    def _delete_base(self, guild, base_id):
+        self._write("DELETE FROM base_channels WHERE channel_id = ?", (base_id,))
+
+    def _save_custom_base(self, guild, category_id, base_id):
+        self._write(
+            "INSERT OR REPLACE INTO base_channels (channel_id, guild_id, kind, category_id) "
+            "VALUES (?, ?, 'custom', ?)",
+            (base_id, guild.id, category_id),
+        )
+
+    def _delete_custom_base(self, guild, category_id, base_id):
+        self._write("DELETE FROM base_channels WHERE channel_id = ?", (base_id,))
+
+    def _save_temporary(self, guild, channel_id):
+        self._write(
+            "INSERT OR IGNORE INTO temp_channels (channel_id, guild_id, created_at) VALUES (?, ?, ?)",
+            (channel_id, guild.id, time.time()),
+        )
+
+    def _delete_temporary(self, guild, channel_id):
+        self._write("DELETE FROM temp_channels WHERE channel_id = ?", (channel_id,))
+
+    def _save_pooled(self, guild, base_id, channel_id):
+        self._write(
+            "INSERT OR REPLACE INTO pool_channels (channel_id, guild_id, base_id, parked_at) VALUES (?, ?, ?, ?)",
+            (channel_id, guild.id, base_id, time.time()),
+        )
+
+    def _delete_pooled(self, guild, channel_id):
+        self._write("DELETE FROM pool_channels WHERE channel_id = ?", (channel_id,))
+
+    def _save_private_room(self, guild, voice_id, record):
+        self._write(*private_room_row(guild.id, voice_id, record))
+
+    def _delete_private_room(self, guild, voice_id):
+        self._write("DELETE FROM private_rooms WHERE voice_id = ?", (voice_id,))
+
+    def _save_custom_session(self, guild, user_id, record):
+        self._write(*custom_session_row(guild.id, user_id, record))
+
+    def _delete_custom_session(self, guild, user_id):
+        self._write("DELETE FROM custom_sessions WHERE guild_id = ? AND user_id = ?", (guild.id, user_id))
+
+    async def close(self):
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown()  # fila já vazia: a thread só termina
+
+
+def private_room_row(guild_id: int, voice_id: int, record: dict):
+    return (
+        "INSERT OR REPLACE INTO private_rooms "
+        "(voice_id, guild_id, owner_id, text_id, panel_id, panel_version, invited, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            voice_id,
+            guild_id,
+            record["owner_id"],
+            record["text_id"],
+            record.get("panel_id"),
+            record.get("panel_version"),
+            json.dumps(record.get("invited", [])),
+            time.time(),
+        ),
+    )
+
+
+def custom_session_row(guild_id: int, user_id: int, record: dict):
+    return (
+        "INSERT OR REPLACE INTO custom_sessions "
+        "(guild_id, user_id, category_id, text_id, voice_id, panel_id, panel_version, "
+        "name_template, slots, locked, invited, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            guild_id,
+            user_id,
+            record["category_id"],
+            record["text_id"],
+            record.get("voice_id"),
+            record.get("panel_id"),
+            record.get("panel_version"),
+            record.get("name_template") or "",
+            record.get("slots") or 0,
+            int(bool(record.get("locked"))),
+            json.dumps(record.get("invited", [])),
+            time.time(),
+        ),
+    )
+
+
+# =========================================================
+#   Migração JSON → SQLite
+# =========================================================
+def import_guild_json(conn: sqlite3.Connection, guild_id: int, data: dict):
+    """Importa o JSON de um servidor para o banco (roda na thread do banco)."""
+    now = time.time()
+
+    with conn:
+        for base_id, cfg in data.get("voice_base_configs", {}).items():
+            conn.execute(
+                "INSERT OR REPLACE INTO base_channels (channel_id, guild_id, kind, category_id, config) "
+                "VALUES (?, ?, 'standard', ?, ?)",
+                (int(base_id), guild_id, cfg.get("category"), json.dumps(cfg)),
+            )
+
+        for cat_id, info in data.get("voice_custom_base", {}).items():
+            conn.execute(
+                "INSERT OR REPLACE INTO base_channels (channel_id, guild_id, kind, category_id) "
+                "VALUES (?, ?, 'custom', ?)",
+                (info["base_id"], guild_id, int(cat_id)),
+            )
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO temp_channels (channel_id, guild_id, created_at) VALUES (?, ?, ?)",
+            [(cid, guild_id, now) for cid in data.get("voice_temporary", [])],
+        )
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO pool_channels (channel_id, guild_id, base_id, parked_at) VALUES (?, ?, ?, ?)",
+            [(int(cid), guild_id, base_id, now) for cid, base_id in data.get("voice_pool", {}).items()],
+        )
+
+        for voice_id, record in data.get("voice_private_rooms", {}).items():
+            conn.execute(*private_room_row(guild_id, int(voice_id), record))
+        for user_id, record in data.get("voice_custom_sessions", {}).items():
+            conn.execute(*custom_session_row(guild_id, int(user_id), record))
+
+        conn.execute(
+            "INSERT OR REPLACE INTO guilds (guild_id, imported_at) VALUES (?, ?)",
+            (guild_id, now),
+        )
+
+
+async def migrate_json_to_sqlite(guilds_dir=GUILDS_DIR, db_path=DB_PATH):
+    """
+    Migração única: importa todos os config/guilds/*.json para o banco.
+    Entradas que ainda estão no channels.json antigo são importadas
+    sozinhas na primeira vez que o servidor for usado com VOICE_STORAGE=sqlite.
+    """
+    db = SqliteVoiceStore(db_path)
+    total = 0
+
+    try:
+        for path in sorted(glob.glob(os.path.join(guilds_dir, "*.json"))):
+            guild_id = int(os.path.splitext(os.path.basename(path))[0])
+            with open(path, "r") as f:
+                data = json.load(f)
+
+            if await db.import_guild(guild_id, data):
+                total += 1
+                print(f"🔹 Servidor {guild_id} importado.")
+    finally:
+        await db.close()
+
+    print(f"✅ {total} servidor(es) migrado(s) para {db_path}.")
+
+
+# =========================================================
+#   Seleção do backend (VOICE_STORAGE=json|sqlite no .env)
+# =========================================================
+@functools.cache
+def get_voice_store() -> VoiceStore:
+    if os.getenv("VOICE_STORAGE", "json").lower() == "sqlite":
+        return SqliteVoiceStore(os.getenv("VOICE_DB_PATH", DB_PATH))
+    return JsonVoiceStore()
+
+
+if __name__ == "__main__":
+    # python -m utils.voice_store  (a partir da pasta AsyncBOT)
+    asyncio.run(migrate_json_to_sqlite())
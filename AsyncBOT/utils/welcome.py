@@ -1,9 +1,10 @@
 import discord
-from utils.channels import load_channels
+from utils.channels import load_guild
+from utils.loop_monitor import Level, get_loop_monitor
 from utils.phrase_builder import gerar_boas_vindas
 
 async def send_welcome(bot: discord.Client, member: discord.Member):
-    data = load_channels()
+    data = load_guild(member.guild)
     if "welcome" not in data:
         return
 
@@ -14,6 +15,11 @@ async def send_welcome(bot: discord.Client, member: discord.Member):
     avatar = member.display_avatar.url
     frase = gerar_boas_vindas(member.mention)
 
+    # loop sobrecarregado → só o texto, sem montar o card
+    if get_loop_monitor().level >= Level.PLAIN_WELCOME:
+        await channel.send(f"{frase}\n\n🆔 : `{member.id}`")
+        return
+
     # CARD
     card_text = discord.ui.TextDisplay(
         content=(